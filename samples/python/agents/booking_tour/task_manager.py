@@ -1,5 +1,5 @@
 import json
-from typing import AsyncIterable, List, Optional
+from typing import AsyncIterable
 from common.types import (
     SendTaskRequest,
     TaskSendParams,
@@ -9,13 +9,12 @@ from common.types import (
     TaskStatusUpdateEvent,
     TextPart,
     TaskState,
-    Task,
     SendTaskResponse,
     JSONRPCResponse,
     SendTaskStreamingRequest,
     SendTaskStreamingResponse,
 )
-from common.server.task_manager import InMemoryTaskManager
+from common.server.task_manager import AgentWorkStopped, InMemoryTaskManager
 from agent import TourBookingAgent
 import logging
 
@@ -32,27 +31,16 @@ class AgentTaskManager(InMemoryTaskManager):
             return JSONRPCResponse(id=request.id, error={"code": -32602, "message": "Missing params"})
         return None
 
-    async def _update_store(self, task_id: str, status: TaskStatus, artifacts: Optional[List[Artifact]] = None) -> Task:
-        async with self.lock:
-            try:
-                task = self.tasks[task_id]
-            except KeyError:
-                task = Task(id=task_id, status=status, artifacts=[])
-                self.tasks[task_id] = task
-            task.status = status
-            if artifacts:
-                if not hasattr(task, 'artifacts') or task.artifacts is None:
-                    task.artifacts = []
-                task.artifacts.extend(artifacts)
-            return task
-
     async def _stream_generator(
         self, request: SendTaskStreamingRequest
     ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
         task_send_params: TaskSendParams = request.params
         query = self._get_user_query(task_send_params)
         try:
-            async for item in self.agent.stream(query, task_send_params.sessionId):
+            async for item in self.session_scheduler.iterate(
+                task_send_params.sessionId,
+                self.agent.stream(query, task_send_params.sessionId),
+            ):
                 is_task_complete = item["is_task_complete"]
                 artifacts = None
                 if not is_task_complete:
@@ -74,7 +62,7 @@ class AgentTaskManager(InMemoryTaskManager):
                     artifacts = [Artifact(parts=parts, index=0, append=False)]
                 message = Message(role="agent", parts=parts)
                 task_status = TaskStatus(state=task_state, message=message)
-                await self._update_store(task_send_params.id, task_status, artifacts)
+                await self.update_store(task_send_params.id, task_status, artifacts)
                 task_update_event = TaskStatusUpdateEvent(
                     id=task_send_params.id,
                     status=task_status,
@@ -94,7 +82,7 @@ class AgentTaskManager(InMemoryTaskManager):
             state=TaskState.COMPLETED,
             message=Message(role="agent", parts=[{"type": "text", "text": "Booking process completed."}])
         )
-        await self._update_store(task_send_params.id, task_status, None)
+        await self.update_store(task_send_params.id, task_status, None)
         task_update_event = TaskStatusUpdateEvent(
             id=task_send_params.id,
             status=task_status,
@@ -108,12 +96,21 @@ class AgentTaskManager(InMemoryTaskManager):
         task_send_params: TaskSendParams = request.params
         query = self._get_user_query(task_send_params)
         try:
-            response = self.agent.invoke(query, task_send_params.sessionId)
+            response = await self.run_agent_work(
+                task_send_params.id,
+                self.session_scheduler.run(
+                    task_send_params.sessionId,
+                    self.agent_runner.run,
+                    self.agent.invoke,
+                    query,
+                    task_send_params.sessionId,
+                ),
+            )
             task_status = TaskStatus(
                 state=TaskState.COMPLETED,
                 message=Message(role="agent", parts=[{"type": "text", "text": response}])
             )
-            await self._update_store(task_send_params.id, task_status, None)
+            await self.update_store(task_send_params.id, task_status, None)
             return SendTaskResponse(
                 id=request.id,
                 result=TaskStatusUpdateEvent(
@@ -122,6 +119,10 @@ class AgentTaskManager(InMemoryTaskManager):
                     final=True
                 )
             )
+        except AgentWorkStopped:
+            return SendTaskResponse(
+                id=request.id, result=await self.get_task(task_send_params.id)
+            )
         except Exception as e:
             logger.error(f"Error in invoke: {e}")
             return SendTaskResponse(id=request.id, error={"code": -32603, "message": f"Error processing request: {str(e)}"})
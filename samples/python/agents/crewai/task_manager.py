@@ -3,7 +3,7 @@
 import logging
 from typing import AsyncIterable
 from agent import ImageGenerationAgent
-from common.server.task_manager import InMemoryTaskManager
+from common.server.task_manager import AgentWorkStopped, InMemoryTaskManager
 from common.server import utils
 from common.types import (
     Artifact,
@@ -14,7 +14,6 @@ from common.types import (
     SendTaskResponse,
     SendTaskStreamingRequest,
     SendTaskStreamingResponse,
-    Task,
     TaskSendParams,
     TaskState,
     TaskStatus,
@@ -65,33 +64,24 @@ class AgentTaskManager(InMemoryTaskManager):
 
     await self.upsert_task(request.params)
 
-  async def _update_store(
-      self, task_id: str, status: TaskStatus, artifacts: list[Artifact]
-  ) -> Task:
-    async with self.lock:
-      try:
-        task = self.tasks[task_id]
-      except KeyError as exc:
-        logger.error("Task %s not found for updating the task", task_id)
-        raise ValueError(f"Task {task_id} not found") from exc
-
-      task.status = status
-
-      if status.message is not None:
-        self.task_messages[task_id].append(status.message)
-
-      if artifacts is not None:
-        if task.artifacts is None:
-          task.artifacts = []
-        task.artifacts.extend(artifacts)
-
-      return task
-
   async def _invoke(self, request: SendTaskRequest) -> SendTaskResponse:
     task_send_params: TaskSendParams = request.params
     query = self._get_user_query(task_send_params)
     try:
-      result = self.agent.invoke(query, task_send_params.sessionId)
+      result = await self.run_agent_work(
+          task_send_params.id,
+          self.session_scheduler.run(
+              task_send_params.sessionId,
+              self.agent_runner.run,
+              self.agent.invoke,
+              query,
+              task_send_params.sessionId,
+          ),
+      )
+    except AgentWorkStopped:
+      return SendTaskResponse(
+          id=request.id, result=await self.get_task(task_send_params.id)
+      )
     except Exception as e:
       logger.error("Error invoking agent: %s", e)
       raise ValueError(f"Error invoking agent: {e}") from e
@@ -111,7 +101,7 @@ class AgentTaskManager(InMemoryTaskManager):
       parts = [{"type": "text", "text": data.error}]
 
     print(f"Final Result ===> {result}")
-    task = await self._update_store(
+    task = await self.update_store(
         task_send_params.id,
         TaskStatus(state=TaskState.COMPLETED),
         [Artifact(parts=parts)],
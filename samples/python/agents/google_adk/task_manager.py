@@ -10,14 +10,13 @@ from common.types import (
     TaskArtifactUpdateEvent,
     TextPart,
     TaskState,
-    Task,
     SendTaskResponse,
     InternalError,
     JSONRPCResponse,
     SendTaskStreamingRequest,
     SendTaskStreamingResponse,
 )
-from common.server.task_manager import InMemoryTaskManager
+from common.server.task_manager import AgentWorkStopped, InMemoryTaskManager
 from agent import ReimbursementAgent
 import common.server.utils as utils
 from typing import Union
@@ -36,7 +35,10 @@ class AgentTaskManager(InMemoryTaskManager):
         task_send_params: TaskSendParams = request.params
         query = self._get_user_query(task_send_params)
         try:
-          async for item in self.agent.stream(query, task_send_params.sessionId):
+          async for item in self.session_scheduler.iterate(
+              task_send_params.sessionId,
+              self.agent.stream(query, task_send_params.sessionId),
+          ):
             is_task_complete = item["is_task_complete"]
             artifacts = None
             if not is_task_complete:
@@ -58,7 +60,7 @@ class AgentTaskManager(InMemoryTaskManager):
               artifacts = [Artifact(parts=parts, index=0, append=False)]
           message = Message(role="agent", parts=parts)
           task_status = TaskStatus(state=task_state, message=message)
-          await self._update_store(task_send_params.id, task_status, artifacts)
+          await self.update_store(task_send_params.id, task_status, artifacts)
           task_update_event = TaskStatusUpdateEvent(
                 id=task_send_params.id,
                 status=task_status,
@@ -121,34 +123,30 @@ class AgentTaskManager(InMemoryTaskManager):
             return error
         await self.upsert_task(request.params)
         return self._stream_generator(request)
-    async def _update_store(
-        self, task_id: str, status: TaskStatus, artifacts: list[Artifact]
-    ) -> Task:
-        async with self.lock:
-            try:
-                task = self.tasks[task_id]
-            except KeyError:
-                logger.error(f"Task {task_id} not found for updating the task")
-                raise ValueError(f"Task {task_id} not found")
-            task.status = status
-            #if status.message is not None:
-            #    self.task_messages[task_id].append(status.message)
-            if artifacts is not None:
-                if task.artifacts is None:
-                    task.artifacts = []
-                task.artifacts.extend(artifacts)
-            return task
     async def _invoke(self, request: SendTaskRequest) -> SendTaskResponse:
         task_send_params: TaskSendParams = request.params
         query = self._get_user_query(task_send_params)
         try:
-            result = self.agent.invoke(query, task_send_params.sessionId)
+            result = await self.run_agent_work(
+                task_send_params.id,
+                self.session_scheduler.run(
+                    task_send_params.sessionId,
+                    self.agent_runner.run,
+                    self.agent.invoke,
+                    query,
+                    task_send_params.sessionId,
+                ),
+            )
+        except AgentWorkStopped:
+            return SendTaskResponse(
+                id=request.id, result=await self.get_task(task_send_params.id)
+            )
         except Exception as e:
             logger.error(f"Error invoking agent: {e}")
             raise ValueError(f"Error invoking agent: {e}")
         parts = [{"type": "text", "text": result}]
         task_state = TaskState.INPUT_REQUIRED if "MISSING_INFO:" in result else TaskState.COMPLETED
-        task = await self._update_store(
+        task = await self.update_store(
             task_send_params.id,
             TaskStatus(
                 state=task_state, message=Message(role="agent", parts=parts)
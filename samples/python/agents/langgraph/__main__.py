@@ -1,4 +1,4 @@
-from common.server import A2AServer
+from common.server import A2AServer, SQLiteTaskStore
 from common.types import AgentCard, AgentCapabilities, AgentSkill, MissingAPIKeyError
 from common.utils.push_notification_auth import PushNotificationSenderAuth
 from agents.langgraph.task_manager import AgentTaskManager
@@ -16,7 +16,8 @@ logger = logging.getLogger(__name__)
 @click.command()
 @click.option("--host", "host", default="localhost")
 @click.option("--port", "port", default=10000)
-def main(host, port):
+@click.option("--task-db", "task_db", default=None, help="SQLite file to persist tasks in.")
+def main(host, port, task_db):
     """Starts the Currency Agent server."""
     try:
         if not os.getenv("GOOGLE_API_KEY"):
@@ -45,7 +46,11 @@ def main(host, port):
         notification_sender_auth.generate_jwk()
         server = A2AServer(
             agent_card=agent_card,
-            task_manager=AgentTaskManager(agent=CurrencyAgent(), notification_sender_auth=notification_sender_auth),
+            task_manager=AgentTaskManager(
+                agent=CurrencyAgent(),
+                notification_sender_auth=notification_sender_auth,
+                task_store=SQLiteTaskStore(task_db) if task_db else None,
+            ),
             host=host,
             port=port,
         )
@@ -6,6 +6,8 @@ from langchain_core.messages import AIMessage, ToolMessage
 import httpx
 from typing import Any, Dict, AsyncIterable, Literal
 from pydantic import BaseModel
+from common.utils.tracing import span
+from common.server.deadlines import time_budget
 
 memory = MemorySaver()
 
@@ -26,21 +28,24 @@ def get_exchange_rate(
     Returns:
         A dictionary containing the exchange rate data, or an error message if the request fails.
     """    
-    try:
-        response = httpx.get(
-            f"https://api.frankfurter.app/{currency_date}",
-            params={"from": currency_from, "to": currency_to},
-        )
-        response.raise_for_status()
-
-        data = response.json()
-        if "rates" not in data:
-            return {"error": "Invalid API response format."}
-        return data
-    except httpx.HTTPError as e:
-        return {"error": f"API request failed: {e}"}
-    except ValueError:
-        return {"error": "Invalid JSON response from API."}
+    with span("tool.get_exchange_rate", currency_from=currency_from, currency_to=currency_to):
+        try:
+            # Never wait past the task's deadline (httpx's own default is 5s).
+            response = httpx.get(
+                f"https://api.frankfurter.app/{currency_date}",
+                params={"from": currency_from, "to": currency_to},
+                timeout=time_budget(5.0),
+            )
+            response.raise_for_status()
+
+            data = response.json()
+            if "rates" not in data:
+                return {"error": "Invalid API response format."}
+            return data
+        except httpx.HTTPError as e:
+            return {"error": f"API request failed: {e}"}
+        except ValueError:
+            return {"error": "Invalid JSON response from API."}
 
 
 class ResponseFormat(BaseModel):
@@ -78,7 +83,7 @@ class CurrencyAgent:
         inputs = {"messages": [("user", query)]}
         config = {"configurable": {"thread_id": sessionId}}
 
-        for item in self.graph.stream(inputs, config, stream_mode="values"):
+        async for item in self.graph.astream(inputs, config, stream_mode="values"):
             message = item["messages"][-1]
             if (
                 isinstance(message, AIMessage)
@@ -15,7 +15,6 @@ from common.types import (
     TaskArtifactUpdateEvent,
     TaskStatusUpdateEvent,
     Task,
-    TaskIdParams,
     PushNotificationConfig,
     SetTaskPushNotificationRequest,
     SetTaskPushNotificationResponse,
@@ -23,12 +22,12 @@ from common.types import (
     TaskNotFoundError,
     InvalidParamsError,
 )
-from common.server.task_manager import InMemoryTaskManager
+from common.server.task_manager import AgentWorkStopped, InMemoryTaskManager
+from common.server.task_store import TaskStore
 from agents.langgraph.agent import CurrencyAgent
 from common.utils.push_notification_auth import PushNotificationSenderAuth
 import common.server.utils as utils
 from typing import Union
-import asyncio
 import logging
 import traceback
 
@@ -36,8 +35,8 @@ logger = logging.getLogger(__name__)
 
 
 class AgentTaskManager(InMemoryTaskManager):
-    def __init__(self, agent: CurrencyAgent, notification_sender_auth: PushNotificationSenderAuth):
-        super().__init__()
+    def __init__(self, agent: CurrencyAgent, notification_sender_auth: PushNotificationSenderAuth, task_store: TaskStore | None = None):
+        super().__init__(task_store)
         self.agent = agent
         self.notification_sender_auth = notification_sender_auth
 
@@ -136,7 +135,20 @@ class AgentTaskManager(InMemoryTaskManager):
         task_send_params: TaskSendParams = request.params
         query = self._get_user_query(task_send_params)
         try:
-            agent_response = self.agent.invoke(query, task_send_params.sessionId)
+            agent_response = await self.run_agent_work(
+                task_send_params.id,
+                self.session_scheduler.run(
+                    task_send_params.sessionId,
+                    self.agent_runner.run,
+                    self.agent.invoke,
+                    query,
+                    task_send_params.sessionId,
+                ),
+            )
+        except AgentWorkStopped:
+            return SendTaskResponse(
+                id=request.id, result=await self.get_task(task_send_params.id)
+            )
         except Exception as e:
             logger.error(f"Error invoking agent: {e}")
             raise ValueError(f"Error invoking agent: {e}")
@@ -161,7 +173,12 @@ class AgentTaskManager(InMemoryTaskManager):
             task_send_params: TaskSendParams = request.params
             sse_event_queue = await self.setup_sse_consumer(task_send_params.id, False)            
 
-            asyncio.create_task(self._run_streaming_agent(request))
+            self.start_agent_work(
+                task_send_params.id,
+                self.session_scheduler.run(
+                    task_send_params.sessionId, self._run_streaming_agent, request
+                ),
+            )
 
             return self.dequeue_events_for_sse(
                 request.id, task_send_params.id, sse_event_queue
@@ -198,9 +215,10 @@ class AgentTaskManager(InMemoryTaskManager):
         task = await self.update_store(
             task_id, task_status, None if artifact is None else [artifact]
         )
-        task_result = self.append_task_history(task, history_length)
         await self.send_task_notification(task)
-        return SendTaskResponse(id=request.id, result=task_result)
+        return SendTaskResponse(id=request.id, result=task).with_history_length(
+            history_length
+        )
     
     def _get_user_query(self, task_send_params: TaskSendParams) -> str:
         part = task_send_params.message.parts[0]
@@ -220,22 +238,6 @@ class AgentTaskManager(InMemoryTaskManager):
             data=task.model_dump(exclude_none=True)
         )
 
-    async def on_resubscribe_to_task(
-        self, request
-    ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
-        task_id_params: TaskIdParams = request.params
-        try:
-            sse_event_queue = await self.setup_sse_consumer(task_id_params.id, True)
-            return self.dequeue_events_for_sse(request.id, task_id_params.id, sse_event_queue)
-        except Exception as e:
-            logger.error(f"Error while reconnecting to SSE stream: {e}")
-            return JSONRPCResponse(
-                id=request.id,
-                error=InternalError(
-                    message=f"An error occurred while reconnecting to stream: {e}"
-                ),
-            )
-    
     async def set_push_notification_info(self, task_id: str, push_notification_config: PushNotificationConfig):
         # Verify the ownership of notification URL by issuing a challenge request.
         is_verified = await self.notification_sender_auth.verify_push_notification_url(push_notification_config.url)
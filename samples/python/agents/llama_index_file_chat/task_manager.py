@@ -1,4 +1,3 @@
-import asyncio
 import logging
 import traceback
 from typing import AsyncIterable, Union, Dict, Any
@@ -22,7 +21,6 @@ from common.types import (
     TaskArtifactUpdateEvent,
     TaskStatusUpdateEvent,
     Task,
-    TaskIdParams,
     PushNotificationConfig,
     InvalidParamsError,
 )
@@ -228,9 +226,10 @@ class LlamaIndexTaskManager(InMemoryTaskManager):
             task_status = TaskStatus(state=TaskState.COMPLETED)
             artifact = Artifact(parts=parts, index=0, append=False, metadata=metadata)
             task = await self.update_store(task_id, task_status, [artifact])
-            task_result = self.append_task_history(task, task_send_params.historyLength)
             await self.send_task_notification(task)
-            return SendTaskResponse(id=request.id, result=task_result)
+            return SendTaskResponse(id=request.id, result=task).with_history_length(
+                task_send_params.historyLength
+            )
         except Exception as e:
             logger.error(f"Error invoking agent: {e}")
             logger.error(traceback.format_exc())
@@ -243,9 +242,10 @@ class LlamaIndexTaskManager(InMemoryTaskManager):
             parts = [{"type": "text", "text": f"Error: {str(e)}"}]
             task_status = TaskStatus(state=TaskState.FAILED, message=Message(role="agent", parts=parts))
             task = await self.update_store(task_id, task_status, None)
-            task_result = self.append_task_history(task, task_send_params.historyLength)
             await self.send_task_notification(task)
-            return SendTaskResponse(id=request.id, result=task_result)
+            return SendTaskResponse(id=request.id, result=task).with_history_length(
+                task_send_params.historyLength
+            )
 
     async def on_send_task_subscribe(
         self, request: SendTaskStreamingRequest
@@ -264,7 +264,9 @@ class LlamaIndexTaskManager(InMemoryTaskManager):
             task_send_params: TaskSendParams = request.params
             sse_event_queue = await self.setup_sse_consumer(task_send_params.id, False)            
 
-            asyncio.create_task(self._run_streaming_agent(request))
+            self.start_agent_work(
+                task_send_params.id, self._run_streaming_agent(request)
+            )
 
             return self.dequeue_events_for_sse(
                 request.id, task_send_params.id, sse_event_queue
@@ -313,22 +315,6 @@ class LlamaIndexTaskManager(InMemoryTaskManager):
             data=task.model_dump(exclude_none=True)
         )
 
-    async def on_resubscribe_to_task(
-        self, request
-    ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
-        task_id_params: TaskIdParams = request.params
-        try:
-            sse_event_queue = await self.setup_sse_consumer(task_id_params.id, True)
-            return self.dequeue_events_for_sse(request.id, task_id_params.id, sse_event_queue)
-        except Exception as e:
-            logger.error(f"Error while reconnecting to SSE stream: {e}")
-            return JSONRPCResponse(
-                id=request.id,
-                error=InternalError(
-                    message=f"An error occurred while reconnecting to stream: {e}"
-                ),
-            )
-    
     async def set_push_notification_info(self, task_id: str, push_notification_config: PushNotificationConfig):
         # Verify the ownership of notification URL by issuing a challenge request.
         is_verified = await self.notification_sender_auth.verify_push_notification_url(push_notification_config.url)
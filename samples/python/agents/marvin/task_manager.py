@@ -1,4 +1,3 @@
-import asyncio
 import logging
 import traceback
 from collections.abc import AsyncIterable
@@ -6,7 +5,7 @@ from typing import Any
 
 import common.server.utils as utils
 from agents.marvin.agent import ExtractorAgent
-from common.server.task_manager import InMemoryTaskManager
+from common.server.task_manager import AgentWorkStopped, InMemoryTaskManager
 from common.types import (
     Artifact,
     DataPart,
@@ -21,7 +20,6 @@ from common.types import (
     SendTaskStreamingResponse,
     Task,
     TaskArtifactUpdateEvent,
-    TaskIdParams,
     TaskSendParams,
     TaskState,
     TaskStatus,
@@ -99,7 +97,12 @@ class AgentTaskManager(InMemoryTaskManager):
                 ),
             )
 
-            agent_outcome = await self.agent.invoke(query, task_send_params.sessionId)
+            agent_outcome = await self.session_scheduler.run(
+                task_send_params.sessionId,
+                self.agent.invoke,
+                query,
+                task_send_params.sessionId,
+            )
 
             final_task_status, final_artifacts = self._parse_agent_outcome(
                 agent_outcome
@@ -213,7 +216,19 @@ class AgentTaskManager(InMemoryTaskManager):
         task_send_params: TaskSendParams = request.params
         query = self._get_user_query(task_send_params)
         try:
-            agent_response = await self.agent.invoke(query, task_send_params.sessionId)
+            agent_response = await self.run_agent_work(
+                task_send_params.id,
+                self.session_scheduler.run(
+                    task_send_params.sessionId,
+                    self.agent.invoke,
+                    query,
+                    task_send_params.sessionId,
+                ),
+            )
+        except AgentWorkStopped:
+            return SendTaskResponse(
+                id=request.id, result=await self.get_task(task_send_params.id)
+            )
         except Exception as e:
             logger.error(f"Error invoking agent: {e}")
             raise ValueError(f"Error invoking agent: {e}")
@@ -243,7 +258,9 @@ class AgentTaskManager(InMemoryTaskManager):
             task_send_params: TaskSendParams = request.params
             sse_event_queue = await self.setup_sse_consumer(task_send_params.id, False)
 
-            asyncio.create_task(self._run_streaming_agent(request))
+            self.start_agent_work(
+                task_send_params.id, self._run_streaming_agent(request)
+            )
 
             return self.dequeue_events_for_sse(  # type: ignore
                 request.id, task_send_params.id, sse_event_queue
@@ -269,9 +286,10 @@ class AgentTaskManager(InMemoryTaskManager):
         task_status, artifacts = self._parse_agent_outcome(agent_response)
 
         task = await self.update_store(task_id, task_status, artifacts)
-        task_result = self.append_task_history(task, history_length)
         await self.send_task_notification(task)
-        return SendTaskResponse(id=request.id, result=task_result)
+        return SendTaskResponse(id=request.id, result=task).with_history_length(
+            history_length
+        )
 
     def _get_user_query(self, task_send_params: TaskSendParams) -> str:
         part = task_send_params.message.parts[0]
@@ -290,24 +308,6 @@ class AgentTaskManager(InMemoryTaskManager):
             push_info.url, data=task.model_dump(exclude_none=True)
         )
 
-    async def on_resubscribe_to_task(
-        self, request
-    ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
-        task_id_params: TaskIdParams = request.params
-        try:
-            sse_event_queue = await self.setup_sse_consumer(task_id_params.id, True)
-            return self.dequeue_events_for_sse(  # type: ignore
-                request.id, task_id_params.id, sse_event_queue
-            )
-        except Exception as e:
-            logger.error(f"Error while reconnecting to SSE stream: {e}")
-            return JSONRPCResponse(
-                id=request.id,
-                error=InternalError(
-                    message=f"An error occurred while reconnecting to stream: {e}"
-                ),
-            )
-
     async def set_push_notification_info(
         self, task_id: str, push_notification_config: PushNotificationConfig
     ):
@@ -1,4 +1,4 @@
-from common.server.task_manager import InMemoryTaskManager
+from common.server.task_manager import AgentWorkStopped, InMemoryTaskManager
 from agents.rovi_agent.agent import CustomerServiceAgent
 from common.utils.push_notification_auth import PushNotificationSenderAuth
 from common.types import (
@@ -18,10 +18,10 @@ from common.types import (
     SendTaskStreamingRequest,
     SendTaskStreamingResponse,
     InvalidParamsError,
+    PushNotificationConfig,
 )
 import common.server.utils as utils
 from typing import Union, AsyncIterable
-import asyncio
 import logging
 import traceback
 from datetime import datetime
@@ -34,10 +34,6 @@ class AgentTaskManager(InMemoryTaskManager):
         super().__init__()
         self.agent = agent
         self.notification_sender_auth = notification_sender_auth
-        self.lock = asyncio.Lock()
-        self.tasks = {}
-        self.sse_queues = {}
-        self.push_notification_info = {}
 
     async def _run_streaming_agent(self, request: SendTaskStreamingRequest):
         task_send_params: TaskSendParams = request.params
@@ -96,7 +92,7 @@ class AgentTaskManager(InMemoryTaskManager):
             await self.update_store(task_send_params.id, task_status, None)
             await self.send_task_notification(await self.get_task(task_send_params.id))
 
-    async def _run_streaming_agent_direct(self, _request_id: str, task_id: str):
+    async def _run_streaming_agent_direct(self, task_id: str):
         """Run the streaming agent directly without SSE events."""
         try:
             # Get the task
@@ -115,7 +111,7 @@ class AgentTaskManager(InMemoryTaskManager):
 
             # Create a status update event and send it to the queue
             status_event = TaskStatusUpdateEvent(id=task_id, status=working_status, final=False)
-            await self.send_sse_event(task_id, status_event)
+            await self.enqueue_events_for_sse(task_id, status_event)
 
             # Process the request
             async for agent_response in self.agent.stream(query, task_id):
@@ -128,11 +124,11 @@ class AgentTaskManager(InMemoryTaskManager):
 
                     # Create an artifact update event and send it to the queue
                     artifact_event = TaskArtifactUpdateEvent(id=task_id, artifact=artifact)
-                    await self.send_sse_event(task_id, artifact_event)
+                    await self.enqueue_events_for_sse(task_id, artifact_event)
 
                     # Create a status update event with final=True and send it to the queue
                     status_event = TaskStatusUpdateEvent(id=task_id, status=task_status, final=True)
-                    await self.send_sse_event(task_id, status_event)
+                    await self.enqueue_events_for_sse(task_id, status_event)
 
                     # Send notification
                     await self.send_task_notification(task)
@@ -149,7 +145,7 @@ class AgentTaskManager(InMemoryTaskManager):
 
                     # Create a status update event with final=True and send it to the queue
                     status_event = TaskStatusUpdateEvent(id=task_id, status=task_status, final=True)
-                    await self.send_sse_event(task_id, status_event)
+                    await self.enqueue_events_for_sse(task_id, status_event)
 
                     # Send notification
                     await self.send_task_notification(task)
@@ -166,10 +162,13 @@ class AgentTaskManager(InMemoryTaskManager):
 
                     # Create a status update event with final=False and send it to the queue
                     status_event = TaskStatusUpdateEvent(id=task_id, status=task_status, final=False)
-                    await self.send_sse_event(task_id, status_event)
+                    await self.enqueue_events_for_sse(task_id, status_event)
 
                     # Send notification
                     await self.send_task_notification(task)
+        except AgentWorkStopped:
+            # tasks/cancel has already ended the task and its streams.
+            raise
         except Exception as e:
             logger.error(f"Error in direct streaming agent: {e}")
             logger.error(traceback.format_exc())
@@ -191,7 +190,7 @@ class AgentTaskManager(InMemoryTaskManager):
 
             # Create a status update event with final=True and send it to the queue
             status_event = TaskStatusUpdateEvent(id=task_id, status=task_status, final=True)
-            await self.send_sse_event(task_id, status_event)
+            await self.enqueue_events_for_sse(task_id, status_event)
 
             # Send notification
             await self.send_task_notification(task)
@@ -221,117 +220,12 @@ class AgentTaskManager(InMemoryTaskManager):
 
         return ""
 
-    async def upsert_task(self, task_params: TaskSendParams) -> None:
-        """Upsert a task."""
-        logger.info(f"Upserting task {task_params.id}")
-        async with self.lock:
-            if task_params.id not in self.tasks:
-                self.tasks[task_params.id] = Task(
-                    id=task_params.id,
-                    sessionId=task_params.sessionId,
-                    status=TaskStatus(state="submitted"),
-                    history=[task_params.message] if task_params.message else [],
-                )
-            else:
-                # Update the task history
-                if task_params.message:
-                    self.tasks[task_params.id].history.append(task_params.message)
-
-    async def get_task(self, task_id: str) -> Task:
-        """Get a task by ID."""
-        async with self.lock:
-            try:
-                return self.tasks[task_id]
-            except KeyError:
-                raise ValueError(f"Task {task_id} not found")
-
-    async def update_store(
-        self, task_id: str, status: TaskStatus, artifacts: list[Artifact] = None
-    ) -> Task:
-        """Update the task store."""
-        async with self.lock:
-            if task_id not in self.tasks:
-                raise ValueError(f"Task {task_id} not found")
-
-            task = self.tasks[task_id]
-            task.status = status
-
-            if artifacts:
-                if not hasattr(task, "artifacts") or task.artifacts is None:
-                    task.artifacts = []
-                task.artifacts.extend(artifacts)
-
-            return task
-
-    async def setup_sse_consumer(self, task_id: str) -> asyncio.Queue:
-        """Set up an SSE consumer for a task."""
-        async with self.lock:
-            # Always create the queue for the task
-            if task_id not in self.sse_queues:
-                self.sse_queues[task_id] = []
-
-            queue = asyncio.Queue()
-            self.sse_queues[task_id].append(queue)
-            return queue
-
-    async def send_sse_event(self, task_id: str, event: Union[TaskStatusUpdateEvent, TaskArtifactUpdateEvent]) -> None:
-        """Send an SSE event for a task."""
-        try:
-            if task_id in self.sse_queues:
-                for queue in self.sse_queues[task_id]:
-                    await queue.put(event)
-        except Exception as e:
-            logger.error(f"Error sending SSE event: {e}")
-
-    async def dequeue_events_for_sse(
-        self, request_id: str, task_id: str, queue: asyncio.Queue
-    ) -> AsyncIterable[SendTaskStreamingResponse]:
-        """Dequeue events for SSE."""
-        try:
-            # Send initial response with the task
-            task = await self.get_task(task_id)
-            task_dict = task.dict()
-            # Add final flag to indicate this is not the final response
-            task_dict["final"] = False
-            yield SendTaskStreamingResponse(id=request_id, result=task_dict)
-
-            # Start the streaming agent in a separate task
-            asyncio.create_task(self._run_streaming_agent_direct(request_id, task_id))
-
-            # Wait for events from the streaming agent
-            while True:
-                try:
-                    # Use a timeout to periodically check if the task is still active
-                    event = await asyncio.wait_for(queue.get(), timeout=15.0)
-                    yield SendTaskStreamingResponse(id=request_id, result=event)
-
-                    # Check if this is the final event
-                    if hasattr(event, "final") and event.final:
-                        break
-                except asyncio.TimeoutError:
-                    # Send a ping to keep the connection alive
-                    task = await self.get_task(task_id)
-                    task_dict = task.dict()
-                    # Add final flag to indicate this is not the final response
-                    task_dict["final"] = False
-                    yield SendTaskStreamingResponse(id=request_id, result=task_dict)
-        except Exception as e:
-            logger.error(f"Error in dequeue_events_for_sse: {e}")
-            logger.error(traceback.format_exc())
-            # Remove the queue from the list
-            if task_id in self.sse_queues and queue in self.sse_queues[task_id]:
-                self.sse_queues[task_id].remove(queue)
-
-    async def get_push_notification_info(self, task_id: str):
-        """Get push notification info for a task."""
-        async with self.lock:
-            return self.push_notification_info.get(task_id)
-
-    async def set_push_notification_info(self, task_id: str, push_notification_info) -> bool:
+    async def set_push_notification_info(
+        self, task_id: str, push_notification_config: PushNotificationConfig
+    ) -> bool:
         """Set push notification info for a task."""
         try:
-            async with self.lock:
-                self.push_notification_info[task_id] = push_notification_info
+            await super().set_push_notification_info(task_id, push_notification_config)
             return True
         except Exception as e:
             logger.error(f"Error setting push notification info: {e}")
@@ -344,8 +238,8 @@ class AgentTaskManager(InMemoryTaskManager):
 
         try:
             task_id = task.id
-            push_notification_info = await self.get_push_notification_info(task_id)
-            if push_notification_info:
+            if await self.has_push_notification_info(task_id):
+                push_notification_info = await self.get_push_notification_info(task_id)
                 await utils.send_push_notification(
                     push_notification_info.url,
                     task,
@@ -360,11 +254,12 @@ class AgentTaskManager(InMemoryTaskManager):
         if validation_error:
             return SendTaskResponse(id=request.id, error=validation_error.error)
 
+        await self.upsert_task(request.params)
+
         if request.params.pushNotification:
             if not await self.set_push_notification_info(request.params.id, request.params.pushNotification):
                 return SendTaskResponse(id=request.id, error=InvalidParamsError(message="Push notification URL is invalid"))
 
-        await self.upsert_task(request.params)
         task = await self.update_store(
             request.params.id, TaskStatus(state="working"), None
         )
@@ -372,7 +267,14 @@ class AgentTaskManager(InMemoryTaskManager):
 
         query = self._get_user_query(request.params)
         try:
-            agent_response = self.agent.invoke(query, request.params.id)
+            agent_response = await self.run_agent_work(
+                request.params.id,
+                self.agent_runner.run(self.agent.invoke, query, request.params.id),
+            )
+        except AgentWorkStopped:
+            return SendTaskResponse(
+                id=request.id, result=await self.get_task(request.params.id)
+            )
         except Exception as e:
             logger.error(f"Error in agent: {e}")
             logger.error(traceback.format_exc())
@@ -415,9 +317,12 @@ class AgentTaskManager(InMemoryTaskManager):
                     return JSONRPCResponse(id=request.id, error=InvalidParamsError(message="Push notification URL is invalid"))
 
             task_send_params: TaskSendParams = request.params
-            sse_event_queue = await self.setup_sse_consumer(task_send_params.id)
+            sse_event_queue = await self.setup_sse_consumer(task_send_params.id, False)
+
+            self.start_agent_work(
+                task_send_params.id, self._run_streaming_agent_direct(task_send_params.id)
+            )
 
-            # Return the streaming response directly
             return self.dequeue_events_for_sse(
                 request.id, task_send_params.id, sse_event_queue
             )
@@ -1,8 +1,7 @@
-import asyncio
 import logging
 from typing import AsyncIterable
 
-from common.server.task_manager import InMemoryTaskManager
+from common.server.task_manager import AgentWorkStopped, InMemoryTaskManager
 from common.types import (
     Artifact,
     InternalError,
@@ -53,7 +52,14 @@ class TaskManager(InMemoryTaskManager):
 
         query = request.params.message.parts[0].text
         try:
-            agent_response = await self.agent.invoke(query, request.params.sessionId)
+            agent_response = await self.run_agent_work(
+                request.params.id,
+                self.session_scheduler.run(
+                    request.params.sessionId, self.agent.invoke, query, request.params.sessionId
+                ),
+            )
+        except AgentWorkStopped:
+            return SendTaskResponse(id=request.id, result=await self.get_task(request.params.id))
         except Exception as e:
             logger.error(f"Semantic Kernel Task Manager error: {e}")
             raise ValueError(f"Agent error: {e}")
@@ -78,7 +84,12 @@ class TaskManager(InMemoryTaskManager):
 
             await self.upsert_task(request.params)
             sse_queue = await self.setup_sse_consumer(request.params.id, False)
-            asyncio.create_task(self._run_streaming_agent(request))
+            self.start_agent_work(
+                request.params.id,
+                self.session_scheduler.run(
+                    request.params.sessionId, self._run_streaming_agent, request
+                ),
+            )
             return self.dequeue_events_for_sse(request.id, request.params.id, sse_queue)
         except Exception as e:
             logger.error(f"Error in SSE stream: {e}")
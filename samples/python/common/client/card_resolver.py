@@ -4,18 +4,73 @@ from common.types import (
     A2AClientJSONError,
 )
 import json
+import re
+import time
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class _CachedCard:
+    __slots__ = ("card", "etag", "expires_at")
+
+    def __init__(self, card: AgentCard, etag: str | None, expires_at: float):
+        self.card = card
+        self.etag = etag
+        self.expires_at = expires_at
+
+
+# Shared by all resolvers, since hosts usually build a new resolver per lookup.
+_card_cache: dict[str, _CachedCard] = {}
+
+
+def _expires_at(response: httpx.Response) -> float:
+    cache_control = response.headers.get("cache-control", "")
+    match = _MAX_AGE.search(cache_control)
+    if match is None or "no-cache" in cache_control or "no-store" in cache_control:
+        return 0.0
+    return time.monotonic() + int(match.group(1))
 
 
 class A2ACardResolver:
-    def __init__(self, base_url, agent_card_path="/.well-known/agent.json"):
+    """Fetches agent cards, honouring the server's Cache-Control and ETag.
+
+    A cached card is reused until its max-age runs out and is then
+    revalidated with If-None-Match, so an unchanged card costs a 304.
+    """
+
+    def __init__(
+        self, base_url, agent_card_path="/.well-known/agent.json", use_cache=True
+    ):
         self.base_url = base_url.rstrip("/")
         self.agent_card_path = agent_card_path.lstrip("/")
+        self.use_cache = use_cache
 
     def get_agent_card(self) -> AgentCard:
+        url = self.base_url + "/" + self.agent_card_path
+        cached = _card_cache.get(url) if self.use_cache else None
+        # Callers may modify the card they get, so hand out copies of it.
+        if cached is not None and time.monotonic() < cached.expires_at:
+            return cached.card.model_copy(deep=True)
+
+        headers = {}
+        if cached is not None and cached.etag:
+            headers["If-None-Match"] = cached.etag
+
         with httpx.Client() as client:
-            response = client.get(self.base_url + "/" + self.agent_card_path)
+            response = client.get(url, headers=headers)
+            if response.status_code == 304 and cached is not None:
+                cached.expires_at = _expires_at(response)
+                return cached.card.model_copy(deep=True)
             response.raise_for_status()
             try:
-                return AgentCard(**response.json())
+                card = AgentCard(**response.json())
             except json.JSONDecodeError as e:
                 raise A2AClientJSONError(str(e)) from e
+
+        if self.use_cache:
+            _card_cache[url] = _CachedCard(
+                card.model_copy(deep=True),
+                response.headers.get("etag"),
+                _expires_at(response),
+            )
+        return card
@@ -1,5 +1,5 @@
 import httpx
-from httpx_sse import connect_sse
+from httpx_sse import aconnect_sse
 from typing import Any, AsyncIterable
 from common.types import (
     AgentCard,
@@ -7,6 +7,7 @@ from common.types import (
     SendTaskRequest,
     SendTaskResponse,
     JSONRPCRequest,
+    JSONRPCResponse,
     GetTaskResponse,
     CancelTaskResponse,
     CancelTaskRequest,
@@ -18,9 +19,18 @@ from common.types import (
     A2AClientJSONError,
     SendTaskStreamingRequest,
     SendTaskStreamingResponse,
+    TaskResubscriptionRequest,
 )
 import json
 
+BATCH_RESPONSE_TYPES = {
+    SendTaskRequest: SendTaskResponse,
+    GetTaskRequest: GetTaskResponse,
+    CancelTaskRequest: CancelTaskResponse,
+    SetTaskPushNotificationRequest: SetTaskPushNotificationResponse,
+    GetTaskPushNotificationRequest: GetTaskPushNotificationResponse,
+}
+
 
 class A2AClient:
     def __init__(self, agent_card: AgentCard = None, url: str = None):
@@ -39,24 +49,26 @@ class A2AClient:
         self, payload: dict[str, Any]
     ) -> AsyncIterable[SendTaskStreamingResponse]:
         request = SendTaskStreamingRequest(params=payload)
-        with httpx.Client(timeout=None) as client:
-            with connect_sse(
+        async with httpx.AsyncClient(timeout=None) as client:
+            async with aconnect_sse(
                 client, "POST", self.url, json=request.model_dump()
             ) as event_source:
                 try:
-                    for sse in event_source.iter_sse():
+                    async for sse in event_source.aiter_sse():
                         yield SendTaskStreamingResponse(**json.loads(sse.data))
                 except json.JSONDecodeError as e:
                     raise A2AClientJSONError(str(e)) from e
                 except httpx.RequestError as e:
                     raise A2AClientHTTPError(400, str(e)) from e
 
-    async def _send_request(self, request: JSONRPCRequest) -> dict[str, Any]:
+    async def _send_request(
+        self, request: JSONRPCRequest, timeout: float = 30
+    ) -> dict[str, Any]:
         async with httpx.AsyncClient() as client:
             try:
                 # Image generation could take time, adding timeout
                 response = await client.post(
-                    self.url, json=request.model_dump(), timeout=30
+                    self.url, json=request.model_dump(), timeout=timeout
                 )
                 response.raise_for_status()
                 return response.json()
@@ -65,9 +77,88 @@ class A2AClient:
             except json.JSONDecodeError as e:
                 raise A2AClientJSONError(str(e)) from e
 
-    async def get_task(self, payload: dict[str, Any]) -> GetTaskResponse:
+    async def batch(self, requests: list[JSONRPCRequest]) -> list[JSONRPCResponse]:
+        """Sends several requests in one JSON-RPC batch.
+
+        Responses are returned in the order of ``requests``. Streaming
+        requests cannot be batched. For example, to poll many tasks at once::
+
+            responses = await client.batch(
+                [GetTaskRequest(params={"id": task_id}) for task_id in task_ids]
+            )
+        """
+        for request in requests:
+            if isinstance(request, (SendTaskStreamingRequest, TaskResubscriptionRequest)):
+                raise ValueError(f"{request.method} cannot be batched")
+
+        async with httpx.AsyncClient() as client:
+            try:
+                response = await client.post(
+                    self.url,
+                    json=[request.model_dump() for request in requests],
+                    timeout=30,
+                )
+                response.raise_for_status()
+                body = response.json() if response.content else []
+            except httpx.HTTPStatusError as e:
+                raise A2AClientHTTPError(e.response.status_code, str(e)) from e
+            except json.JSONDecodeError as e:
+                raise A2AClientJSONError(str(e)) from e
+
+        if isinstance(body, dict):
+            # The whole batch was rejected with a single error response.
+            raise A2AClientJSONError(f"Batch request failed: {body.get('error')}")
+        by_id = {entry.get("id"): entry for entry in body}
+        responses = []
+        for request in requests:
+            if request.id not in by_id:
+                raise A2AClientJSONError(f"No response for batch request {request.id}")
+            response_type = BATCH_RESPONSE_TYPES.get(type(request), JSONRPCResponse)
+            responses.append(_validate_response(response_type, request, by_id[request.id]))
+        return responses
+
+    async def get_task(
+        self,
+        payload: dict[str, Any],
+        include: list[str] | None = None,
+        exclude_artifact_bytes: bool = False,
+        since_version: int | None = None,
+        wait_ms: int | None = None,
+    ) -> GetTaskResponse:
+        """Fetches a task.
+
+        ``include`` limits the response to the listed optional fields of the
+        task (``id``, ``status`` and ``version`` always come back), and
+        ``exclude_artifact_bytes`` leaves the bytes of artifact file parts
+        out. A status poll can use ``include=["status"]`` to stay small
+        however large the task's artifacts are.
+
+        ``since_version`` returns only the history and artifacts added after
+        that ``version`` of the task, and ``wait_ms`` makes the server hold
+        the call until the task changes. Polling a task then takes one cheap
+        call per change::
+
+            version = 0
+            while True:
+                response = await client.get_task(
+                    {"id": task_id}, since_version=version, wait_ms=30_000
+                )
+                version = response.result.version
+                ...
+        """
+        if include is not None:
+            payload = {**payload, "include": include}
+        if exclude_artifact_bytes:
+            payload = {**payload, "excludeArtifactBytes": True}
+        if since_version is not None:
+            payload = {**payload, "sinceVersion": since_version}
+        if wait_ms is not None:
+            payload = {**payload, "waitMs": wait_ms}
         request = GetTaskRequest(params=payload)
-        return GetTaskResponse(**await self._send_request(request))
+        timeout = 30 + (request.params.waitMs or 0) / 1000
+        return _validate_response(
+            GetTaskResponse, request, await self._send_request(request, timeout)
+        )
 
     async def cancel_task(self, payload: dict[str, Any]) -> CancelTaskResponse:
         request = CancelTaskRequest(params=payload)
@@ -84,3 +175,12 @@ class A2AClient:
     ) -> GetTaskPushNotificationResponse:
         request = GetTaskPushNotificationRequest(params=payload)
         return GetTaskPushNotificationResponse(**await self._send_request(request))
+
+
+def _validate_response(
+    response_type: type[JSONRPCResponse], request: JSONRPCRequest, body: dict[str, Any]
+) -> JSONRPCResponse:
+    # File parts sent without their bytes are only valid if we asked for that.
+    if isinstance(request, GetTaskRequest) and request.params.excludeArtifactBytes:
+        return response_type.model_validate(body, context={"excludeArtifactBytes": True})
+    return response_type(**body)
@@ -1,4 +1,33 @@
 from .server import A2AServer
 from .task_manager import TaskManager, InMemoryTaskManager
+from .task_store import TaskStore, InMemoryTaskStore
+from .sqlite_task_store import SQLiteTaskStore
+from .retention import RetentionPolicy
+from .sse import OverflowPolicy
+from .compression import CompressionPolicy
+from .agent_runner import AgentRunner
+from .admission import AdmissionPolicy
+from .session_scheduler import SessionScheduler
+from .profiling import ProfilingPolicy
+from .loop_monitor import LoopMonitorPolicy
+from .disconnect import DisconnectPolicy
+from .idempotency import IdempotencyPolicy
 
-__all__ = ["A2AServer", "TaskManager", "InMemoryTaskManager"]
+__all__ = [
+    "A2AServer",
+    "TaskManager",
+    "InMemoryTaskManager",
+    "TaskStore",
+    "InMemoryTaskStore",
+    "SQLiteTaskStore",
+    "RetentionPolicy",
+    "OverflowPolicy",
+    "CompressionPolicy",
+    "AgentRunner",
+    "AdmissionPolicy",
+    "SessionScheduler",
+    "ProfilingPolicy",
+    "LoopMonitorPolicy",
+    "DisconnectPolicy",
+    "IdempotencyPolicy",
+]
@@ -0,0 +1,130 @@
+from collections import deque
+from pydantic import BaseModel
+from common.server.metrics import Histogram
+import asyncio
+import time
+
+
+class AdmissionPolicy(BaseModel):
+    """Limits on the agent runs A2AServer accepts at once.
+
+    ``tasks/send`` and ``tasks/sendSubscribe`` are limited separately; a
+    stream holds its slot until its agent work has finished, even if the
+    client disconnected before. Requests beyond ``max_concurrent_*`` wait,
+    first come first served, in a queue of at most ``max_queued_*``; once that
+    is full, requests are rejected at once with HTTP 429 and
+    ``Retry-After: retry_after_seconds``. A limit left as None is not
+    enforced. Other methods are never limited.
+    """
+
+    max_concurrent_sends: int | None = None
+    max_queued_sends: int | None = None
+    max_concurrent_streams: int | None = None
+    max_queued_streams: int | None = None
+    retry_after_seconds: int = 1
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request finds the wait queue full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Server is busy, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimiter:
+    """A FIFO semaphore with a bounded wait queue and a queue-wait histogram.
+
+    A released slot is handed straight to the oldest waiter, so newcomers
+    cannot overtake the queue.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int | None,
+        max_queued: int | None,
+        retry_after: int = 1,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.retry_after = retry_after
+        self.running = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.queue_wait = Histogram()
+        self._waiters: deque[asyncio.Future] = deque()
+
+    async def acquire(self):
+        if self.max_concurrent is None or (
+            self.running < self.max_concurrent and not self._waiters
+        ):
+            self.running += 1
+            self.admitted += 1
+            self.queue_wait.observe(0.0)
+            return
+
+        if self.max_queued is not None and len(self._waiters) >= self.max_queued:
+            self.rejected += 1
+            raise AdmissionRejected(self.retry_after)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        queued_at = time.monotonic()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the cancellation.
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+        self.admitted += 1
+        self.queue_wait.observe(time.monotonic() - queued_at)
+
+    def release(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # The slot passes to the waiter; ``running`` is unchanged.
+                waiter.set_result(None)
+                return
+        self.running -= 1
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queued": self.max_queued,
+            "running": self.running,
+            "queued": len(self._waiters),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "queue_wait_seconds": self.queue_wait.snapshot(),
+        }
+
+
+class AdmissionController:
+    """Applies an AdmissionPolicy, with one limiter per kind of agent run."""
+
+    def __init__(self, policy: AdmissionPolicy):
+        self.policy = policy
+        self.sends = ConcurrencyLimiter(
+            policy.max_concurrent_sends,
+            policy.max_queued_sends,
+            policy.retry_after_seconds,
+        )
+        self.streams = ConcurrencyLimiter(
+            policy.max_concurrent_streams,
+            policy.max_queued_streams,
+            policy.retry_after_seconds,
+        )
+        self._limiters = {
+            "tasks/send": self.sends,
+            "tasks/sendSubscribe": self.streams,
+        }
+
+    def limiter_for(self, method: str) -> ConcurrencyLimiter | None:
+        return self._limiters.get(method)
+
+    def stats(self) -> dict[str, dict]:
+        return {"sends": self.sends.stats(), "streams": self.streams.stats()}
@@ -0,0 +1,120 @@
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from common.utils.tracing import span
+import asyncio
+import contextvars
+import functools
+import inspect
+import threading
+
+DEFAULT_AGENT_THREADS = 8
+
+_DONE = object()
+
+
+class AgentRunner:
+    """Calls agent code without blocking the event loop.
+
+    Coroutine functions and async iterators are awaited on the loop as usual.
+    Synchronous calls (e.g. a LangGraph ``invoke`` or a CrewAI ``kickoff``)
+    run on a bounded thread pool, so a slow LLM call no longer stalls
+    ``tasks/get`` or SSE delivery for everyone else. Calls beyond
+    ``max_workers`` wait their turn; ``stats()`` reports how many do.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_AGENT_THREADS):
+        self.max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self._lock = threading.Lock()
+
+    def _submit(self, fn: Callable, *args, **kwargs) -> asyncio.Future:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="a2a-agent"
+            )
+        # Like asyncio.to_thread, run in a copy of the caller's context.
+        dequeued = [False]
+        call = functools.partial(
+            contextvars.copy_context().run, self._track, dequeued, fn, *args, **kwargs
+        )
+        with self._lock:
+            self.queued += 1
+        future = asyncio.get_running_loop().run_in_executor(self._executor, call)
+        # A call cancelled (e.g. by tasks/cancel) before a thread picked it up
+        # never runs, so it has to leave the queue here. One that already
+        # runs cannot be interrupted; its result is dropped when it returns.
+        future.add_done_callback(lambda f: f.cancelled() and self._dequeue(dequeued))
+        return future
+
+    def _dequeue(self, dequeued: list[bool], start: bool = False) -> bool:
+        # The counters change on agent threads and on the loop alike, so every
+        # update happens under the lock.
+        with self._lock:
+            if start:
+                self.running += 1
+            if dequeued[0]:
+                return False
+            dequeued[0] = True
+            self.queued -= 1
+            return True
+
+    def _track(self, dequeued: list[bool], fn: Callable, *args, **kwargs) -> Any:
+        self._dequeue(dequeued, start=True)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Returns ``fn(*args, **kwargs)``, off the loop if ``fn`` is synchronous."""
+        with span("agent.run", function=getattr(fn, "__qualname__", repr(fn))):
+            if inspect.iscoroutinefunction(fn):
+                return await fn(*args, **kwargs)
+            result = await self._submit(fn, *args, **kwargs)
+            if inspect.isawaitable(result):
+                return await result
+            return result
+
+    async def iterate(self, fn: Callable, *args, **kwargs) -> AsyncIterator[Any]:
+        """Yields the items of ``fn(*args, **kwargs)``, sync or async.
+
+        A synchronous iterator is advanced on the thread pool, one item at a
+        time, so each blocking step runs off the loop.
+        """
+        if inspect.isasyncgenfunction(fn) or inspect.iscoroutinefunction(fn):
+            iterable = fn(*args, **kwargs)
+            if inspect.isawaitable(iterable):
+                iterable = await iterable
+        else:
+            iterable = await self._submit(fn, *args, **kwargs)
+
+        if hasattr(iterable, "__aiter__"):
+            async for item in iterable:
+                yield item
+            return
+
+        iterator = iter(iterable)
+        while True:
+            item = await self._submit(next, iterator, _DONE)
+            if item is _DONE:
+                return
+            yield item
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "max_workers": self.max_workers,
+            "queued": self.queued,
+            "running": self.running,
+            "completed": self.completed,
+        }
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
@@ -0,0 +1,187 @@
+from pydantic import BaseModel
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+import time
+import zlib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class CompressionPolicy(BaseModel):
+    """When and how A2AServer compresses responses.
+
+    JSON responses of at least ``min_size`` bytes are compressed with the best
+    encoding the client accepts: zstd when the optional ``zstandard`` package
+    is installed, otherwise gzip. SSE streams are only compressed when
+    ``compress_streams`` is set, with gzip flushed after every message so
+    events are not held back; turn it on only if no proxy between the server
+    and its clients buffers compressed streams.
+    """
+
+    min_size: int = 1024
+    gzip_level: int = 6
+    zstd_level: int = 3
+    compress_streams: bool = False
+
+
+def _accepted_encodings(accept_encoding: str) -> dict[str, float]:
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = quality
+    return accepted
+
+
+class _EncodingStats:
+    __slots__ = ("responses", "bytes_in", "bytes_out", "cpu_seconds")
+
+    def __init__(self):
+        self.responses = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+
+    def record(self, bytes_in: int, bytes_out: int, cpu_seconds: float):
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+        self.cpu_seconds += cpu_seconds
+
+    def as_dict(self) -> dict[str, float | int]:
+        return {
+            "responses": self.responses,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "ratio": self.bytes_out / self.bytes_in if self.bytes_in else 0.0,
+            "cpu_seconds": self.cpu_seconds,
+        }
+
+
+class ResponseCompressor:
+    """Negotiates Content-Encoding and compresses responses, keeping metrics.
+
+    ``stats()`` reports, per encoding, how many bytes went in and out (and so
+    the compression ratio) and the CPU time spent, to help tune ``min_size``
+    and the levels.
+    """
+
+    def __init__(self, policy: CompressionPolicy | None = None):
+        self.policy = policy or CompressionPolicy()
+        self.encodings = ["zstd", "gzip"] if zstandard is not None else ["gzip"]
+        self.skipped = 0
+        self._stats = {
+            encoding: _EncodingStats() for encoding in self.encodings
+        }
+        self._zstd = (
+            zstandard.ZstdCompressor(level=self.policy.zstd_level)
+            if zstandard is not None
+            else None
+        )
+
+    def negotiate(self, request: Request, encodings: list[str] | None = None) -> str | None:
+        """The preferred encoding among ``encodings`` the request accepts, if any."""
+        accept_encoding = request.headers.get("accept-encoding")
+        if not accept_encoding:
+            return None
+        accepted = _accepted_encodings(accept_encoding)
+        best, best_quality = None, 0.0
+        for encoding in encodings or self.encodings:
+            quality = accepted.get(encoding, accepted.get("*", 0.0))
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        started = time.thread_time()
+        if encoding == "zstd":
+            compressed = self._zstd.compress(body)
+        else:
+            compressed = zlib.compress(body, self.policy.gzip_level, wbits=31)
+        stats = self._stats[encoding]
+        stats.responses += 1
+        stats.record(len(body), len(compressed), time.thread_time() - started)
+        return compressed
+
+    def compress_response(self, request: Request, response: Response) -> Response:
+        """Compresses a buffered response in place when it is large enough."""
+        if "content-encoding" in response.headers:
+            return response
+        response.headers.append("Vary", "Accept-Encoding")
+        if len(response.body) < self.policy.min_size:
+            self.skipped += 1
+            return response
+        encoding = self.negotiate(request)
+        if encoding is None:
+            self.skipped += 1
+            return response
+
+        response.body = self.compress(response.body, encoding)
+        response.headers["Content-Encoding"] = encoding
+        response.headers["Content-Length"] = str(len(response.body))
+        return response
+
+    def compress_stream(self, request: Request, response: Response):
+        """Wraps a streaming response to gzip it, flushing after every message."""
+        if not self.policy.compress_streams or self.negotiate(request, ["gzip"]) is None:
+            return response
+        return _GzipStream(response, self.policy.gzip_level, self._stats["gzip"])
+
+    def stats(self) -> dict[str, int | dict[str, float | int]]:
+        return {
+            "skipped": self.skipped,
+            **{encoding: stats.as_dict() for encoding, stats in self._stats.items()},
+        }
+
+
+class _GzipStream:
+    """ASGI wrapper gzipping every body message of a streaming response.
+
+    Heartbeats written by the response itself go through the same compressor,
+    so the stream stays a single valid gzip member.
+    """
+
+    def __init__(self, response: Response, level: int, stats: _EncodingStats):
+        self.response = response
+        self.level = level
+        self.stats = stats
+
+    @property
+    def headers(self) -> MutableHeaders:
+        return self.response.headers
+
+    async def __call__(self, scope, receive, send):
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        self.stats.responses += 1
+
+        async def compressed_send(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                headers["Content-Encoding"] = "gzip"
+                headers.append("Vary", "Accept-Encoding")
+                del headers["Content-Length"]
+            elif message["type"] == "http.response.body":
+                body = message.get("body", b"")
+                started = time.thread_time()
+                compressed = compressor.compress(body)
+                if message.get("more_body", False):
+                    compressed += compressor.flush(zlib.Z_SYNC_FLUSH)
+                else:
+                    compressed += compressor.flush()
+                self.stats.record(
+                    len(body), len(compressed), time.thread_time() - started
+                )
+                message = {**message, "body": compressed}
+            await send(message)
+
+        await self.response(scope, receive, compressed_send)
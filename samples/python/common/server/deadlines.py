@@ -0,0 +1,41 @@
+from typing import Any
+import contextvars
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Task metadata key holding how long a send may run, in milliseconds.
+DEADLINE_METADATA_KEY = "deadlineMs"
+
+# The time.monotonic() by which the current agent work must finish. The task
+# manager sets it for the work of a task with a deadline; threads started
+# through AgentRunner inherit it.
+current_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    "a2a_current_deadline", default=None
+)
+
+
+def deadline_from_metadata(metadata: dict[str, Any] | None) -> float | None:
+    """The budget, in seconds, that a send's metadata asks for, if any."""
+    if not metadata or DEADLINE_METADATA_KEY not in metadata:
+        return None
+    value = metadata[DEADLINE_METADATA_KEY]
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        logger.warning(f"Ignoring invalid {DEADLINE_METADATA_KEY}: {value!r}")
+        return None
+    return value / 1000
+
+
+def time_budget(default: float | None = None) -> float | None:
+    """Seconds left before the current work's deadline.
+
+    Agent code uses this to bound its own waits, e.g. as the timeout of an
+    HTTP call: the smaller of the time left and ``default``, or ``default``
+    when the work has no deadline.
+    """
+    deadline = current_deadline.get()
+    if deadline is None:
+        return default
+    remaining = max(deadline - time.monotonic(), 0.0)
+    return remaining if default is None else min(remaining, default)
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+
+
+class DisconnectPolicy(BaseModel):
+    """What an InMemoryTaskManager does with agent work nobody waits for.
+
+    A task is abandoned when its last SSE subscriber disconnects before the
+    stream ended, while agent work for it is still running and no push
+    notification config is set for it. If it is still abandoned after
+    ``grace_seconds`` (no client resubscribed and no push config was set
+    meanwhile), its work is canceled as if by ``tasks/cancel``, which frees
+    its session slot and agent threads for other clients.
+
+    Without a policy, abandoned work runs to completion.
+    """
+
+    grace_seconds: float = 30.0
@@ -0,0 +1,109 @@
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from pydantic import BaseModel
+from common.types import SendTaskRequest, SendTaskResponse
+import asyncio
+import hashlib
+import time
+
+
+class IdempotencyPolicy(BaseModel):
+    """How long an InMemoryTaskManager remembers the answers to tasks/send.
+
+    Deduplication is off unless a policy is passed to the manager.
+
+    A send is identified by its task id and the hash of its message. While
+    one is running, an identical send (typically a client retrying after a
+    timeout) waits for the same run instead of starting another. After it
+    succeeded, identical sends get the same response for ``ttl_seconds``;
+    at most ``max_entries`` responses are kept. A client that really means
+    to send the same message twice within that time can make the messages
+    differ, e.g. in their metadata.
+    """
+
+    ttl_seconds: float = 60.0
+    max_entries: int = 1024
+
+
+class SendDeduplicator:
+    """Single flight and a short-lived response cache for tasks/send."""
+
+    def __init__(self, policy: IdempotencyPolicy):
+        self.policy = policy
+        self._in_flight: dict[tuple[str, str], asyncio.Task] = {}
+        # key -> (expiry, response), oldest first.
+        self._completed: OrderedDict[tuple[str, str], tuple[float, SendTaskResponse]] = (
+            OrderedDict()
+        )
+        self.executed = 0
+        self.joined = 0
+        self.cache_hits = 0
+
+    @staticmethod
+    def key(request: SendTaskRequest) -> tuple[str, str]:
+        message = request.params.message.model_dump_json().encode()
+        return request.params.id, hashlib.sha256(message).hexdigest()
+
+    async def run(
+        self,
+        request: SendTaskRequest,
+        handler: Callable[[SendTaskRequest], Awaitable[SendTaskResponse]],
+    ) -> SendTaskResponse:
+        """Answers ``request`` with ``handler``, unless an identical send is
+        running or has just been answered."""
+        key = self.key(request)
+        self._expire()
+        cached = self._completed.get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            return _for_request(cached[1], request)
+
+        running = self._in_flight.get(key)
+        if running is not None:
+            self.joined += 1
+        else:
+            self.executed += 1
+            running = asyncio.create_task(handler(request))
+            self._in_flight[key] = running
+            running.add_done_callback(lambda done: self._finish(key, done))
+        # Shielded: a caller that goes away (the client timed out) leaves the
+        # run going for its retry.
+        return _for_request(await asyncio.shield(running), request)
+
+    def _finish(self, key: tuple[str, str], done: asyncio.Task):
+        del self._in_flight[key]
+        if done.cancelled() or done.exception() is not None:
+            return
+        response = done.result()
+        # Errors are not remembered; a retry gets another chance.
+        if getattr(response, "error", None) is None:
+            # A copy: the task the handler returned may be the store's own,
+            # which later sends to the task keep changing.
+            self._completed[key] = (
+                time.monotonic() + self.policy.ttl_seconds,
+                response.model_copy(deep=True),
+            )
+            while len(self._completed) > self.policy.max_entries:
+                self._completed.popitem(last=False)
+
+    def _expire(self):
+        now = time.monotonic()
+        while self._completed:
+            key, (expiry, _) = next(iter(self._completed.items()))
+            if expiry > now:
+                return
+            del self._completed[key]
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "executed": self.executed,
+            "joined": self.joined,
+            "cache_hits": self.cache_hits,
+            "in_flight": len(self._in_flight),
+            "cached": len(self._completed),
+        }
+
+
+def _for_request(response: SendTaskResponse, request: SendTaskRequest) -> SendTaskResponse:
+    # Every caller gets its own copy, so none can change another's answer.
+    return response.model_copy(update={"id": request.id}, deep=True)
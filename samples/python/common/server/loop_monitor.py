@@ -0,0 +1,123 @@
+from pydantic import BaseModel
+from common.server.metrics import Histogram
+import asyncio
+import contextvars
+import logging
+import sys
+import threading
+import time
+import traceback
+
+logger = logging.getLogger(__name__)
+
+# The A2A task a request or agent run works on. A2AServer sets it for every
+# request; tasks and threads started from there inherit it, so a stall can be
+# blamed on the task whose code blocked the loop.
+current_task_id: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "a2a_current_task_id", default=None
+)
+
+
+class LoopMonitorPolicy(BaseModel):
+    """How A2AServer watches its event loop for blocking calls.
+
+    A heartbeat on the loop wakes up every ``interval_seconds`` and records
+    how late it was. A watchdog thread checks the heartbeat; when the loop
+    has not run for ``stall_threshold_seconds``, it logs the loop thread's
+    stack (which shows the blocking call) and the A2A task id, and counts
+    the stall.
+    """
+
+    interval_seconds: float = 0.05
+    stall_threshold_seconds: float = 0.25
+
+
+class LoopMonitor:
+    def __init__(self, policy: LoopMonitorPolicy):
+        self.policy = policy
+        self.lag = Histogram()
+        self.stalls = 0
+        self.max_lag_seconds = 0.0
+        self._last_beat = time.monotonic()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._heartbeat: asyncio.Task | None = None
+        self._stop = threading.Event()
+        self._watchdog: threading.Thread | None = None
+
+    def ensure_started(self):
+        if self._heartbeat is not None and not self._heartbeat.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        # The heartbeat must not inherit the caller's task id.
+        self._heartbeat = self._loop.create_task(
+            self._beat(), context=contextvars.Context()
+        )
+        if self._watchdog is None:
+            self._stop.clear()
+            self._watchdog = threading.Thread(
+                target=self._watch, name="a2a-loop-monitor", daemon=True
+            )
+            self._watchdog.start()
+
+    async def _beat(self):
+        interval = self.policy.interval_seconds
+        while True:
+            expected = time.monotonic() + interval
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            self._last_beat = now
+            lag = max(now - expected, 0.0)
+            self.lag.observe(lag)
+            self.max_lag_seconds = max(self.max_lag_seconds, lag)
+
+    def _watch(self):
+        threshold = self.policy.stall_threshold_seconds
+        check_interval = min(self.policy.interval_seconds, threshold) / 2
+        stalled_since_beat = None
+        while not self._stop.wait(check_interval):
+            last_beat = self._last_beat
+            # The heartbeat is due every interval; anything later is a stall.
+            overdue = time.monotonic() - last_beat - self.policy.interval_seconds
+            if overdue < threshold or stalled_since_beat == last_beat:
+                continue
+            stalled_since_beat = last_beat
+            self.stalls += 1
+            self._report_stall(overdue)
+
+    def _report_stall(self, overdue: float):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+        task = None
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            pass
+        task_id = task.get_context().get(current_task_id) if task is not None else None
+        task_name = task.get_name() if task is not None else None
+        logger.warning(
+            f"Event loop blocked for {overdue:.3f}s+ (task {task_id}, "
+            f"asyncio task {task_name}):\n{stack}"
+        )
+
+    def stats(self) -> dict:
+        return {
+            "stalls": self.stalls,
+            "max_lag_seconds": self.max_lag_seconds,
+            "lag_seconds": self.lag.snapshot(),
+        }
+
+    async def stop(self):
+        self._stop.set()
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            try:
+                await self._heartbeat
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat = None
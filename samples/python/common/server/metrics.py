@@ -0,0 +1,70 @@
+from collections.abc import Iterable
+from typing import Any
+from common.utils.metrics import DEFAULT_LATENCY_BUCKETS, Histogram
+
+
+class RequestMetrics:
+    """In-flight count and per-method latency of A2AServer requests."""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.in_flight = 0
+        self.latency: dict[str, Histogram] = {}
+
+    def observe(self, method: str, seconds: float):
+        histogram = self.latency.get(method)
+        if histogram is None:
+            histogram = self.latency[method] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class PrometheusText:
+    """Builds a scrape in the Prometheus text exposition format (0.0.4)."""
+
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self._lines: list[str] = []
+
+    def _header(self, name: str, kind: str, help: str):
+        self._lines.append(f"# HELP {name} {help}")
+        self._lines.append(f"# TYPE {name} {kind}")
+
+    def gauge(self, name: str, help: str, samples: Iterable[tuple[dict, float]]):
+        self._samples(name, "gauge", help, samples)
+
+    def counter(self, name: str, help: str, samples: Iterable[tuple[dict, float]]):
+        self._samples(name, "counter", help, samples)
+
+    def _samples(
+        self, name: str, kind: str, help: str, samples: Iterable[tuple[dict, float]]
+    ):
+        self._header(name, kind, help)
+        for labels, value in samples:
+            self._lines.append(f"{name}{_labels(labels)} {value}")
+
+    def histogram(
+        self, name: str, help: str, histograms: Iterable[tuple[dict, Histogram]]
+    ):
+        self._header(name, "histogram", help)
+        for labels, histogram in histograms:
+            snapshot = histogram.snapshot()
+            for bound, count in snapshot["buckets"].items():
+                self._lines.append(
+                    f"{name}_bucket{_labels({**labels, 'le': bound})} {count}"
+                )
+            self._lines.append(f"{name}_sum{_labels(labels)} {snapshot['sum']}")
+            self._lines.append(f"{name}_count{_labels(labels)} {snapshot['count']}")
+
+    def render(self) -> bytes:
+        return ("\n".join(self._lines) + "\n").encode()
@@ -0,0 +1,196 @@
+from collections import Counter
+from pydantic import BaseModel
+from starlette.requests import Request
+from typing import Any
+import asyncio
+import hmac
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-a2a-profile"
+
+
+class ProfilingPolicy(BaseModel):
+    """When A2AServer profiles a request, and where the profiles go.
+
+    A request is profiled when it carries an ``X-A2A-Profile`` header equal
+    to ``token``, or at random with probability ``sample_rate``. Only one
+    request is profiled at a time; others run normally meanwhile. Every
+    profile is written to ``output_dir`` as collapsed stacks (for
+    flamegraph.pl and friends) and as speedscope JSON, and indexed by
+    JSON-RPC id in ``output_dir/index.jsonl``.
+    """
+
+    output_dir: str
+    token: str | None = None
+    sample_rate: float = 0.0
+    interval_seconds: float = 0.001
+
+
+class SamplingProfiler:
+    """Samples the stack of one thread from a background thread.
+
+    The event loop runs every coroutine on one thread, so sampling it while a
+    request is handled shows where that request spends its time, along with
+    whatever else the loop did meanwhile.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter[tuple[tuple[str, str, int], ...]] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self, thread_id: int):
+        self._thread = threading.Thread(
+            target=self._run, args=(thread_id,), name="a2a-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, thread_id: int):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                return
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_qualname, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            self.stacks[tuple(reversed(stack))] += 1
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.stacks
+
+
+def collapsed_stacks(stacks: Counter) -> str:
+    """Brendan Gregg's folded format: ``root;child;leaf count`` per line."""
+    return "".join(
+        ";".join(f"{name} ({os.path.basename(filename)}:{line})" for name, filename, line in stack)
+        + f" {count}\n"
+        for stack, count in stacks.most_common()
+    )
+
+
+def speedscope_profile(stacks: Counter, interval: float, name: str) -> dict[str, Any]:
+    frames: list[dict[str, Any]] = []
+    frame_index: dict[tuple[str, str, int], int] = {}
+    samples, weights = [], []
+    for stack, count in stacks.items():
+        indices = []
+        for frame in stack:
+            if frame not in frame_index:
+                frame_index[frame] = len(frames)
+                frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+            indices.append(frame_index[frame])
+        samples.append(indices)
+        weights.append(count * interval)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "exporter": "a2a",
+        "shared": {"frames": frames},
+        "profiles": [
+            {
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }
+        ],
+    }
+
+
+class RequestProfiler:
+    """Applies a ProfilingPolicy to the requests of an A2AServer."""
+
+    def __init__(self, policy: ProfilingPolicy):
+        self.policy = policy
+        self._active = False
+        os.makedirs(policy.output_dir, exist_ok=True)
+
+    def should_profile(self, request: Request) -> bool:
+        if self._active:
+            return False
+        header = request.headers.get(PROFILE_HEADER)
+        if header is not None and self.policy.token:
+            # As bytes: compare_digest rejects str holding non-ASCII characters.
+            return hmac.compare_digest(header.encode(), self.policy.token.encode())
+        return self.policy.sample_rate > 0 and random.random() < self.policy.sample_rate
+
+    async def profile(self, request_id: Any, method: str, awaitable) -> tuple[Any, str]:
+        """Awaits ``awaitable`` under the sampler.
+
+        Returns its result and the name the profile is saved under, which is
+        also the prefix of the profile's files.
+        """
+        self._active = True
+        started_at = time.time()
+        name = f"{int(started_at * 1000)}-{_safe(request_id)}"
+        profiler = SamplingProfiler(self.policy.interval_seconds)
+        wall_started = time.perf_counter()
+        cpu_started = time.thread_time()
+        profiler.start(threading.get_ident())
+        try:
+            return await awaitable, name
+        finally:
+            stacks = profiler.stop()
+            record = {
+                "request_id": request_id,
+                "method": method,
+                "name": name,
+                "started_at": started_at,
+                "wall_seconds": time.perf_counter() - wall_started,
+                # CPU time of the event loop thread meanwhile. That includes
+                # whatever else the loop ran, and excludes agent threads.
+                "loop_cpu_seconds": time.thread_time() - cpu_started,
+                "samples": sum(stacks.values()),
+            }
+            self._active = False
+            await asyncio.to_thread(self._save, record, stacks)
+
+    def _save(self, record: dict[str, Any], stacks: Counter):
+        base = os.path.join(self.policy.output_dir, record["name"])
+        try:
+            with open(base + ".collapsed", "w") as f:
+                f.write(collapsed_stacks(stacks))
+            with open(base + ".speedscope.json", "w") as f:
+                title = f"{record['method']} {record['request_id']}"
+                json.dump(
+                    speedscope_profile(stacks, self.policy.interval_seconds, title), f
+                )
+            with open(os.path.join(self.policy.output_dir, "index.jsonl"), "a") as f:
+                f.write(json.dumps(record, default=str) + "\n")
+            logger.info(
+                f"Profiled request {record['request_id']}: wall {record['wall_seconds']:.3f}s, "
+                f"loop cpu {record['loop_cpu_seconds']:.3f}s, saved to {base}.*"
+            )
+        except OSError as e:
+            logger.error(f"Error saving profile {base}: {e}")
+
+    def profiles_for(self, request_id: Any) -> list[dict[str, Any]]:
+        """The index entries of every profile taken for a JSON-RPC id."""
+        path = os.path.join(self.policy.output_dir, "index.jsonl")
+        if not os.path.exists(path):
+            return []
+        with open(path) as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        return [record for record in records if record["request_id"] == request_id]
+
+
+def _safe(request_id: Any) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", str(request_id))[:64]
@@ -0,0 +1,169 @@
+from collections import OrderedDict
+from pydantic import BaseModel
+from common.types import Task, TaskState
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATES = {TaskState.COMPLETED, TaskState.FAILED, TaskState.CANCELED}
+ACTIVE_STATES = {TaskState.SUBMITTED, TaskState.WORKING}
+
+
+class RetentionPolicy(BaseModel):
+    """Limits on what an InMemoryTaskManager keeps resident.
+
+    Any limit left as None is not enforced. Tasks that are still running
+    (SUBMITTED/WORKING) or have live SSE subscribers are never evicted.
+    """
+
+    max_tasks: int | None = None
+    max_terminal_age_seconds: float | None = None
+    max_bytes: int | None = None
+    sweep_interval_seconds: float = 30.0
+
+
+class _Entry:
+    __slots__ = ("state", "size", "dirty", "terminal_since")
+
+    def __init__(self):
+        self.state: TaskState | None = None
+        self.size = 0
+        self.dirty = True
+        self.terminal_since: float | None = None
+
+
+class TaskRetention:
+    """Tracks task recency and size, and decides what the sweeper evicts.
+
+    ``touch`` is called on every read and write and only reorders an
+    OrderedDict; task sizes are measured lazily, once per sweep, for tasks that
+    changed since the previous one.
+    """
+
+    def __init__(self, policy: RetentionPolicy):
+        self.policy = policy
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self.resident_bytes = 0
+        self.evictions: dict[str, int] = {
+            "max_tasks": 0,
+            "max_terminal_age": 0,
+            "max_bytes": 0,
+        }
+
+    def touch(self, task: Task, modified: bool = False):
+        entry = self._entries.get(task.id)
+        if entry is None:
+            entry = self._entries[task.id] = _Entry()
+            modified = True
+        else:
+            self._entries.move_to_end(task.id)
+
+        if modified:
+            entry.dirty = True
+            state = task.status.state
+            if state != entry.state:
+                entry.state = state
+                entry.terminal_since = (
+                    time.monotonic() if state in TERMINAL_STATES else None
+                )
+
+    def forget(self, task_id: str):
+        entry = self._entries.pop(task_id, None)
+        if entry is not None:
+            self.resident_bytes -= entry.size
+
+    def dirty_task_ids(self) -> list[str]:
+        return [task_id for task_id, entry in self._entries.items() if entry.dirty]
+
+    def record_size(self, task_id: str, task: Task | None):
+        entry = self._entries.get(task_id)
+        if entry is None:
+            return
+        size = 0 if task is None else len(task.model_dump_json(exclude_none=True))
+        self.resident_bytes += size - entry.size
+        entry.size = size
+        entry.dirty = False
+
+    def is_evictable(self, task_id: str, is_pinned) -> bool:
+        entry = self._entries.get(task_id)
+        return (
+            entry is not None
+            and entry.state not in ACTIVE_STATES
+            and not is_pinned(task_id)
+        )
+
+    def select_evictions(self, is_pinned) -> list[tuple[str, str]]:
+        """Returns (task_id, reason) pairs, least recently used first."""
+        evictions = []
+        resident_tasks = len(self._entries)
+        resident_bytes = self.resident_bytes
+        now = time.monotonic()
+        max_age = self.policy.max_terminal_age_seconds
+
+        for task_id, entry in self._entries.items():
+            if not self.is_evictable(task_id, is_pinned):
+                continue
+
+            reason = None
+            if (
+                max_age is not None
+                and entry.terminal_since is not None
+                and now - entry.terminal_since >= max_age
+            ):
+                reason = "max_terminal_age"
+            elif (
+                self.policy.max_tasks is not None
+                and resident_tasks > self.policy.max_tasks
+            ):
+                reason = "max_tasks"
+            elif (
+                self.policy.max_bytes is not None
+                and resident_bytes > self.policy.max_bytes
+            ):
+                reason = "max_bytes"
+
+            if reason is not None:
+                evictions.append((task_id, reason))
+                resident_tasks -= 1
+                resident_bytes -= entry.size
+
+        return evictions
+
+    def stats(self) -> dict[str, int | dict[str, int]]:
+        return {
+            "resident_tasks": len(self._entries),
+            "resident_bytes": self.resident_bytes,
+            "evictions": dict(self.evictions),
+        }
+
+
+class RetentionSweeper:
+    """Background task that periodically evicts tasks from a task manager."""
+
+    def __init__(self, task_manager, retention: TaskRetention):
+        self.task_manager = task_manager
+        self.retention = retention
+        self._task: asyncio.Task | None = None
+
+    def ensure_started(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.retention.policy.sweep_interval_seconds)
+            try:
+                await self.task_manager.sweep_tasks()
+            except Exception as e:
+                logger.error(f"Error while sweeping tasks: {e}")
@@ -1,5 +1,6 @@
 from starlette.applications import Starlette
-from starlette.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.responses import Response
 from sse_starlette.sse import EventSourceResponse
 from starlette.requests import Request
 from common.types import (
@@ -7,26 +8,196 @@ from common.types import (
     JSONRPCResponse,
     InvalidRequestError,
     JSONParseError,
-    GetTaskRequest,
-    CancelTaskRequest,
-    SendTaskRequest,
-    SetTaskPushNotificationRequest,
-    GetTaskPushNotificationRequest,
     InternalError,
+    ServerBusyError,
     AgentCard,
+    SendTaskRequest,
     TaskResubscriptionRequest,
-    SendTaskStreamingRequest,
+    TaskState,
 )
 from pydantic import ValidationError
+import asyncio
+import hashlib
 import json
+import time
 from typing import AsyncIterable, Any
-from common.server.task_manager import TaskManager
+from common.server.admission import (
+    AdmissionController,
+    AdmissionPolicy,
+    AdmissionRejected,
+    ConcurrencyLimiter,
+)
+from common.server.compression import CompressionPolicy, ResponseCompressor
+from common.server.loop_monitor import LoopMonitor, LoopMonitorPolicy, current_task_id
+from common.server.metrics import PrometheusText, RequestMetrics
+from common.server.profiling import ProfilingPolicy, RequestProfiler
+from common.server.sse import StreamingEventResponse
+from common.server.task_manager import TaskManager, InMemoryTaskManager
+from common.utils.metrics import PUSH_NOTIFICATION_LATENCY
+from common.utils.tracing import TracingPolicy, configure_tracing, current_span, span
 
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+# JSON-RPC method -> TaskManager handler. Requests are parsed into the
+# matching A2ARequest member, so the method alone picks the handler.
+METHOD_HANDLERS = {
+    "tasks/get": "on_get_task",
+    "tasks/send": "on_send_task",
+    "tasks/sendSubscribe": "on_send_task_subscribe",
+    "tasks/cancel": "on_cancel_task",
+    "tasks/pushNotification/set": "on_set_task_push_notification",
+    "tasks/pushNotification/get": "on_get_task_push_notification",
+    "tasks/resubscribe": "on_resubscribe_to_task",
+}
+
+
+def _json_response(response: JSONRPCResponse, status_code: int = 200) -> Response:
+    """Writes the response straight from pydantic's JSON bytes, skipping the dict."""
+    return Response(
+        response.model_dump_json(
+            exclude_none=True, context=response._serialization_context
+        ),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+# Methods that answer with an SSE stream and so cannot be part of a batch.
+STREAMING_METHODS = {"tasks/sendSubscribe", "tasks/resubscribe"}
+
+# Methods that start a run of the agent, and may set a deadline for it.
+SEND_METHODS = {"tasks/send", "tasks/sendSubscribe"}
+
+
+def _json_batch_response(responses: list[JSONRPCResponse]) -> Response:
+    if not responses:
+        # A batch made only of notifications gets no response body.
+        return Response(status_code=204)
+    return Response(
+        b"["
+        + b",".join(
+            response.model_dump_json(
+                exclude_none=True, context=response._serialization_context
+            ).encode()
+            for response in responses
+        )
+        + b"]",
+        media_type="application/json",
+    )
+
+
+def _busy_response(request_id: Any, rejected: AdmissionRejected) -> Response:
+    response = _json_response(
+        JSONRPCResponse(
+            id=request_id,
+            error=ServerBusyError(data={"retryAfter": rejected.retry_after}),
+        ),
+        status_code=429,
+    )
+    response.headers["Retry-After"] = str(rejected.retry_after)
+    return response
+
+
+class _StreamSlot:
+    """The admission slot of one tasks/sendSubscribe, held for its agent run.
+
+    It is freed when the task's agent work finishes, even if the client went
+    away earlier. An agent that runs inside the stream itself starts no
+    tracked work; its slot is freed when the stream ends, or when the
+    response ends if the stream was never iterated.
+    """
+
+    def __init__(
+        self,
+        limiter: ConcurrencyLimiter,
+        running_work: dict[str, asyncio.Task],
+        task_id: str,
+        stream: AsyncIterable[Any],
+    ):
+        self._limiter = limiter
+        self._running_work = running_work
+        self._task_id = task_id
+        self._released = False
+        self._ended = False
+        self._stream = self._hold(stream)
+        self._bind()
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        return self._stream.__anext__()
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self.end()
+
+    def _bind(self) -> bool:
+        work = self._running_work.get(self._task_id)
+        if work is None or work.done():
+            return False
+        work.add_done_callback(self.release)
+        return True
+
+    def release(self, _done: asyncio.Task | None = None):
+        if not self._released:
+            self._released = True
+            self._limiter.release()
+
+    def end(self):
+        """Frees the slot now, or once the agent work finishes."""
+        if self._ended:
+            return
+        self._ended = True
+        # The work may only have been started while streaming.
+        if not self._bind():
+            self.release()
+
+    async def _hold(self, stream: AsyncIterable[Any]) -> AsyncIterable[Any]:
+        try:
+            async for item in stream:
+                yield item
+        finally:
+            self.end()
+
+
+class _StreamSlotResponse:
+    """ASGI wrapper ending a stream's slot once its response is over.
+
+    An async generator that was never iterated, e.g. because the client left
+    before the first byte, never runs its ``finally``.
+    """
+
+    def __init__(self, response: Response, slot: _StreamSlot):
+        self.response = response
+        self.slot = slot
+
+    @property
+    def headers(self) -> MutableHeaders:
+        return self.response.headers
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await self.response(scope, receive, send)
+        finally:
+            self.slot.end()
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored.
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in (
+        candidate.removeprefix("W/") for candidate in candidates
+    )
+
+
 class A2AServer:
     def __init__(
         self,
@@ -35,17 +206,59 @@ class A2AServer:
         endpoint="/",
         agent_card: AgentCard = None,
         task_manager: TaskManager = None,
+        sse_ping_interval: float = 15,
+        server_timing: bool = False,
+        batch_concurrency: int = 16,
+        agent_card_max_age: int = 300,
+        compression: CompressionPolicy | None = None,
+        workers: int = 1,
+        admission: AdmissionPolicy | None = None,
+        metrics: bool = False,
+        tracing: TracingPolicy | None = None,
+        profiling: ProfilingPolicy | None = None,
+        loop_monitor: LoopMonitorPolicy | None = None,
     ):
         self.host = host
         self.port = port
         self.endpoint = endpoint
         self.task_manager = task_manager
         self.agent_card = agent_card
+        # Heartbeat comments keep idle streams alive through proxies that
+        # close connections without traffic.
+        self.sse_ping_interval = sse_ping_interval
+        # Adds a Server-Timing header breaking each request down into the time
+        # spent reading, parsing, handling and serializing it.
+        self.server_timing = server_timing
+        # Upper bound on the entries of one JSON-RPC batch handled at once.
+        self.batch_concurrency = batch_concurrency
+        # How long clients may reuse the agent card before revalidating it.
+        self.agent_card_max_age = agent_card_max_age
+        # Responses are sent uncompressed unless a CompressionPolicy is given.
+        self.compressor = ResponseCompressor(compression) if compression else None
+        # More than one worker forks that many server processes, which share
+        # task state through the task store and SSE events through an IPC hub.
+        self.workers = workers
+        # Agent runs are unlimited unless an AdmissionPolicy is given.
+        self.admission = AdmissionController(admission) if admission else None
+        # Serves GET /metrics in the Prometheus text format when enabled.
+        self.request_metrics = RequestMetrics() if metrics else None
+        # Runs selected requests under a sampling profiler; off unless given.
+        self.profiler = RequestProfiler(profiling) if profiling else None
+        # Watches the event loop for blocking calls once the first request
+        # arrives; off unless a policy is given.
+        self.loop_monitor = LoopMonitor(loop_monitor) if loop_monitor else None
         self.app = Starlette()
         self.app.add_route(self.endpoint, self._process_request, methods=["POST"])
         self.app.add_route(
             "/.well-known/agent.json", self._get_agent_card, methods=["GET"]
         )
+        if metrics:
+            self.app.add_route("/metrics", self._get_metrics, methods=["GET"])
+        # Records spans for each request's stages; recent ones are served at
+        # /debug/traces when the policy keeps a ring buffer.
+        self.tracer = configure_tracing(tracing) if tracing else None
+        if self.tracer is not None and self.tracer.ring_buffer is not None:
+            self.app.add_route("/debug/traces", self._get_traces, methods=["GET"])
 
     def start(self):
         if self.agent_card is None:
@@ -54,47 +267,444 @@ class A2AServer:
         if self.task_manager is None:
             raise ValueError("request_handler is not defined")
 
+        if self.workers > 1:
+            from common.server.workers import serve_workers
+
+            serve_workers(self, self.workers)
+            return
+
         import uvicorn
 
         uvicorn.run(self.app, host=self.host, port=self.port)
 
-    def _get_agent_card(self, request: Request) -> JSONResponse:
-        return JSONResponse(self.agent_card.model_dump(exclude_none=True))
+    @property
+    def agent_card(self) -> AgentCard:
+        return self._agent_card
 
-    async def _process_request(self, request: Request):
-        try:
-            body = await request.json()
-            json_rpc_request = A2ARequest.validate_python(body)
-
-            if isinstance(json_rpc_request, GetTaskRequest):
-                result = await self.task_manager.on_get_task(json_rpc_request)
-            elif isinstance(json_rpc_request, SendTaskRequest):
-                result = await self.task_manager.on_send_task(json_rpc_request)
-            elif isinstance(json_rpc_request, SendTaskStreamingRequest):
-                result = await self.task_manager.on_send_task_subscribe(
-                    json_rpc_request
+    @agent_card.setter
+    def agent_card(self, agent_card: AgentCard):
+        self._agent_card = agent_card
+        self._agent_card_cache = None
+
+    def _encoded_agent_card(self) -> tuple[bytes, str]:
+        """The card's JSON and strong ETag, re-encoded only when the card changes.
+
+        Replacing ``agent_card`` or reassigning one of its fields invalidates
+        the cache; in-place changes to nested values (e.g. appending a skill)
+        should be followed by reassigning the card.
+        """
+        # The cache holds the field values themselves, so comparing them by
+        # identity is safe: none of them can be freed and their ids reused.
+        fields = tuple(self._agent_card.__dict__.values())
+        cache = self._agent_card_cache
+        if (
+            cache is None
+            or len(cache[0]) != len(fields)
+            or any(cached is not field for cached, field in zip(cache[0], fields))
+        ):
+            body = self._agent_card.model_dump_json(exclude_none=True).encode()
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+            cache = self._agent_card_cache = (fields, body, etag)
+        return cache[1], cache[2]
+
+    def _get_agent_card(self, request: Request) -> Response:
+        body, etag = self._encoded_agent_card()
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={self.agent_card_max_age}",
+        }
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+    def _get_traces(self, request: Request) -> Response:
+        limit = request.query_params.get("limit", "")
+        spans = self.tracer.ring_buffer.spans(
+            trace_id=request.query_params.get("trace_id"),
+            limit=int(limit) if limit.isdigit() else None,
+        )
+        return Response(json.dumps({"spans": spans}, default=str), media_type="application/json")
+
+    async def _get_metrics(self, request: Request) -> Response:
+        text = PrometheusText()
+        request_metrics = self.request_metrics
+        text.gauge(
+            "a2a_requests_in_flight",
+            "JSON-RPC requests being handled.",
+            [({}, request_metrics.in_flight)],
+        )
+        text.histogram(
+            "a2a_request_duration_seconds",
+            "Time to handle a JSON-RPC request, by method.",
+            (({"method": method}, histogram)
+             for method, histogram in sorted(request_metrics.latency.items())),
+        )
+        text.histogram(
+            "a2a_push_notification_duration_seconds",
+            "Time to deliver a push notification, by outcome.",
+            (({"outcome": outcome}, histogram)
+             for outcome, histogram in PUSH_NOTIFICATION_LATENCY.items()),
+        )
+
+        if isinstance(self.task_manager, InMemoryTaskManager):
+            self._collect_task_manager_metrics(text, self.task_manager)
+            counts = await self.task_manager.task_store.count_by_state()
+            text.gauge(
+                "a2a_tasks",
+                "Stored tasks, by state.",
+                (({"state": state.value}, counts.get(state, 0)) for state in TaskState),
+            )
+
+        if self.loop_monitor is not None:
+            text.histogram(
+                "a2a_event_loop_lag_seconds",
+                "How late the event loop heartbeat woke up.",
+                [({}, self.loop_monitor.lag)],
+            )
+            text.counter(
+                "a2a_event_loop_stalls_total",
+                "Times the event loop was blocked past the stall threshold.",
+                [({}, self.loop_monitor.stalls)],
+            )
+
+        if self.admission is not None:
+            limiters = {"send": self.admission.sends, "stream": self.admission.streams}
+            for name, help in (
+                ("running", "Agent runs admitted and not yet finished."),
+                ("queued", "Agent runs waiting for admission."),
+            ):
+                text.gauge(
+                    f"a2a_admission_{name}",
+                    help,
+                    (({"kind": kind}, limiter.stats()[name])
+                     for kind, limiter in limiters.items()),
                 )
-            elif isinstance(json_rpc_request, CancelTaskRequest):
-                result = await self.task_manager.on_cancel_task(json_rpc_request)
-            elif isinstance(json_rpc_request, SetTaskPushNotificationRequest):
-                result = await self.task_manager.on_set_task_push_notification(json_rpc_request)
-            elif isinstance(json_rpc_request, GetTaskPushNotificationRequest):
-                result = await self.task_manager.on_get_task_push_notification(json_rpc_request)
-            elif isinstance(json_rpc_request, TaskResubscriptionRequest):
-                result = await self.task_manager.on_resubscribe_to_task(
-                    json_rpc_request
+            text.counter(
+                "a2a_admission_rejected_total",
+                "Requests rejected with 429 because the wait queue was full.",
+                (({"kind": kind}, limiter.rejected) for kind, limiter in limiters.items()),
+            )
+            text.histogram(
+                "a2a_admission_queue_wait_seconds",
+                "Time agent runs waited for admission.",
+                (({"kind": kind}, limiter.queue_wait)
+                 for kind, limiter in limiters.items()),
+            )
+
+        if self.compressor is not None:
+            stats = self.compressor.stats()
+            text.counter(
+                "a2a_compression_skipped_total",
+                "Responses sent uncompressed.",
+                [({}, stats.pop("skipped"))],
+            )
+            for name, help in (
+                ("responses", "Compressed responses, by encoding."),
+                ("bytes_in", "Bytes before compression, by encoding."),
+                ("bytes_out", "Bytes after compression, by encoding."),
+                ("cpu_seconds", "CPU time spent compressing, by encoding."),
+            ):
+                text.counter(
+                    f"a2a_compression_{name}_total",
+                    help,
+                    (({"encoding": encoding}, encoding_stats[name])
+                     for encoding, encoding_stats in stats.items()),
                 )
+
+        return Response(text.render(), media_type=PrometheusText.content_type)
+
+    def _collect_task_manager_metrics(
+        self, text: PrometheusText, task_manager: InMemoryTaskManager
+    ):
+        subscribers = [
+            stats
+            for task_stats in task_manager.subscriber_stats().values()
+            for stats in task_stats
+        ]
+        text.gauge(
+            "a2a_sse_subscribers",
+            "Connected SSE subscribers.",
+            [({}, len(subscribers))],
+        )
+        text.gauge(
+            "a2a_sse_queue_depth",
+            "Events queued for SSE subscribers, in total and for the fullest queue.",
+            [
+                ({"aggregate": "sum"}, sum(stats["depth"] for stats in subscribers)),
+                ({"aggregate": "max"}, max((stats["depth"] for stats in subscribers), default=0)),
+            ],
+        )
+        text.gauge(
+            "a2a_sse_lag_seconds",
+            "Age of the oldest event queued for the slowest SSE subscriber.",
+            [({}, max((stats["lag_seconds"] for stats in subscribers), default=0.0))],
+        )
+
+        if task_manager.send_deduplicator is not None:
+            stats = task_manager.send_deduplicator.stats()
+            text.counter(
+                "a2a_send_dedup_total",
+                "tasks/send calls, by whether they ran the agent, joined an "
+                "identical running send, or were answered from the cache.",
+                (({"outcome": outcome}, stats[outcome])
+                 for outcome in ("executed", "joined", "cache_hits")),
+            )
+        text.counter(
+            "a2a_abandoned_tasks_canceled_total",
+            "Tasks canceled because no client was left to receive their results.",
+            [({}, task_manager.abandoned_canceled)],
+        )
+        text.counter(
+            "a2a_task_deadline_exceeded_total",
+            "Agent work stopped at its task's deadline, by agent.",
+            (({"agent": agent}, count)
+             for agent, count in task_manager.deadline_timeouts.items()),
+        )
+        text.gauge(
+            "a2a_task_long_polls",
+            "tasks/get calls waiting for a task to change.",
+            [({}, task_manager.task_versions.waiting)],
+        )
+
+        runner = task_manager.agent_runner.stats()
+        text.gauge(
+            "a2a_agent_calls",
+            "Synchronous agent calls on the thread pool, by state.",
+            [({"state": "running"}, runner["running"]), ({"state": "queued"}, runner["queued"])],
+        )
+        text.counter(
+            "a2a_agent_calls_completed_total",
+            "Synchronous agent calls completed.",
+            [({}, runner["completed"])],
+        )
+
+        scheduler = task_manager.session_scheduler.stats()
+        text.gauge(
+            "a2a_sessions_active",
+            "Sessions with an agent turn running or waiting.",
+            [({}, scheduler["active_sessions"])],
+        )
+        text.gauge(
+            "a2a_session_queue_length",
+            "Agent turns waiting behind their session, in total and for the longest queue.",
+            [
+                ({"aggregate": "sum"}, sum(scheduler["session_queue_lengths"].values())),
+                ({"aggregate": "max"}, scheduler["max_session_queue_length"]),
+            ],
+        )
+
+        if task_manager.retention is not None:
+            retention = task_manager.retention.stats()
+            text.gauge(
+                "a2a_tasks_resident",
+                "Tasks tracked by the retention policy.",
+                [({}, retention["resident_tasks"])],
+            )
+            text.gauge(
+                "a2a_tasks_resident_bytes",
+                "Approximate size of the tasks tracked by the retention policy.",
+                [({}, retention["resident_bytes"])],
+            )
+            text.counter(
+                "a2a_tasks_evicted_total",
+                "Tasks evicted by the retention policy, by reason.",
+                (({"reason": reason}, count) for reason, count in retention["evictions"].items()),
+            )
+
+    async def _process_request(self, request: Request):
+        if self.loop_monitor is not None:
+            self.loop_monitor.ensure_started()
+        with span("a2a.request"):
+            return await self._handle_request(request)
+
+    async def _handle_request(self, request: Request):
+        started = time.perf_counter()
+        # Requests that fail to parse are counted under "invalid".
+        method = "invalid"
+        result = None
+        if self.request_metrics is not None:
+            self.request_metrics.in_flight += 1
+        try:
+            body = await request.body()
+            received = time.perf_counter()
+
+            if body.lstrip()[:1] == b"[":
+                with span("a2a.parse"):
+                    entries = json.loads(body)
+                parsed = time.perf_counter()
+                method = "batch"
+                current_span().set_attribute("method", method)
+                if not entries:
+                    return _json_response(
+                        JSONRPCResponse(
+                            id=None,
+                            error=InvalidRequestError(message="Empty batch request"),
+                        ),
+                        status_code=400,
+                    )
+                responses = await self._process_batch(request, entries)
+                handled = time.perf_counter()
+                with span("a2a.serialize"):
+                    response = _json_batch_response(responses)
             else:
-                logger.warning(f"Unexpected request type: {type(json_rpc_request)}")
-                raise ValueError(f"Unexpected request type: {type(request)}")
+                with span("a2a.parse"):
+                    json_rpc_request = A2ARequest.validate_json(body)
+                parsed = time.perf_counter()
+                method = json_rpc_request.method
+                current_span().set_attribute("method", method)
+                profile_name = None
+                try:
+                    dispatch = self._dispatch(request, json_rpc_request)
+                    if self.profiler is not None and self.profiler.should_profile(request):
+                        result, profile_name = await self.profiler.profile(
+                            json_rpc_request.id, method, dispatch
+                        )
+                    else:
+                        result = await dispatch
+                except AdmissionRejected as e:
+                    return _busy_response(json_rpc_request.id, e)
+                handled = time.perf_counter()
+                with span("a2a.serialize"):
+                    response = self._create_response(result)
+                if profile_name is not None:
+                    response.headers["X-A2A-Profile"] = profile_name
+
+            if self.compressor is not None:
+                if isinstance(response, EventSourceResponse):
+                    response = self.compressor.compress_stream(request, response)
+                else:
+                    response = self.compressor.compress_response(request, response)
 
-            return self._create_response(result)
+            if self.server_timing:
+                response.headers["Server-Timing"] = (
+                    f"read;dur={(received - started) * 1000:.3f}, "
+                    f"parse;dur={(parsed - received) * 1000:.3f}, "
+                    f"handle;dur={(handled - parsed) * 1000:.3f}, "
+                    f"serialize;dur={(time.perf_counter() - handled) * 1000:.3f}"
+                )
+            if isinstance(result, _StreamSlot):
+                response = _StreamSlotResponse(response, result)
+            return response
 
         except Exception as e:
             return self._handle_exception(e)
 
-    def _handle_exception(self, e: Exception) -> JSONResponse:
-        if isinstance(e, json.decoder.JSONDecodeError):
+        finally:
+            if self.request_metrics is not None:
+                self.request_metrics.in_flight -= 1
+                self.request_metrics.observe(method, time.perf_counter() - started)
+
+    async def _dispatch(self, request: Request, json_rpc_request: Any) -> Any:
+        if isinstance(json_rpc_request, TaskResubscriptionRequest):
+            self._apply_last_event_id(request, json_rpc_request)
+        current_task_id.set(json_rpc_request.params.id)
+        deduplicator = getattr(self.task_manager, "send_deduplicator", None)
+        if isinstance(json_rpc_request, SendTaskRequest) and deduplicator is not None:
+            # Joining a running send or answering from the cache takes no
+            # admission slot.
+            return await deduplicator.run(json_rpc_request, self._admit)
+        return await self._admit(json_rpc_request)
+
+    async def _admit(self, json_rpc_request: Any) -> Any:
+        limiter = (
+            self.admission.limiter_for(json_rpc_request.method)
+            if self.admission is not None
+            else None
+        )
+        if limiter is None:
+            return await self._call_handler(json_rpc_request)
+
+        with span("a2a.admission_wait", method=json_rpc_request.method):
+            await limiter.acquire()
+        try:
+            result = await self._call_handler(json_rpc_request)
+        except BaseException:
+            limiter.release()
+            raise
+        if isinstance(result, AsyncIterable):
+            return _StreamSlot(
+                limiter,
+                getattr(self.task_manager, "running_work", {}),
+                json_rpc_request.params.id,
+                result,
+            )
+        limiter.release()
+        return result
+
+    async def _call_handler(self, json_rpc_request: Any) -> Any:
+        handler = getattr(self.task_manager, METHOD_HANDLERS[json_rpc_request.method])
+        try:
+            with span("a2a.handle", method=json_rpc_request.method):
+                return await handler(json_rpc_request)
+        finally:
+            # The send's deadline has been handed to any work it started.
+            clear_deadline = getattr(self.task_manager, "clear_deadline", None)
+            if json_rpc_request.method in SEND_METHODS and clear_deadline is not None:
+                clear_deadline(json_rpc_request.params.id)
+
+    async def _process_batch(
+        self, request: Request, entries: list[Any]
+    ) -> list[JSONRPCResponse]:
+        """Runs the entries of a JSON-RPC batch concurrently, at most
+        ``batch_concurrency`` at a time.
+
+        Invalid entries get an error response each. Notifications (entries
+        without an id) are executed but get no response.
+        """
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+
+        async def process_entry(entry: Any) -> JSONRPCResponse | None:
+            request_id = entry.get("id") if isinstance(entry, dict) else None
+            is_notification = isinstance(entry, dict) and "id" not in entry
+            try:
+                json_rpc_request = A2ARequest.validate_python(entry)
+            except ValidationError as e:
+                error = InvalidRequestError(data=json.loads(e.json()))
+                try:
+                    return JSONRPCResponse(id=request_id, error=error)
+                except ValidationError:
+                    # An id of the wrong type (an object or an array) cannot
+                    # be echoed back.
+                    return JSONRPCResponse(id=None, error=error)
+            if json_rpc_request.method in STREAMING_METHODS:
+                return JSONRPCResponse(
+                    id=request_id,
+                    error=InvalidRequestError(
+                        message=f"{json_rpc_request.method} cannot be batched"
+                    ),
+                )
+
+            async with semaphore:
+                try:
+                    result = await self._dispatch(request, json_rpc_request)
+                except AdmissionRejected as e:
+                    result = JSONRPCResponse(
+                        id=request_id,
+                        error=ServerBusyError(data={"retryAfter": e.retry_after}),
+                    )
+                except Exception as e:
+                    logger.error(f"Unhandled exception in batch entry: {e}")
+                    result = JSONRPCResponse(id=request_id, error=InternalError())
+            return None if is_notification else result
+
+        responses = await asyncio.gather(*(process_entry(entry) for entry in entries))
+        return [response for response in responses if response is not None]
+
+    def _apply_last_event_id(
+        self, request: Request, json_rpc_request: TaskResubscriptionRequest
+    ):
+        """Falls back to the standard SSE reconnect header when params carry no cursor."""
+        if json_rpc_request.params.lastEventId is not None:
+            return
+        last_event_id = request.headers.get("last-event-id", "")
+        if last_event_id.isdigit():
+            json_rpc_request.params.lastEventId = int(last_event_id)
+
+    def _handle_exception(self, e: Exception) -> Response:
+        if isinstance(e, json.decoder.JSONDecodeError) or (
+            isinstance(e, ValidationError)
+            and any(error["type"] == "json_invalid" for error in e.errors())
+        ):
             json_rpc_error = JSONParseError()
         elif isinstance(e, ValidationError):
             json_rpc_error = InvalidRequestError(data=json.loads(e.json()))
@@ -103,18 +713,28 @@ class A2AServer:
             json_rpc_error = InternalError()
 
         response = JSONRPCResponse(id=None, error=json_rpc_error)
-        return JSONResponse(response.model_dump(exclude_none=True), status_code=400)
+        return _json_response(response, status_code=400)
 
-    def _create_response(self, result: Any) -> JSONResponse | EventSourceResponse:
+    def _create_response(self, result: Any) -> Response | EventSourceResponse:
         if isinstance(result, AsyncIterable):
 
-            async def event_generator(result) -> AsyncIterable[dict[str, str]]:
+            async def event_generator(result) -> AsyncIterable[bytes | dict[str, str]]:
                 async for item in result:
-                    yield {"data": item.model_dump_json(exclude_none=True)}
+                    if isinstance(item, StreamingEventResponse):
+                        # Already serialized once for all subscribers.
+                        yield item.sse_frame()
+                        continue
+                    event = {"data": item.model_dump_json(exclude_none=True)}
+                    event_id = getattr(item, "event_id", None)
+                    if event_id is not None:
+                        event["id"] = str(event_id)
+                    yield event
 
-            return EventSourceResponse(event_generator(result))
+            return EventSourceResponse(
+                event_generator(result), ping=self.sse_ping_interval
+            )
         elif isinstance(result, JSONRPCResponse):
-            return JSONResponse(result.model_dump(exclude_none=True))
+            return _json_response(result)
         else:
             logger.error(f"Unexpected result type: {type(result)}")
             raise ValueError(f"Unexpected result type: {type(result)}")
@@ -0,0 +1,109 @@
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from common.server.admission import ConcurrencyLimiter
+from common.utils.tracing import span
+import asyncio
+
+
+class _Session:
+    __slots__ = ("waiters",)
+
+    def __init__(self):
+        # Callers waiting for their turn; the session exists while one runs.
+        self.waiters: deque[asyncio.Future] = deque()
+
+
+class SessionScheduler:
+    """Runs agent work one at a time per session, and sessions in parallel.
+
+    Agents keep conversation state per session (a LangGraph checkpointer
+    thread, a Marvin thread, an ADK session), so two sends on the same
+    ``sessionId`` must not run at once. ``slot(session_id)`` waits until the
+    earlier work of that session is done, first come first served, and then
+    for one of ``max_concurrent`` global slots (unlimited if None). Work
+    without a session id is only subject to the global limit.
+    """
+
+    def __init__(self, max_concurrent: int | None = None):
+        self._limiter = ConcurrencyLimiter(max_concurrent, max_queued=None)
+        self._sessions: dict[str, _Session] = {}
+
+    @asynccontextmanager
+    async def slot(self, session_id: str | None) -> AsyncIterator[None]:
+        if session_id is None:
+            await self._limiter.acquire()
+            try:
+                yield
+            finally:
+                self._limiter.release()
+            return
+
+        with span("session.wait", session_id=session_id):
+            await self._enter_session(session_id)
+        try:
+            await self._limiter.acquire()
+            try:
+                yield
+            finally:
+                self._limiter.release()
+        finally:
+            self._leave_session(session_id)
+
+    async def _enter_session(self, session_id: str):
+        session = self._sessions.get(session_id)
+        if session is None:
+            self._sessions[session_id] = _Session()
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        session.waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The turn was handed over just before the cancellation.
+                self._leave_session(session_id)
+            else:
+                session.waiters.remove(waiter)
+            raise
+
+    def _leave_session(self, session_id: str):
+        session = self._sessions[session_id]
+        while session.waiters:
+            waiter = session.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        del self._sessions[session_id]
+
+    async def run(self, session_id: str | None, fn, *args, **kwargs):
+        """Awaits ``fn(*args, **kwargs)`` in the session's turn."""
+        async with self.slot(session_id):
+            return await fn(*args, **kwargs)
+
+    async def iterate(
+        self, session_id: str | None, iterable: AsyncIterator
+    ) -> AsyncIterator:
+        """Yields the items of ``iterable``, holding the session's turn throughout."""
+        async with self.slot(session_id):
+            async for item in iterable:
+                yield item
+
+    def queue_length(self, session_id: str) -> int:
+        """How many calls are waiting behind the running one of a session."""
+        session = self._sessions.get(session_id)
+        return len(session.waiters) if session is not None else 0
+
+    def stats(self) -> dict:
+        queue_lengths = {
+            session_id: len(session.waiters)
+            for session_id, session in self._sessions.items()
+            if session.waiters
+        }
+        return {
+            **self._limiter.stats(),
+            "active_sessions": len(self._sessions),
+            "session_queue_lengths": queue_lengths,
+            "max_session_queue_length": max(queue_lengths.values(), default=0),
+        }
@@ -0,0 +1,608 @@
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from common.types import (
+    Task,
+    TaskSendParams,
+    TaskStatus,
+    TaskState,
+    Artifact,
+    Message,
+    PushNotificationConfig,
+)
+from common.server.task_store import TaskStore
+import asyncio
+import functools
+import json
+import logging
+import os
+import sqlite3
+import threading
+import warnings
+import weakref
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    session_id TEXT,
+    status TEXT NOT NULL,
+    metadata TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_session ON tasks (session_id);
+
+CREATE TABLE IF NOT EXISTS task_history (
+    task_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    session_id TEXT,
+    message TEXT NOT NULL,
+    PRIMARY KEY (task_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_task_history_session ON task_history (session_id);
+
+CREATE TABLE IF NOT EXISTS task_artifacts (
+    task_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    artifact TEXT NOT NULL,
+    PRIMARY KEY (task_id, seq)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS push_notification_infos (
+    task_id TEXT PRIMARY KEY,
+    config TEXT NOT NULL
+);
+"""
+
+
+class SQLiteTaskStore(TaskStore):
+    """Task store persisted to an SQLite database in WAL mode.
+
+    Writes from concurrent callers are group-committed: each call enqueues an
+    operation and awaits its result, and a single writer thread applies
+    everything queued so far in one transaction (up to ``max_batch_size``
+    operations, each isolated by a savepoint). Reads run on a small pool of
+    reader threads, which WAL lets proceed alongside the writer.
+
+    The writer keeps the last ``cached_tasks`` tasks it wrote in memory, so
+    an update only inserts its new rows instead of reloading the whole task.
+    The cache is dropped whenever another connection (another worker) has
+    committed since the previous batch.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_batch_size: int = 256,
+        flush_interval: float = 0.0,
+        reader_threads: int = 4,
+        busy_timeout_ms: int = 5000,
+        cached_tasks: int = 1024,
+    ):
+        self.path = path
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.busy_timeout_ms = busy_timeout_ms
+        self.reader_threads = reader_threads
+        self.cached_tasks = cached_tasks
+        self._inherited_connections: list[threading.local] = []
+        self._init_connections()
+
+        conn = self._connection()
+        conn.executescript(SCHEMA)
+
+        # A forked worker (see A2AServer's multi-worker mode) must not use the
+        # parent's connections or thread pools.
+        os.register_at_fork(
+            after_in_child=functools.partial(_reset_after_fork, weakref.ref(self))
+        )
+
+        self.tasks = _TaskMapping(self)
+        self.push_notification_infos = _PushNotificationMapping(self)
+
+    def _init_connections(self):
+        self._local = threading.local()
+        self._writer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="a2a-sqlite-writer"
+        )
+        self._readers = ThreadPoolExecutor(
+            max_workers=self.reader_threads, thread_name_prefix="a2a-sqlite-reader"
+        )
+        self._pending: list[tuple[Callable[[sqlite3.Connection], Any], asyncio.Future]] = []
+        self._flush_task: asyncio.Task | None = None
+        # Only the writer thread touches this.
+        self._cache = _TaskCache(self.cached_tasks)
+
+    def _after_fork(self):
+        # Connections opened before the fork are kept open but never used:
+        # closing them in the child could release the parent's file locks.
+        self._inherited_connections.append(self._local)
+        self._init_connections()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+            self._local.conn = conn
+        return conn
+
+    async def _read(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._readers, lambda: fn(self._connection())
+        )
+
+    async def _write(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((fn, future))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush())
+        return await future
+
+    async def _flush(self):
+        # Yield (or linger) once so that writers scheduled in the same loop
+        # iteration land in the same transaction.
+        await asyncio.sleep(self.flush_interval)
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            batch = self._pending[: self.max_batch_size]
+            del self._pending[: self.max_batch_size]
+            try:
+                results = await loop.run_in_executor(
+                    self._writer, self._apply_batch, [fn for fn, _ in batch]
+                )
+            except Exception as e:
+                logger.error(f"Error while committing task store batch: {e}")
+                results = [(False, e)] * len(batch)
+
+            for (_, future), (ok, value) in zip(batch, results):
+                if future.done():
+                    continue
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+
+    def _apply_batch(
+        self, ops: list[Callable[[sqlite3.Connection], Any]]
+    ) -> list[tuple[bool, Any]]:
+        conn = self._connection()
+        results = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._cache.validate(conn)
+            for op in ops:
+                conn.execute("SAVEPOINT op")
+                try:
+                    results.append((True, op(conn)))
+                    conn.execute("RELEASE op")
+                except Exception as e:
+                    conn.execute("ROLLBACK TO op")
+                    conn.execute("RELEASE op")
+                    results.append((False, e))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            # The cache may hold writes that were just rolled back.
+            self._cache.clear()
+            raise
+        return results
+
+    async def get_task(self, task_id: str) -> Task | None:
+        return await self._read(lambda conn: _load_task(conn, task_id))
+
+    async def upsert_task(self, task_send_params: TaskSendParams) -> Task:
+        return await self._write(
+            lambda conn: _upsert_task(conn, self._cache, task_send_params)
+        )
+
+    async def update_task(
+        self, task_id: str, status: TaskStatus, artifacts: list[Artifact] | None
+    ) -> Task:
+        return await self._write(
+            lambda conn: _update_task(conn, self._cache, task_id, status, artifacts)
+        )
+
+    async def delete_task(self, task_id: str) -> bool:
+        return await self._write(lambda conn: _delete_task(conn, task_id, self._cache))
+
+    async def load_history(self, task_id: str) -> list[Message]:
+        return await self._read(lambda conn: _load_history(conn, task_id))
+
+    async def load_session_history(self, session_id: str) -> list[Message]:
+        return await self._read(lambda conn: _load_session_history(conn, session_id))
+
+    async def set_push_notification_info(
+        self, task_id: str, notification_config: PushNotificationConfig
+    ):
+        await self._write(
+            lambda conn: _set_push_notification_info(conn, task_id, notification_config)
+        )
+
+    async def get_push_notification_info(
+        self, task_id: str
+    ) -> PushNotificationConfig:
+        return await self._read(lambda conn: _get_push_notification_info(conn, task_id))
+
+    async def has_push_notification_info(self, task_id: str) -> bool:
+        return await self._read(
+            lambda conn: _get_push_notification_config(conn, task_id) is not None
+        )
+
+    async def count_by_state(self) -> dict[TaskState, int]:
+        return await self._read(_count_by_state)
+
+    async def close(self):
+        if self._flush_task is not None:
+            await self._flush_task
+        self._writer.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
+
+
+def _reset_after_fork(store_ref: "weakref.ref[SQLiteTaskStore]"):
+    store = store_ref()
+    if store is not None:
+        store._after_fork()
+
+
+def _next_seq(conn: sqlite3.Connection, table: str, task_id: str) -> int:
+    row = conn.execute(
+        f"SELECT COALESCE(MAX(seq), -1) + 1 FROM {table} WHERE task_id = ?",
+        (task_id,),
+    ).fetchone()
+    return row[0]
+
+
+def _append_history(
+    conn: sqlite3.Connection, task_id: str, session_id: str | None, messages: list[Message]
+):
+    seq = _next_seq(conn, "task_history", task_id)
+    conn.executemany(
+        "INSERT INTO task_history (task_id, seq, session_id, message) VALUES (?, ?, ?, ?)",
+        [
+            (task_id, seq + i, session_id, message.model_dump_json())
+            for i, message in enumerate(messages)
+        ],
+    )
+
+
+def _append_artifacts(conn: sqlite3.Connection, task_id: str, artifacts: list[Artifact]):
+    seq = _next_seq(conn, "task_artifacts", task_id)
+    conn.executemany(
+        "INSERT INTO task_artifacts (task_id, seq, artifact) VALUES (?, ?, ?)",
+        [
+            (task_id, seq + i, artifact.model_dump_json())
+            for i, artifact in enumerate(artifacts)
+        ],
+    )
+
+
+def _write_task(conn: sqlite3.Connection, task: Task):
+    conn.execute(
+        "INSERT OR REPLACE INTO tasks (id, session_id, status, metadata) VALUES (?, ?, ?, ?)",
+        (
+            task.id,
+            task.sessionId,
+            task.status.model_dump_json(),
+            None if task.metadata is None else json.dumps(task.metadata),
+        ),
+    )
+    conn.execute("DELETE FROM task_history WHERE task_id = ?", (task.id,))
+    conn.execute("DELETE FROM task_artifacts WHERE task_id = ?", (task.id,))
+    _append_history(conn, task.id, task.sessionId, task.history or [])
+    _append_artifacts(conn, task.id, task.artifacts or [])
+
+
+def _delete_task(
+    conn: sqlite3.Connection, task_id: str, cache: "_TaskCache | None" = None
+) -> bool:
+    cursor = conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+    conn.execute("DELETE FROM task_history WHERE task_id = ?", (task_id,))
+    conn.execute("DELETE FROM task_artifacts WHERE task_id = ?", (task_id,))
+    conn.execute("DELETE FROM push_notification_infos WHERE task_id = ?", (task_id,))
+    if cache is not None:
+        cache.discard(task_id)
+    return cursor.rowcount > 0
+
+
+def _load_history(conn: sqlite3.Connection, task_id: str) -> list[Message]:
+    rows = conn.execute(
+        "SELECT message FROM task_history WHERE task_id = ? ORDER BY seq", (task_id,)
+    ).fetchall()
+    return [Message.model_validate_json(row[0]) for row in rows]
+
+
+def _count_by_state(conn: sqlite3.Connection) -> dict[TaskState, int]:
+    rows = conn.execute(
+        "SELECT json_extract(status, '$.state'), COUNT(*) FROM tasks GROUP BY 1"
+    ).fetchall()
+    return {TaskState(state): count for state, count in rows}
+
+
+def _load_session_history(conn: sqlite3.Connection, session_id: str) -> list[Message]:
+    rows = conn.execute(
+        "SELECT h.message FROM task_history h JOIN tasks t ON t.id = h.task_id"
+        " WHERE h.session_id = ? ORDER BY t.rowid, h.seq",
+        (session_id,),
+    ).fetchall()
+    return [Message.model_validate_json(row[0]) for row in rows]
+
+
+def _load_task(conn: sqlite3.Connection, task_id: str) -> Task | None:
+    row = conn.execute(
+        "SELECT session_id, status, metadata FROM tasks WHERE id = ?", (task_id,)
+    ).fetchone()
+    if row is None:
+        return None
+
+    session_id, status, metadata = row
+    artifacts = [
+        Artifact.model_validate_json(artifact_row[0])
+        for artifact_row in conn.execute(
+            "SELECT artifact FROM task_artifacts WHERE task_id = ? ORDER BY seq",
+            (task_id,),
+        )
+    ]
+    return Task(
+        id=task_id,
+        sessionId=session_id,
+        status=TaskStatus.model_validate_json(status),
+        artifacts=artifacts or None,
+        history=_load_history(conn, task_id),
+        metadata=None if metadata is None else json.loads(metadata),
+    )
+
+
+class _TaskCache:
+    """The writer's copies of recently written tasks, least recently used first."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._tasks: OrderedDict[str, Task] = OrderedDict()
+        self._data_version: int | None = None
+
+    def validate(self, conn: sqlite3.Connection):
+        # data_version changes when any other connection commits.
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != self._data_version:
+            self._tasks.clear()
+            self._data_version = data_version
+
+    def get(self, conn: sqlite3.Connection, task_id: str) -> Task | None:
+        task = self._tasks.get(task_id)
+        if task is None:
+            task = _load_task(conn, task_id)
+            if task is None:
+                return None
+            self.put(task)
+        else:
+            self._tasks.move_to_end(task_id)
+        return task
+
+    def put(self, task: Task):
+        self._tasks[task.id] = task
+        self._tasks.move_to_end(task.id)
+        while len(self._tasks) > self.max_entries:
+            self._tasks.popitem(last=False)
+
+    def discard(self, task_id: str):
+        self._tasks.pop(task_id, None)
+
+    def clear(self):
+        self._tasks.clear()
+
+
+def _detached(task: Task) -> Task:
+    # The cached task keeps changing on the writer thread; callers get their
+    # own lists.
+    return task.model_copy(
+        update={
+            "history": list(task.history or []),
+            "artifacts": None if task.artifacts is None else list(task.artifacts),
+        }
+    )
+
+
+def _upsert_task(
+    conn: sqlite3.Connection, cache: _TaskCache, task_send_params: TaskSendParams
+) -> Task:
+    task = cache.get(conn, task_send_params.id)
+    if task is None:
+        status = TaskStatus(state=TaskState.SUBMITTED)
+        conn.execute(
+            "INSERT INTO tasks (id, session_id, status) VALUES (?, ?, ?)",
+            (task_send_params.id, task_send_params.sessionId, status.model_dump_json()),
+        )
+        _append_history(
+            conn, task_send_params.id, task_send_params.sessionId, [task_send_params.message]
+        )
+        task = Task(
+            id=task_send_params.id,
+            sessionId=task_send_params.sessionId,
+            status=status,
+            history=[task_send_params.message],
+        )
+        cache.put(task)
+    else:
+        _append_history(conn, task.id, task.sessionId, [task_send_params.message])
+        task.history.append(task_send_params.message)
+
+    return _detached(task)
+
+
+def _update_task(
+    conn: sqlite3.Connection,
+    cache: _TaskCache,
+    task_id: str,
+    status: TaskStatus,
+    artifacts: list[Artifact] | None,
+) -> Task:
+    task = cache.get(conn, task_id)
+    if task is None:
+        logger.error(f"Task {task_id} not found for updating the task")
+        raise ValueError(f"Task {task_id} not found")
+
+    conn.execute(
+        "UPDATE tasks SET status = ? WHERE id = ?", (status.model_dump_json(), task_id)
+    )
+    if status.message is not None:
+        _append_history(conn, task_id, task.sessionId, [status.message])
+    if artifacts:
+        _append_artifacts(conn, task_id, artifacts)
+
+    # Only now that every statement went through does the cached copy change.
+    task.status = status
+    if status.message is not None:
+        task.history.append(status.message)
+    if artifacts:
+        task.artifacts = (task.artifacts or []) + list(artifacts)
+
+    return _detached(task)
+
+
+def _get_push_notification_config(
+    conn: sqlite3.Connection, task_id: str
+) -> PushNotificationConfig | None:
+    row = conn.execute(
+        "SELECT config FROM push_notification_infos WHERE task_id = ?", (task_id,)
+    ).fetchone()
+    return None if row is None else PushNotificationConfig.model_validate_json(row[0])
+
+
+def _set_push_notification_info(
+    conn: sqlite3.Connection, task_id: str, notification_config: PushNotificationConfig
+):
+    if conn.execute("SELECT 1 FROM tasks WHERE id = ?", (task_id,)).fetchone() is None:
+        raise ValueError(f"Task not found for {task_id}")
+
+    conn.execute(
+        "INSERT OR REPLACE INTO push_notification_infos (task_id, config) VALUES (?, ?)",
+        (task_id, notification_config.model_dump_json()),
+    )
+
+
+def _get_push_notification_info(
+    conn: sqlite3.Connection, task_id: str
+) -> PushNotificationConfig:
+    if conn.execute("SELECT 1 FROM tasks WHERE id = ?", (task_id,)).fetchone() is None:
+        raise ValueError(f"Task not found for {task_id}")
+
+    config = _get_push_notification_config(conn, task_id)
+    if config is None:
+        raise KeyError(task_id)
+    return config
+
+
+class _SQLiteMapping(MutableMapping):
+    """Synchronous view over one table, for code that pokes at the store directly.
+
+    Deprecated: every access is a blocking query on the calling thread, which
+    is usually the event loop. Use the store's async methods instead. Values
+    returned are detached copies: mutating them does not write back to the
+    database.
+    """
+
+    def __init__(self, store: SQLiteTaskStore):
+        self._store = store
+
+    def _run(self, fn: Callable[[sqlite3.Connection], Any], write: bool = False) -> Any:
+        warnings.warn(
+            "The SQLiteTaskStore mapping views block the event loop; use the"
+            " async TaskStore methods instead",
+            DeprecationWarning,
+            stacklevel=3,
+        )
+        conn = self._store._connection()
+        if not write:
+            return fn(conn)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+
+
+class _TaskMapping(_SQLiteMapping):
+    def __getitem__(self, task_id: str) -> Task:
+        task = self._run(lambda conn: _load_task(conn, task_id))
+        if task is None:
+            raise KeyError(task_id)
+        return task
+
+    def __setitem__(self, task_id: str, task: Task) -> None:
+        if task.id != task_id:
+            raise ValueError(f"Task id {task.id} does not match key {task_id}")
+        self._run(lambda conn: _write_task(conn, task), write=True)
+
+    def __delitem__(self, task_id: str) -> None:
+        if not self._run(lambda conn: _delete_task(conn, task_id), write=True):
+            raise KeyError(task_id)
+
+    def __contains__(self, task_id: object) -> bool:
+        return self._run(
+            lambda conn: conn.execute(
+                "SELECT 1 FROM tasks WHERE id = ?", (task_id,)
+            ).fetchone()
+            is not None
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        rows = self._run(lambda conn: conn.execute("SELECT id FROM tasks").fetchall())
+        return iter([row[0] for row in rows])
+
+    def __len__(self) -> int:
+        return self._run(
+            lambda conn: conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+        )
+
+
+class _PushNotificationMapping(_SQLiteMapping):
+    def __getitem__(self, task_id: str) -> PushNotificationConfig:
+        config = self._run(lambda conn: _get_push_notification_config(conn, task_id))
+        if config is None:
+            raise KeyError(task_id)
+        return config
+
+    def __setitem__(self, task_id: str, config: PushNotificationConfig) -> None:
+        self._run(
+            lambda conn: conn.execute(
+                "INSERT OR REPLACE INTO push_notification_infos (task_id, config)"
+                " VALUES (?, ?)",
+                (task_id, config.model_dump_json()),
+            ),
+            write=True,
+        )
+
+    def __delitem__(self, task_id: str) -> None:
+        cursor = self._run(
+            lambda conn: conn.execute(
+                "DELETE FROM push_notification_infos WHERE task_id = ?", (task_id,)
+            ),
+            write=True,
+        )
+        if cursor.rowcount == 0:
+            raise KeyError(task_id)
+
+    def __iter__(self) -> Iterator[str]:
+        rows = self._run(
+            lambda conn: conn.execute(
+                "SELECT task_id FROM push_notification_infos"
+            ).fetchall()
+        )
+        return iter([row[0] for row in rows])
+
+    def __len__(self) -> int:
+        return self._run(
+            lambda conn: conn.execute(
+                "SELECT COUNT(*) FROM push_notification_infos"
+            ).fetchone()[0]
+        )
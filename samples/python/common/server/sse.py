@@ -0,0 +1,239 @@
+from collections import deque
+from enum import Enum
+from typing import Any
+from pydantic import PrivateAttr
+from common.types import (
+    InternalError,
+    JSONRPCError,
+    SendTaskStreamingResponse,
+    TaskStatusUpdateEvent,
+)
+import asyncio
+import json
+import time
+
+DEFAULT_SUBSCRIBER_QUEUE_SIZE = 1024
+DEFAULT_REPLAY_BUFFER_SIZE = 256
+# How long the events of an ended stream stay replayable after its last
+# subscriber left.
+DEFAULT_REPLAY_BUFFER_TTL_SECONDS = 60.0
+
+
+class OverflowPolicy(str, Enum):
+    """What to do when an SSE subscriber's queue is full.
+
+    DROP_OLDEST discards the oldest queued event. COALESCE discards queued
+    non-final status updates (a newer status supersedes them) and disconnects
+    the subscriber if that frees nothing, since artifacts cannot be dropped
+    silently. DISCONNECT ends the subscriber's stream with an error.
+    """
+
+    DROP_OLDEST = "drop-oldest"
+    COALESCE = "coalesce"
+    DISCONNECT = "disconnect"
+
+
+class EncodedEvent:
+    """An SSE event serialized once and shared by every subscriber of a task.
+
+    The JSON-RPC envelope and the SSE framing around the event are built here
+    too, so that delivering it only splices in each subscriber's request id.
+    """
+
+    __slots__ = ("event", "event_id", "payload", "_head", "_tail")
+
+    def __init__(self, event: Any, event_id: int | None = None):
+        self.event = event
+        self.event_id = event_id
+        member = b'"error":' if isinstance(event, JSONRPCError) else b'"result":'
+        self.payload = payload = event.model_dump_json(exclude_none=True).encode()
+        id_field = b"" if event_id is None else b"id: %d\r\n" % event_id
+        self._head = id_field + b'data: {"jsonrpc":"2.0"'
+        self._tail = b"," + member + payload + b"}\r\n\r\n"
+
+    def sse_frame(self, request_id) -> bytes:
+        """The complete SSE frame for a subscriber that sent ``request_id``."""
+        if request_id is None:
+            return self._head + self._tail
+        return (
+            self._head
+            + b',"id":'
+            + json.dumps(request_id, separators=(",", ":")).encode()
+            + self._tail
+        )
+
+
+def _unwrap(item: Any) -> Any:
+    return item.event if isinstance(item, EncodedEvent) else item
+
+
+def _is_coalescable(event: Any) -> bool:
+    event = _unwrap(event)
+    return isinstance(event, TaskStatusUpdateEvent) and not event.final
+
+
+class SubscriberQueue(asyncio.Queue):
+    """Bounded per-subscriber event queue that never blocks the producer.
+
+    Items are stored with their enqueue time so that the delivery lag of each
+    subscriber can be reported.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_SUBSCRIBER_QUEUE_SIZE,
+        overflow_policy: OverflowPolicy = OverflowPolicy.COALESCE,
+    ):
+        super().__init__(maxsize=maxsize)
+        self.overflow_policy = overflow_policy
+        self.disconnected = False
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.high_water = 0
+        self.last_lag_seconds = 0.0
+        self.max_lag_seconds = 0.0
+
+    def _init(self, maxsize):
+        self._queue: deque[tuple[float, Any]] = deque()
+        self.last_item: Any = None
+
+    def _put(self, item):
+        self._queue.append((time.monotonic(), item))
+        self.high_water = max(self.high_water, len(self._queue))
+
+    def _get(self):
+        enqueued_at, self.last_item = self._queue.popleft()
+        self.delivered += 1
+        self.last_lag_seconds = time.monotonic() - enqueued_at
+        self.max_lag_seconds = max(self.max_lag_seconds, self.last_lag_seconds)
+        return _unwrap(self.last_item)
+
+    async def get_event(self) -> tuple[int | None, Any]:
+        """Like get(), but returns the event as offered, with its replay id.
+
+        An EncodedEvent is returned as is, so its frame can be sent unchanged.
+        """
+        await self.get()
+        item = self.last_item
+        return (item.event_id if isinstance(item, EncodedEvent) else None), item
+
+    def offer(self, event: Any) -> bool:
+        """Enqueues without waiting. Returns False once the subscriber is disconnected."""
+        if self.disconnected:
+            return False
+
+        if self.full():
+            if self.overflow_policy == OverflowPolicy.DROP_OLDEST:
+                self._queue.popleft()
+                self.dropped += 1
+            elif self.overflow_policy == OverflowPolicy.COALESCE:
+                queued = len(self._queue)
+                self._queue = deque(
+                    entry for entry in self._queue if not _is_coalescable(entry[1])
+                )
+                self.coalesced += queued - len(self._queue)
+
+            if self.full():
+                self.disconnect()
+                return False
+
+        self.put_nowait(event)
+        return True
+
+    def disconnect(self):
+        """Drops everything queued and ends the stream with an error."""
+        self.dropped += len(self._queue)
+        self._queue.clear()
+        self.disconnected = True
+        self.put_nowait(
+            InternalError(
+                message="Subscriber fell too far behind and was disconnected"
+            )
+        )
+
+    def oldest_age_seconds(self) -> float:
+        if not self._queue:
+            return 0.0
+        return time.monotonic() - self._queue[0][0]
+
+    def stats(self) -> dict[str, float | int | bool]:
+        return {
+            "depth": self.qsize(),
+            "high_water": self.high_water,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "lag_seconds": self.oldest_age_seconds(),
+            "last_lag_seconds": self.last_lag_seconds,
+            "max_lag_seconds": self.max_lag_seconds,
+            "disconnected": self.disconnected,
+        }
+
+
+def ends_stream(event: Any) -> bool:
+    event = _unwrap(event)
+    return isinstance(event, JSONRPCError) or (
+        isinstance(event, TaskStatusUpdateEvent) and event.final
+    )
+
+
+class EventReplayBuffer:
+    """The most recent SSE events of one task, numbered from 1 upwards and encoded."""
+
+    def __init__(self, maxlen: int = DEFAULT_REPLAY_BUFFER_SIZE):
+        self._events: deque[tuple[int, Any]] = deque(maxlen=maxlen)
+        self.last_event_id = 0
+
+    def append(self, event: Any, event_id: int | None = None) -> EncodedEvent:
+        """Numbers and encodes ``event``; the result is what subscribers are sent.
+
+        ``event_id`` is given for events relayed from another worker process,
+        which keep the id they were numbered with there.
+        """
+        if event_id is None:
+            event_id = self.last_event_id + 1
+        self.last_event_id = max(self.last_event_id, event_id)
+        encoded = EncodedEvent(event, event_id)
+        self._events.append((event_id, encoded))
+        return encoded
+
+    def since(self, event_id: int) -> tuple[list[tuple[int, Any]], bool]:
+        """Returns the events after ``event_id`` and whether some were already lost."""
+        events = [entry for entry in self._events if entry[0] > event_id]
+        oldest = events[0][0] if events else self.last_event_id + 1
+        return events, oldest > event_id + 1
+
+    def has_ended(self) -> bool:
+        return bool(self._events) and ends_stream(self._events[-1][1])
+
+
+class StreamingEventResponse(SendTaskStreamingResponse):
+    """A streaming response that carries its event's pre-encoded SSE frame."""
+
+    _encoded: EncodedEvent | None = PrivateAttr(default=None)
+
+    @property
+    def event_id(self) -> int | None:
+        return self._encoded.event_id
+
+    def sse_frame(self) -> bytes:
+        return self._encoded.sse_frame(self.id)
+
+    @classmethod
+    def for_event(
+        cls, request_id, event: Any, event_id: int | None = None
+    ) -> "StreamingEventResponse":
+        """Wraps an event, encoding it unless it is already an EncodedEvent.
+
+        The event was validated when it was created, so the response is built
+        without validating it again for every subscriber.
+        """
+        if not isinstance(event, EncodedEvent):
+            event = EncodedEvent(event, event_id)
+        if isinstance(event.event, JSONRPCError):
+            response = cls.model_construct(id=request_id, error=event.event)
+        else:
+            response = cls.model_construct(id=request_id, result=event.event)
+        response._encoded = event
+        return response
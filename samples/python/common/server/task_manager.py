@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Union, AsyncIterable, List
+from typing import Any, Coroutine, Union, AsyncIterable, List
 from common.types import Task
 from common.types import (
     JSONRPCResponse,
@@ -22,6 +22,7 @@ from common.types import (
     TaskStatus,
     TaskState,
     TaskResubscriptionRequest,
+    TaskResubscriptionParams,
     SendTaskStreamingRequest,
     SendTaskStreamingResponse,
     Artifact,
@@ -30,13 +31,72 @@ from common.types import (
     JSONRPCError,
     TaskPushNotificationConfig,
     InternalError,
+    Message,
+    TextPart,
+    UnsupportedOperationError,
 )
 from common.server.utils import new_not_implemented_error
+from common.server.task_store import TaskStore, InMemoryTaskStore
+from common.server.retention import (
+    RetentionPolicy,
+    TaskRetention,
+    RetentionSweeper,
+    TERMINAL_STATES,
+)
+from common.server.agent_runner import AgentRunner
+from common.server.session_scheduler import SessionScheduler
+from common.server.task_versions import TaskVersions
+from common.server.disconnect import DisconnectPolicy
+from common.server.deadlines import current_deadline, deadline_from_metadata
+from common.server.idempotency import IdempotencyPolicy, SendDeduplicator
+from common.utils.tracing import span
+from common.server.sse import (
+    DEFAULT_REPLAY_BUFFER_SIZE,
+    DEFAULT_REPLAY_BUFFER_TTL_SECONDS,
+    DEFAULT_SUBSCRIBER_QUEUE_SIZE,
+    EventReplayBuffer,
+    OverflowPolicy,
+    StreamingEventResponse,
+    SubscriberQueue,
+    ends_stream,
+)
+from collections.abc import MutableMapping
 import asyncio
 import logging
+import time
+import weakref
 
 logger = logging.getLogger(__name__)
 
+# How long tasks/cancel waits for cancelled agent work to clean up.
+CANCEL_GRACE_SECONDS = 5.0
+
+
+class AgentWorkStopped(Exception):
+    """Raised by ``run_agent_work`` when the work was stopped before it finished.
+
+    The task is already in its final state; send handlers reply with it.
+    """
+
+    def __init__(self, task_id: str, reason: str):
+        super().__init__(f"Task {task_id} {reason}")
+        self.task_id = task_id
+
+
+class TaskCanceled(AgentWorkStopped):
+    """Raised by ``run_agent_work`` when tasks/cancel stopped the work."""
+
+    def __init__(self, task_id: str):
+        super().__init__(task_id, "was canceled")
+
+
+class TaskDeadlineExceeded(AgentWorkStopped):
+    """Raised by ``run_agent_work`` when the work ran past the task's deadline."""
+
+    def __init__(self, task_id: str):
+        super().__init__(task_id, "exceeded its deadline")
+
+
 class TaskManager(ABC):
     @abstractmethod
     async def on_get_task(self, request: GetTaskRequest) -> GetTaskResponse:
@@ -76,38 +136,178 @@ class TaskManager(ABC):
 
 
 class InMemoryTaskManager(TaskManager):
-    def __init__(self):
-        self.tasks: dict[str, Task] = {}
-        self.push_notification_infos: dict[str, PushNotificationConfig] = {}
+    def __init__(
+        self,
+        task_store: TaskStore | None = None,
+        retention: RetentionPolicy | None = None,
+        sse_queue_size: int = DEFAULT_SUBSCRIBER_QUEUE_SIZE,
+        sse_overflow_policy: OverflowPolicy = OverflowPolicy.COALESCE,
+        sse_replay_buffer_size: int = DEFAULT_REPLAY_BUFFER_SIZE,
+        sse_replay_buffer_ttl_seconds: float = DEFAULT_REPLAY_BUFFER_TTL_SECONDS,
+        agent_runner: AgentRunner | None = None,
+        session_scheduler: SessionScheduler | None = None,
+        disconnect_policy: DisconnectPolicy | None = None,
+        default_deadline_seconds: float | None = None,
+        idempotency: IdempotencyPolicy | None = None,
+    ):
+        self.task_store = task_store if task_store is not None else InMemoryTaskStore()
+        # The store synchronizes itself; this lock is kept for subclasses that
+        # still guard their own direct edits of `tasks`.
         self.lock = asyncio.Lock()
-        self.task_sse_subscribers: dict[str, List[asyncio.Queue]] = {}
+        self.task_sse_subscribers: dict[str, List[SubscriberQueue]] = {}
         self.subscriber_lock = asyncio.Lock()
+        self.sse_queue_size = sse_queue_size
+        self.sse_overflow_policy = sse_overflow_policy
+        self.sse_replay_buffer_size = sse_replay_buffer_size
+        self.task_event_buffers: dict[str, EventReplayBuffer] = {}
+        # Buffers of ended streams are dropped this long after their last
+        # subscriber left, whether or not a retention policy evicts the task.
+        self.sse_replay_buffer_ttl_seconds = sse_replay_buffer_ttl_seconds
+        self._buffer_expiries: dict[str, asyncio.TimerHandle] = {}
+        # Set in multi-worker mode to share SSE events with the other workers.
+        self.event_relay = None
+        self.retention = TaskRetention(retention) if retention is not None else None
+        self._retention_sweeper = (
+            RetentionSweeper(self, self.retention) if self.retention is not None else None
+        )
+        # Subclasses call their agents through this so that synchronous agent
+        # code runs off the event loop.
+        self.agent_runner = agent_runner if agent_runner is not None else AgentRunner()
+        # Subclasses run each agent turn in a slot of this, so turns of one
+        # session never overlap.
+        self.session_scheduler = (
+            session_scheduler if session_scheduler is not None else SessionScheduler()
+        )
+        self.task_versions = TaskVersions()
+        # Agent work in progress, by task id; tasks/cancel stops it.
+        self.running_work: dict[str, asyncio.Task] = {}
+        self._cancellations: dict[str, asyncio.Future] = {}
+        # Work started by start_agent_work, which no request awaits; only
+        # this is canceled when its streams are abandoned.
+        self._background_work: weakref.WeakSet[asyncio.Task] = weakref.WeakSet()
+        # Work tasks/cancel stopped; whatever it still writes is dropped.
+        self._stopped_work: weakref.WeakSet[asyncio.Task] = weakref.WeakSet()
+        self.disconnect_policy = disconnect_policy
+        # Grace timers of tasks whose last subscriber left; see DisconnectPolicy.
+        self._abandoned: dict[str, asyncio.Task] = {}
+        self.abandoned_canceled = 0
+        # Sends may set a shorter deadline in their metadata; see deadlines.py.
+        self.default_deadline_seconds = default_deadline_seconds
+        self._deadlines: dict[str, float] = {}
+        # Agent work stopped at its deadline, by agent.
+        self.deadline_timeouts: dict[str, int] = {}
+        # Off unless an IdempotencyPolicy is given. A2AServer then routes
+        # tasks/send through this, so a retried send joins the run already
+        # going instead of paying for the agent again.
+        self.send_deduplicator = (
+            SendDeduplicator(idempotency) if idempotency is not None else None
+        )
+
+    @property
+    def tasks(self) -> MutableMapping[str, Task]:
+        """The store's tasks. Read-only, so a subclass that assigns its own
+        dict fails loudly instead of hiding its tasks from the handlers."""
+        return self.task_store.tasks
+
+    @property
+    def push_notification_infos(self) -> MutableMapping[str, PushNotificationConfig]:
+        return self.task_store.push_notification_infos
 
     async def on_get_task(self, request: GetTaskRequest) -> GetTaskResponse:
         logger.info(f"Getting task {request.params.id}")
         task_query_params: TaskQueryParams = request.params
 
-        async with self.lock:
-            task = self.tasks.get(task_query_params.id)
+        if self.event_relay is not None and (
+            task_query_params.sinceVersion is not None or task_query_params.waitMs
+        ):
+            # Versions are counted per process, and the next request may reach
+            # a worker that numbered the task's changes differently.
+            return GetTaskResponse(
+                id=request.id,
+                error=UnsupportedOperationError(
+                    message="sinceVersion and waitMs are not supported with multiple workers"
+                ),
+            )
+
+        task = await self.task_store.get_task(task_query_params.id)
+        if task is None:
+            return GetTaskResponse(id=request.id, error=TaskNotFoundError())
+        version = self._version_of(task)
+
+        if task_query_params.waitMs:
+            since_version = task_query_params.sinceVersion
+            await self.task_versions.wait_for_change(
+                task.id,
+                since_version if since_version is not None else version,
+                task_query_params.waitMs / 1000,
+            )
+            task = await self.task_store.get_task(task_query_params.id)
             if task is None:
                 return GetTaskResponse(id=request.id, error=TaskNotFoundError())
-
-            task_result = self.append_task_history(
-                task, task_query_params.historyLength
+            version = self._version_of(task)
+        self._touch_task(task)
+
+        delta_start = None
+        if task_query_params.sinceVersion is not None:
+            # An unknown version (e.g. from before a restart) gets the whole task.
+            delta_start = self.task_versions.delta_start(
+                task.id, task_query_params.sinceVersion
             )
 
-        return GetTaskResponse(id=request.id, result=task_result)
+        # The stored task is serialized as is, with the projection and delta
+        # applied on the fly rather than to a copy.
+        return GetTaskResponse(id=request.id, result=task).with_projection(
+            task_query_params, delta_start, version
+        )
 
     async def on_cancel_task(self, request: CancelTaskRequest) -> CancelTaskResponse:
         logger.info(f"Cancelling task {request.params.id}")
         task_id_params: TaskIdParams = request.params
 
-        async with self.lock:
-            task = self.tasks.get(task_id_params.id)
-            if task is None:
-                return CancelTaskResponse(id=request.id, error=TaskNotFoundError())
-
-        return CancelTaskResponse(id=request.id, error=TaskNotCancelableError())
+        task = await self.task_store.get_task(task_id_params.id)
+        if task is None:
+            return CancelTaskResponse(id=request.id, error=TaskNotFoundError())
+
+        canceled = self._cancellations.get(task_id_params.id)
+        if canceled is not None:
+            # Already being canceled by another request.
+            await canceled
+            task = await self.task_store.get_task(task_id_params.id)
+            return CancelTaskResponse(id=request.id, result=task)
+
+        work = self.running_work.get(task_id_params.id)
+        if work is None or work.done() or task.status.state in TERMINAL_STATES:
+            return CancelTaskResponse(id=request.id, error=TaskNotCancelableError())
+
+        task = await self.cancel_agent_work(task_id_params.id, work)
+        return CancelTaskResponse(id=request.id, result=task)
+
+    async def cancel_agent_work(self, task_id: str, work: asyncio.Task) -> Task:
+        """Stops the running agent work of a task and marks it CANCELED."""
+        # Cancellation reaches the agent at its next await: the session and
+        # admission slots it holds are released on the way out, and a call
+        # waiting on the agent thread pool is dropped. The task is marked
+        # CANCELED once the agent has stopped, so nothing it writes on the way
+        # out can overwrite that.
+        canceled = asyncio.get_running_loop().create_future()
+        self._cancellations[task_id] = canceled
+        try:
+            work.cancel()
+            self._stopped_work.add(work)
+            await asyncio.wait({work}, timeout=CANCEL_GRACE_SECONDS)
+            if not work.done():
+                logger.warning(f"Agent work of task {task_id} is slow to cancel")
+
+            task = await self.update_store(
+                task_id, TaskStatus(state=TaskState.CANCELED), None
+            )
+            await self.enqueue_events_for_sse(
+                task.id, TaskStatusUpdateEvent(id=task.id, status=task.status, final=True)
+            )
+        finally:
+            del self._cancellations[task_id]
+            canceled.set_result(None)
+        return task
 
     @abstractmethod
     async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
@@ -120,29 +320,13 @@ class InMemoryTaskManager(TaskManager):
         pass
 
     async def set_push_notification_info(self, task_id: str, notification_config: PushNotificationConfig):
-        async with self.lock:
-            task = self.tasks.get(task_id)
-            if task is None:
-                raise ValueError(f"Task not found for {task_id}")
+        await self.task_store.set_push_notification_info(task_id, notification_config)
 
-            self.push_notification_infos[task_id] = notification_config
-
-        return
-    
     async def get_push_notification_info(self, task_id: str) -> PushNotificationConfig:
-        async with self.lock:
-            task = self.tasks.get(task_id)
-            if task is None:
-                raise ValueError(f"Task not found for {task_id}")
+        return await self.task_store.get_push_notification_info(task_id)
 
-            return self.push_notification_infos[task_id]
-            
-        return
-    
     async def has_push_notification_info(self, task_id: str) -> bool:
-        async with self.lock:
-            return task_id in self.push_notification_infos
-            
+        return await self.task_store.has_push_notification_info(task_id)
 
     async def on_set_task_push_notification(
         self, request: SetTaskPushNotificationRequest
@@ -182,59 +366,239 @@ class InMemoryTaskManager(TaskManager):
         
         return GetTaskPushNotificationResponse(id=request.id, result=TaskPushNotificationConfig(id=task_params.id, pushNotificationConfig=notification_info))
 
+    async def get_task(self, task_id: str) -> Task | None:
+        return await self.task_store.get_task(task_id)
+
     async def upsert_task(self, task_send_params: TaskSendParams) -> Task:
         logger.info(f"Upserting task {task_send_params.id}")
-        async with self.lock:
-            task = self.tasks.get(task_send_params.id)
-            if task is None:
-                task = Task(
-                    id=task_send_params.id,
-                    sessionId = task_send_params.sessionId,
-                    messages=[task_send_params.message],
-                    status=TaskStatus(state=TaskState.SUBMITTED),
-                    history=[task_send_params.message],
-                )
-                self.tasks[task_send_params.id] = task
-            else:
-                task.history.append(task_send_params.message)
+        with span("task.upsert", task_id=task_send_params.id):
+            task = await self.task_store.upsert_task(task_send_params)
+        task.version = self.task_versions.bump(task)
+        self._touch_task(task, modified=True)
+        # The time budget covers everything from here: session queue, agent
+        # and tool calls.
+        budget = deadline_from_metadata(task_send_params.metadata)
+        if budget is None:
+            budget = self.default_deadline_seconds
+        if budget is not None:
+            self._deadlines[task.id] = time.monotonic() + budget
+        else:
+            self._deadlines.pop(task.id, None)
+        if self._retention_sweeper is not None:
+            self._retention_sweeper.ensure_started()
+        return task
+
+    def clear_deadline(self, task_id: str):
+        """Drops the deadline that the latest send to a task set.
 
-            return task
+        A2AServer calls this once a send's handler has returned; agent work
+        the send started has taken its deadline along by then.
+        """
+        self._deadlines.pop(task_id, None)
 
     async def on_resubscribe_to_task(
         self, request: TaskResubscriptionRequest
     ) -> Union[AsyncIterable[SendTaskStreamingResponse], JSONRPCResponse]:
-        return new_not_implemented_error(request.id)
+        task_params: TaskResubscriptionParams = request.params
+        logger.info(
+            f"Resubscribing to task {task_params.id} after event {task_params.lastEventId}"
+        )
+        task = await self.task_store.get_task(task_params.id)
+        if task is None:
+            return JSONRPCResponse(id=request.id, error=TaskNotFoundError())
+
+        sse_event_queue = await self.setup_sse_consumer(task_params.id)
+        replay = self.replay_events(task, task_params.lastEventId)
+        return self.dequeue_events_for_sse(
+            request.id, task_params.id, sse_event_queue, replay
+        )
+
+    def replay_events(
+        self, task: Task, last_event_id: int | None
+    ) -> list[tuple[int | None, Any]]:
+        """Events a subscriber resuming after ``last_event_id`` has missed.
+
+        Without a cursor nothing is replayed. If the cursor is older than the
+        replay buffer, or the stream has already ended with nothing left to
+        replay, a snapshot of the current status is sent first so the client
+        can resynchronize.
+        """
+        buffer = self.task_event_buffers.get(task.id)
+        events, gap = [], False
+        if last_event_id is not None:
+            if buffer is not None:
+                events, gap = buffer.since(last_event_id)
+            else:
+                # Nothing is buffered here (e.g. the events were produced by
+                # another worker), so whatever was missed cannot be replayed.
+                gap = True
+
+        ended = task.status.state in TERMINAL_STATES or (
+            buffer is not None and buffer.has_ended()
+        )
+        if gap or (ended and not events):
+            snapshot = TaskStatusUpdateEvent(
+                id=task.id, status=task.status, final=ended and not events
+            )
+            events.insert(0, (None, snapshot))
+        return events
 
     async def update_store(
         self, task_id: str, status: TaskStatus, artifacts: list[Artifact]
     ) -> Task:
-        async with self.lock:
-            try:
-                task = self.tasks[task_id]
-            except KeyError:
-                logger.error(f"Task {task_id} not found for updating the task")
-                raise ValueError(f"Task {task_id} not found")
-
-            task.status = status
-
-            if status.message is not None:
-                task.history.append(status.message)
-
-            if artifacts is not None:
-                if task.artifacts is None:
-                    task.artifacts = []
-                task.artifacts.extend(artifacts)
+        # Agent work that swallowed its cancellation, or outlived the grace
+        # period, must not overwrite the CANCELED state.
+        self._raise_if_stopped(task_id)
+        with span("task.update", task_id=task_id, state=status.state.value):
+            task = await self.task_store.update_task(task_id, status, artifacts)
+        task.version = self.task_versions.bump(task)
+        if status.state in TERMINAL_STATES:
+            self.task_versions.trim(task_id)
+        self._touch_task(task, modified=True)
+        return task
+
+    def start_agent_work(self, task_id: str, work: Coroutine) -> asyncio.Task:
+        """Runs ``work`` for a task in the background, where tasks/cancel can stop it."""
+        running = self._track_work(task_id, work)
+        self._background_work.add(running)
+
+        def log_failure(done: asyncio.Task):
+            if done.cancelled() or isinstance(done.exception(), AgentWorkStopped):
+                return
+            if done.exception() is not None:
+                logger.error(f"Agent work of task {task_id} failed: {done.exception()}")
 
-            return task
+        running.add_done_callback(log_failure)
+        return running
 
-    def append_task_history(self, task: Task, historyLength: int | None):
-        new_task = task.model_copy()
-        if historyLength is not None and historyLength > 0:
-            new_task.history = new_task.history[-historyLength:]
-        else:
-            new_task.history = []
+    async def run_agent_work(self, task_id: str, work: Coroutine) -> Any:
+        """Awaits ``work`` for a task, where tasks/cancel can stop it.
 
-        return new_task        
+        Raises TaskCanceled if it was; the task is CANCELED by then. Raises
+        TaskDeadlineExceeded if the work ran past the task's deadline; the
+        task is FAILED by then.
+        """
+        running = self._track_work(task_id, work)
+        try:
+            return await running
+        except asyncio.CancelledError:
+            if running.cancelled() and not asyncio.current_task().cancelling():
+                canceled = self._cancellations.get(task_id)
+                if canceled is not None:
+                    await canceled
+                raise TaskCanceled(task_id) from None
+            raise
+
+    def _raise_if_stopped(self, task_id: str):
+        if asyncio.current_task() in self._stopped_work:
+            raise TaskCanceled(task_id)
+
+    def _track_work(self, task_id: str, work: Coroutine) -> asyncio.Task:
+        deadline = self._deadlines.get(task_id)
+        if deadline is not None:
+            work = self._run_until_deadline(task_id, work, deadline)
+        running = asyncio.create_task(work)
+        self.running_work[task_id] = running
+
+        def forget(done: asyncio.Task):
+            if self.running_work.get(task_id) is done:
+                del self.running_work[task_id]
+
+        running.add_done_callback(forget)
+        return running
+
+    async def _run_until_deadline(
+        self, task_id: str, work: Coroutine, deadline: float
+    ) -> Any:
+        # Set in this task's own context, so agent code (and the threads
+        # AgentRunner starts for it) can ask for the time left.
+        current_deadline.set(deadline)
+        timeout = asyncio.timeout(deadline - time.monotonic())
+        try:
+            async with timeout:
+                return await work
+        except TimeoutError:
+            if not timeout.expired():
+                raise
+        agent = self.agent_name
+        self.deadline_timeouts[agent] = self.deadline_timeouts.get(agent, 0) + 1
+        logger.warning(f"Task {task_id} of {agent} exceeded its deadline")
+        task = await self.update_store(
+            task_id,
+            TaskStatus(
+                state=TaskState.FAILED,
+                message=Message(
+                    role="agent", parts=[TextPart(text="Task exceeded its deadline")]
+                ),
+            ),
+            None,
+        )
+        await self.enqueue_events_for_sse(
+            task_id, TaskStatusUpdateEvent(id=task_id, status=task.status, final=True)
+        )
+        raise TaskDeadlineExceeded(task_id)
+
+    @property
+    def agent_name(self) -> str:
+        """Names this manager's agent in metrics."""
+        agent = getattr(self, "agent", None)
+        return type(agent).__name__ if agent is not None else type(self).__name__
+
+    def _version_of(self, task: Task) -> int:
+        version = self.task_versions.version(task.id)
+        if version is None:
+            # Stored before this process started; versioned from now on.
+            version = self.task_versions.bump(task)
+        return version
+
+    def _touch_task(self, task: Task, modified: bool = False):
+        if self.retention is not None:
+            self.retention.touch(task, modified)
+
+    def _has_sse_subscribers(self, task_id: str) -> bool:
+        return bool(self.task_sse_subscribers.get(task_id))
+
+    async def sweep_tasks(self):
+        """Applies the retention policy once; normally run by the background sweeper."""
+        if self.retention is None:
+            return
+
+        for task_id in self.retention.dirty_task_ids():
+            self.retention.record_size(task_id, await self.task_store.get_task(task_id))
+
+        for task_id, reason in self.retention.select_evictions(self._has_sse_subscribers):
+            # Re-check: the task may have been resumed or subscribed to while
+            # earlier evictions were awaiting the store.
+            if not self.retention.is_evictable(task_id, self._has_sse_subscribers):
+                continue
+            await self.evict_task(task_id)
+            self.retention.evictions[reason] += 1
+            logger.info(f"Evicted task {task_id} ({reason})")
+
+    async def evict_task(self, task_id: str):
+        await self.task_store.delete_task(task_id)
+        async with self.subscriber_lock:
+            if not self.task_sse_subscribers.get(task_id):
+                self.task_sse_subscribers.pop(task_id, None)
+                self.task_event_buffers.pop(task_id, None)
+                expiry = self._buffer_expiries.pop(task_id, None)
+                if expiry is not None:
+                    expiry.cancel()
+        self.task_versions.forget(task_id)
+        self._deadlines.pop(task_id, None)
+        if self.retention is not None:
+            self.retention.forget(task_id)
+
+    async def close(self):
+        if self._retention_sweeper is not None:
+            await self._retention_sweeper.stop()
+        for timer in list(self._abandoned.values()):
+            timer.cancel()
+        for expiry in self._buffer_expiries.values():
+            expiry.cancel()
+        self._buffer_expiries.clear()
+        self.agent_runner.shutdown(wait=False)
+        await self.task_store.close()
 
     async def setup_sse_consumer(self, task_id: str, is_resubscribe: bool = False):
         async with self.subscriber_lock:
@@ -244,34 +608,157 @@ class InMemoryTaskManager(TaskManager):
                 else:
                     self.task_sse_subscribers[task_id] = []
 
-            sse_event_queue = asyncio.Queue(maxsize=0) # <=0 is unlimited
+            sse_event_queue = SubscriberQueue(
+                self.sse_queue_size, self.sse_overflow_policy
+            )
             self.task_sse_subscribers[task_id].append(sse_event_queue)
+            timer = self._abandoned.pop(task_id, None)
+            if timer is not None:
+                timer.cancel()
             return sse_event_queue
 
     async def enqueue_events_for_sse(self, task_id, task_update_event):
-        async with self.subscriber_lock:
-            if task_id not in self.task_sse_subscribers:
-                return
-
-            current_subscribers = self.task_sse_subscribers[task_id]
-            for subscriber in current_subscribers:
-                await subscriber.put(task_update_event)
+        self._raise_if_stopped(task_id)
+        encoded = self._fan_out(task_id, task_update_event)
+        if self.event_relay is not None:
+            self.event_relay.publish(task_id, encoded)
+
+    def receive_relayed_event(self, task_id: str, event: Any, event_id: int):
+        """Delivers an event that another worker process enqueued.
+
+        Only tasks this process streams, or has streamed, are buffered; a
+        later resubscribe to any other task starts from a status snapshot.
+        """
+        if task_id in self.task_event_buffers or self.task_sse_subscribers.get(task_id):
+            self._fan_out(task_id, event, event_id)
+
+    def _fan_out(self, task_id, task_update_event, event_id: int | None = None):
+        buffer = self.task_event_buffers.get(task_id)
+        if buffer is None:
+            buffer = EventReplayBuffer(self.sse_replay_buffer_size)
+            self.task_event_buffers[task_id] = buffer
+        # Serialized once here; every subscriber and any replay share the bytes.
+        with span("sse.encode", task_id=task_id):
+            encoded = buffer.append(task_update_event, event_id)
+
+        # Offering never awaits, so the subscriber list cannot change under us
+        # and a stalled client can neither block nor delay the others.
+        current_subscribers = self.task_sse_subscribers.get(task_id)
+        if current_subscribers:
+            for subscriber in list(current_subscribers):
+                if not subscriber.offer(encoded):
+                    logger.warning(f"Disconnected slow SSE subscriber of task {task_id}")
+                    current_subscribers.remove(subscriber)
+        self._expire_buffer_later(task_id)
+        return encoded
+
+    def _expire_buffer_later(self, task_id: str):
+        """Schedules dropping the replay buffer of a stream that has ended and
+        that nobody is subscribed to; a newer event or subscriber defers it."""
+        buffer = self.task_event_buffers.get(task_id)
+        if buffer is None or not buffer.has_ended() or self._has_sse_subscribers(task_id):
+            return
+        expiry = self._buffer_expiries.pop(task_id, None)
+        if expiry is not None:
+            expiry.cancel()
+        self._buffer_expiries[task_id] = asyncio.get_running_loop().call_later(
+            self.sse_replay_buffer_ttl_seconds, self._expire_buffer, task_id, buffer
+        )
+
+    def _expire_buffer(self, task_id: str, buffer: EventReplayBuffer):
+        self._buffer_expiries.pop(task_id, None)
+        if (
+            self.task_event_buffers.get(task_id) is not buffer
+            or not buffer.has_ended()
+            or self._has_sse_subscribers(task_id)
+        ):
+            return
+        del self.task_event_buffers[task_id]
+        self.task_sse_subscribers.pop(task_id, None)
+
+    def subscriber_stats(self) -> dict[str, list[dict]]:
+        return {
+            task_id: [subscriber.stats() for subscriber in subscribers]
+            for task_id, subscribers in self.task_sse_subscribers.items()
+            if subscribers
+        }
 
     async def dequeue_events_for_sse(
-        self, request_id, task_id, sse_event_queue: asyncio.Queue
+        self,
+        request_id,
+        task_id,
+        sse_event_queue: SubscriberQueue,
+        replay: list[tuple[int | None, Any]] = (),
     ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
         try:
-            while True:                
-                event = await sse_event_queue.get()
-                if isinstance(event, JSONRPCError):
-                    yield SendTaskStreamingResponse(id=request_id, error=event)
-                    break
-                                                
-                yield SendTaskStreamingResponse(id=request_id, result=event)
-                if isinstance(event, TaskStatusUpdateEvent) and event.final:
+            last_event_id = None
+            for event_id, event in replay:
+                yield StreamingEventResponse.for_event(request_id, event, event_id)
+                if ends_stream(event):
+                    return
+                if event_id is not None:
+                    last_event_id = event_id
+
+            while True:
+                event_id, event = await sse_event_queue.get_event()
+                if (
+                    last_event_id is not None
+                    and event_id is not None
+                    and event_id <= last_event_id
+                ):
+                    # Already delivered from the replay buffer.
+                    continue
+
+                yield StreamingEventResponse.for_event(request_id, event, event_id)
+                if ends_stream(event):
                     break
         finally:
             async with self.subscriber_lock:
-                if task_id in self.task_sse_subscribers:
-                    self.task_sse_subscribers[task_id].remove(sse_event_queue)
+                subscribers = self.task_sse_subscribers.get(task_id)
+                if subscribers and sse_event_queue in subscribers:
+                    subscribers.remove(sse_event_queue)
+                if subscribers is not None and not subscribers:
+                    del self.task_sse_subscribers[task_id]
+                self._check_abandoned(task_id)
+                self._expire_buffer_later(task_id)
+
+    def _check_abandoned(self, task_id: str):
+        """Starts the grace timer of a task whose last subscriber just left."""
+        if self.disconnect_policy is None or task_id in self._abandoned:
+            return
+        work = self.running_work.get(task_id)
+        buffer = self.task_event_buffers.get(task_id)
+        if (
+            work is None
+            or work.done()
+            or work not in self._background_work
+            or self._has_sse_subscribers(task_id)
+            or (buffer is not None and buffer.has_ended())
+        ):
+            return
+        timer = asyncio.create_task(self._cancel_if_abandoned(task_id, work))
+        self._abandoned[task_id] = timer
+
+        def forget(done: asyncio.Task):
+            if self._abandoned.get(task_id) is done:
+                del self._abandoned[task_id]
+
+        timer.add_done_callback(forget)
+
+    async def _cancel_if_abandoned(self, task_id: str, work: asyncio.Task):
+        await asyncio.sleep(self.disconnect_policy.grace_seconds)
+        # From here on a resubscribe no longer stops the timer; the checks
+        # below see the new subscriber instead.
+        del self._abandoned[task_id]
+        if (
+            work.done()
+            or self.running_work.get(task_id) is not work
+            or task_id in self._cancellations
+            or self._has_sse_subscribers(task_id)
+            or await self.has_push_notification_info(task_id)
+        ):
+            return
+        logger.info(f"Canceling task {task_id}: no subscribers and no push notification")
+        self.abandoned_canceled += 1
+        await self.cancel_agent_work(task_id, work)
 
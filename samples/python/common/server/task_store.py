@@ -0,0 +1,183 @@
+from abc import ABC, abstractmethod
+from collections.abc import MutableMapping
+from common.types import (
+    Task,
+    TaskSendParams,
+    TaskStatus,
+    TaskState,
+    Artifact,
+    Message,
+    PushNotificationConfig,
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TaskStore(ABC):
+    """Storage backend for tasks and their push notification configs.
+
+    ``tasks`` and ``push_notification_infos`` are synchronous mapping views kept
+    for code that inspects the store directly; everything on the request path
+    goes through the async methods below. Backends that can only serve the
+    views by blocking (SQLite) warn when they are used.
+    """
+
+    tasks: MutableMapping[str, Task]
+    push_notification_infos: MutableMapping[str, PushNotificationConfig]
+
+    @abstractmethod
+    async def get_task(self, task_id: str) -> Task | None:
+        pass
+
+    @abstractmethod
+    async def upsert_task(self, task_send_params: TaskSendParams) -> Task:
+        pass
+
+    @abstractmethod
+    async def update_task(
+        self, task_id: str, status: TaskStatus, artifacts: list[Artifact] | None
+    ) -> Task:
+        pass
+
+    @abstractmethod
+    async def delete_task(self, task_id: str) -> bool:
+        """Removes a task and its push notification config; False if absent."""
+        pass
+
+    @abstractmethod
+    async def load_history(self, task_id: str) -> list[Message]:
+        pass
+
+    @abstractmethod
+    async def load_session_history(self, session_id: str) -> list[Message]:
+        pass
+
+    @abstractmethod
+    async def set_push_notification_info(
+        self, task_id: str, notification_config: PushNotificationConfig
+    ):
+        pass
+
+    @abstractmethod
+    async def get_push_notification_info(
+        self, task_id: str
+    ) -> PushNotificationConfig:
+        pass
+
+    @abstractmethod
+    async def has_push_notification_info(self, task_id: str) -> bool:
+        pass
+
+    async def count_by_state(self) -> dict[TaskState, int]:
+        """Number of stored tasks in each state, for metrics."""
+        counts: dict[TaskState, int] = {}
+        for task in list(self.tasks.values()):
+            counts[task.status.state] = counts.get(task.status.state, 0) + 1
+        return counts
+
+    async def close(self):
+        pass
+
+
+class InMemoryTaskStore(TaskStore):
+    """Task and push notification storage in plain dicts.
+
+    No method below awaits between reading and writing a task, so on the
+    event loop every one of them is atomic and needs no lock; neither readers
+    nor writers ever wait for each other. A backend whose writes do await
+    must synchronize them itself.
+    """
+
+    def __init__(self):
+        self.tasks: dict[str, Task] = {}
+        self.push_notification_infos: dict[str, PushNotificationConfig] = {}
+        self._session_tasks: dict[str, list[str]] = {}
+
+    async def get_task(self, task_id: str) -> Task | None:
+        return self.tasks.get(task_id)
+
+    async def upsert_task(self, task_send_params: TaskSendParams) -> Task:
+        task = self.tasks.get(task_send_params.id)
+        if task is None:
+            task = Task(
+                id=task_send_params.id,
+                sessionId=task_send_params.sessionId,
+                messages=[task_send_params.message],
+                status=TaskStatus(state=TaskState.SUBMITTED),
+                history=[task_send_params.message],
+            )
+            self.tasks[task_send_params.id] = task
+            self._session_tasks.setdefault(task.sessionId, []).append(task.id)
+        else:
+            task.history.append(task_send_params.message)
+
+        return task
+
+    async def update_task(
+        self, task_id: str, status: TaskStatus, artifacts: list[Artifact] | None
+    ) -> Task:
+        try:
+            task = self.tasks[task_id]
+        except KeyError:
+            logger.error(f"Task {task_id} not found for updating the task")
+            raise ValueError(f"Task {task_id} not found")
+
+        task.status = status
+
+        if status.message is not None:
+            task.history.append(status.message)
+
+        if artifacts is not None:
+            if task.artifacts is None:
+                task.artifacts = []
+            task.artifacts.extend(artifacts)
+
+        return task
+
+    async def delete_task(self, task_id: str) -> bool:
+        task = self.tasks.get(task_id)
+        if task is None:
+            return False
+
+        del self.tasks[task_id]
+        self.push_notification_infos.pop(task_id, None)
+        session_tasks = self._session_tasks.get(task.sessionId)
+        if session_tasks is not None and task_id in session_tasks:
+            session_tasks.remove(task_id)
+            if not session_tasks:
+                del self._session_tasks[task.sessionId]
+        return True
+
+    async def load_history(self, task_id: str) -> list[Message]:
+        task = self.tasks.get(task_id)
+        if task is None or task.history is None:
+            return []
+        return list(task.history)
+
+    async def load_session_history(self, session_id: str) -> list[Message]:
+        history = []
+        for task_id in self._session_tasks.get(session_id, []):
+            task = self.tasks.get(task_id)
+            if task is not None and task.history:
+                history.extend(task.history)
+        return history
+
+    async def set_push_notification_info(
+        self, task_id: str, notification_config: PushNotificationConfig
+    ):
+        if task_id not in self.tasks:
+            raise ValueError(f"Task not found for {task_id}")
+
+        self.push_notification_infos[task_id] = notification_config
+
+    async def get_push_notification_info(
+        self, task_id: str
+    ) -> PushNotificationConfig:
+        if task_id not in self.tasks:
+            raise ValueError(f"Task not found for {task_id}")
+
+        return self.push_notification_infos[task_id]
+
+    async def has_push_notification_info(self, task_id: str) -> bool:
+        return task_id in self.push_notification_infos
@@ -0,0 +1,93 @@
+from common.types import Task
+import asyncio
+
+# The longest a tasks/get may block waiting for a change.
+MAX_WAIT_SECONDS = 60.0
+
+
+class _Versions:
+    __slots__ = ("base", "marks", "changed")
+
+    def __init__(self):
+        # marks[i] is (history length, artifact count) as of version base + i;
+        # version 0 is the empty task, so a delta since 0 is the whole task.
+        self.base = 0
+        self.marks: list[tuple[int, int]] = [(0, 0)]
+        self.changed = asyncio.Event()
+
+    @property
+    def version(self) -> int:
+        return self.base + len(self.marks) - 1
+
+
+class TaskVersions:
+    """Version numbers of tasks, for delta fetches and long-polling tasks/get.
+
+    Every change of a task bumps its version. Task history and artifacts are
+    only ever appended to, so remembering how many of each a task had at
+    every version is enough to tell what was added since any of them.
+    Versions are kept in memory, per process. Once a task has ended only its
+    latest version is remembered; a delta since an older one is the whole
+    task.
+    """
+
+    def __init__(self):
+        self._tasks: dict[str, _Versions] = {}
+        # Number of tasks/get calls blocked waiting for a change.
+        self.waiting = 0
+
+    def bump(self, task: Task) -> int:
+        versions = self._tasks.get(task.id)
+        if versions is None:
+            versions = self._tasks[task.id] = _Versions()
+        history_length, artifact_count = versions.marks[-1]
+        versions.marks.append(
+            (
+                max(history_length, len(task.history or ())),
+                max(artifact_count, len(task.artifacts or ())),
+            )
+        )
+        # Wake the long polls waiting for this change, and start a new round.
+        versions.changed.set()
+        versions.changed = asyncio.Event()
+        return versions.version
+
+    def version(self, task_id: str) -> int | None:
+        versions = self._tasks.get(task_id)
+        return versions.version if versions is not None else None
+
+    def delta_start(self, task_id: str, since_version: int) -> tuple[int, int] | None:
+        """How many history messages and artifacts the task had at
+        ``since_version``, or None if that version is unknown here (for
+        example, from before a restart)."""
+        versions = self._tasks.get(task_id)
+        if versions is None or not versions.base <= since_version <= versions.version:
+            return None
+        return versions.marks[since_version - versions.base]
+
+    def trim(self, task_id: str):
+        """Forgets all but the latest version of a task, e.g. once it has ended."""
+        versions = self._tasks.get(task_id)
+        if versions is not None and len(versions.marks) > 1:
+            versions.base = versions.version
+            versions.marks = versions.marks[-1:]
+
+    async def wait_for_change(self, task_id: str, since_version: int, timeout: float):
+        """Waits up to ``timeout`` seconds for the task to get past ``since_version``."""
+        versions = self._tasks.get(task_id)
+        if versions is None or versions.version != since_version or timeout <= 0:
+            return
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(
+                versions.changed.wait(), min(timeout, MAX_WAIT_SECONDS)
+            )
+        except TimeoutError:
+            pass
+        finally:
+            self.waiting -= 1
+
+    def forget(self, task_id: str):
+        versions = self._tasks.pop(task_id, None)
+        if versions is not None:
+            versions.changed.set()
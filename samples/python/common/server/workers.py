@@ -0,0 +1,188 @@
+"""Multi-worker mode for A2AServer.
+
+The supervisor binds the listening socket once and forks the workers, which
+all accept on it. Task state must live in a store the processes share, such
+as SQLiteTaskStore. SSE events are shared through the supervisor: every
+worker is connected to it by a Unix socket pair, and the supervisor forwards
+each event a worker publishes to all the other workers, without decoding it.
+"""
+
+from common.server.sse import EncodedEvent
+from common.server.task_store import InMemoryTaskStore
+from common.types import JSONRPCError, TaskArtifactUpdateEvent, TaskStatusUpdateEvent
+import asyncio
+import json
+import logging
+import os
+import signal
+import socket
+import struct
+
+logger = logging.getLogger(__name__)
+
+# Frames are a (header length, payload length) prefix, a JSON header and the
+# event's JSON payload as already encoded for SSE.
+_PREFIX = struct.Struct(">II")
+
+RELAY_EVENT_TYPES = {
+    "status": TaskStatusUpdateEvent,
+    "artifact": TaskArtifactUpdateEvent,
+    "error": JSONRPCError,
+}
+
+
+def _event_kind(event) -> str:
+    for kind, event_type in RELAY_EVENT_TYPES.items():
+        if isinstance(event, event_type):
+            return kind
+    raise ValueError(f"Cannot relay event of type {type(event)}")
+
+
+def encode_frame(task_id: str, encoded: EncodedEvent) -> bytes:
+    header = json.dumps(
+        {"task_id": task_id, "event_id": encoded.event_id, "kind": _event_kind(encoded.event)}
+    ).encode()
+    return _PREFIX.pack(len(header), len(encoded.payload)) + header + encoded.payload
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> bytes:
+    prefix = await reader.readexactly(_PREFIX.size)
+    header_length, payload_length = _PREFIX.unpack(prefix)
+    return prefix + await reader.readexactly(header_length + payload_length)
+
+
+def decode_frame(frame: bytes):
+    header_length, _ = _PREFIX.unpack_from(frame)
+    header_end = _PREFIX.size + header_length
+    header = json.loads(frame[_PREFIX.size : header_end])
+    event_type = RELAY_EVENT_TYPES[header["kind"]]
+    event = event_type.model_validate_json(frame[header_end:])
+    return header["task_id"], header["event_id"], event
+
+
+class EventRelay:
+    """A worker's connection to the supervisor's event hub."""
+
+    def __init__(self, task_manager):
+        self.task_manager = task_manager
+        self._writer: asyncio.StreamWriter | None = None
+        self._task: asyncio.Task | None = None
+
+    async def connect(self, sock: socket.socket):
+        reader, self._writer = await asyncio.open_unix_connection(sock=sock)
+        self._task = asyncio.create_task(self._receive(reader))
+
+    def publish(self, task_id: str, encoded: EncodedEvent):
+        """Sends an event to the other workers without waiting."""
+        if self._writer is None or self._writer.is_closing():
+            return
+        self._writer.write(encode_frame(task_id, encoded))
+
+    async def _receive(self, reader: asyncio.StreamReader):
+        while True:
+            try:
+                frame = await _read_frame(reader)
+            except asyncio.IncompleteReadError:
+                return
+            try:
+                task_id, event_id, event = decode_frame(frame)
+                self.task_manager.receive_relayed_event(task_id, event, event_id)
+            except Exception as e:
+                logger.error(f"Error while receiving relayed event: {e}")
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._writer is not None:
+            self._writer.close()
+
+
+async def run_hub(socks: list[socket.socket]):
+    """Forwards every frame from one worker to all the others.
+
+    Returns once every worker has closed its end.
+    """
+    connections = [await asyncio.open_unix_connection(sock=sock) for sock in socks]
+
+    async def forward(reader: asyncio.StreamReader, source: asyncio.StreamWriter):
+        while True:
+            try:
+                frame = await _read_frame(reader)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                source.close()
+                return
+            for _, writer in connections:
+                if writer is not source and not writer.is_closing():
+                    writer.write(frame)
+
+    await asyncio.gather(*(forward(reader, writer) for reader, writer in connections))
+
+
+async def _run_worker(server, config, listen_sock: socket.socket, relay_sock: socket.socket):
+    import uvicorn
+
+    relay = EventRelay(server.task_manager)
+    await relay.connect(relay_sock)
+    server.task_manager.event_relay = relay
+    try:
+        await uvicorn.Server(config).serve(sockets=[listen_sock])
+    finally:
+        await relay.close()
+
+
+def _raise_keyboard_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def serve_workers(server, workers: int):
+    """Runs ``server`` in ``workers`` forked processes until they exit."""
+    import uvicorn
+
+    task_store = getattr(server.task_manager, "task_store", None)
+    if isinstance(task_store, InMemoryTaskStore):
+        raise ValueError(
+            "Multiple workers need a task store shared between processes, "
+            "such as SQLiteTaskStore"
+        )
+
+    config = uvicorn.Config(server.app, host=server.host, port=server.port)
+    listen_sock = config.bind_socket()
+    hub_socks, pids = [], []
+    for _ in range(workers):
+        hub_sock, worker_sock = socket.socketpair()
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                hub_sock.close()
+                for sock in hub_socks:
+                    sock.close()
+                asyncio.run(_run_worker(server, config, listen_sock, worker_sock))
+            except BaseException as e:
+                logger.error(f"Worker {os.getpid()} failed: {e!r}")
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        worker_sock.close()
+        hub_socks.append(hub_sock)
+        pids.append(pid)
+
+    logger.info(f"Started {workers} workers: {pids}")
+    listen_sock.close()
+    signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+    try:
+        asyncio.run(run_hub(hub_socks))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in pids:
+            os.waitpid(pid, 0)
@@ -2,7 +2,9 @@ from typing import Union, Any
 from pydantic import BaseModel, Field, TypeAdapter
 from typing import Literal, List, Annotated, Optional
 from datetime import datetime
-from pydantic import model_validator, ConfigDict, field_serializer
+from pydantic import model_validator, ConfigDict, field_serializer, field_validator
+from pydantic import PrivateAttr, SerializationInfo, SerializerFunctionWrapHandler
+from pydantic import ValidationInfo, model_serializer
 from uuid import uuid4
 from enum import Enum
 from typing_extensions import Self
@@ -31,8 +33,11 @@ class FileContent(BaseModel):
     uri: str | None = None
 
     @model_validator(mode="after")
-    def check_content(self) -> Self:
+    def check_content(self, info: ValidationInfo) -> Self:
         if not (self.bytes or self.uri):
+            if info.context and info.context.get("excludeArtifactBytes"):
+                # The server left the bytes out at the client's request.
+                return self
             raise ValueError("Either 'bytes' or 'uri' must be present in the file data")
         if self.bytes and self.uri:
             raise ValueError(
@@ -89,6 +94,57 @@ class Task(BaseModel):
     artifacts: List[Artifact] | None = None
     history: List[Message] | None = None
     metadata: dict[str, Any] | None = None
+    # Bumped by InMemoryTaskManager on every change; see sinceVersion.
+    version: int | None = None
+
+    @field_serializer(
+        "sessionId", "artifacts", "history", "metadata", mode="wrap"
+    )
+    def serialize_projected(
+        self, value: Any, handler: SerializerFunctionWrapHandler, info: SerializationInfo
+    ):
+        # The serialization context can project a stored task without copying
+        # it: "include" keeps only the listed fields (id, status and version
+        # are always kept), "historyFrom" and "artifactsFrom" skip the history
+        # messages and artifacts before those offsets, "historyLength" keeps
+        # only that many of the latest messages (none unless positive), and
+        # "excludeArtifactBytes" leaves the bytes of file parts out of the
+        # artifacts. "version" replaces the task's version.
+        context = info.context
+        if context is None or value is None:
+            return handler(value)
+        include = context.get("include")
+        if include is not None and info.field_name not in include:
+            return None  # dropped by serialize_included
+        if info.field_name == "history":
+            if "historyFrom" in context:
+                value = value[context["historyFrom"]:]
+            if "historyLength" in context:
+                length = context["historyLength"]
+                value = value[-length:] if length is not None and length > 0 else []
+        elif info.field_name == "artifacts" and "artifactsFrom" in context:
+            value = value[context["artifactsFrom"]:]
+        serialized = handler(value)
+        if info.field_name == "artifacts" and context.get("excludeArtifactBytes"):
+            for artifact in serialized:
+                for part in artifact["parts"]:
+                    if part.get("type") == "file":
+                        part["file"].pop("bytes", None)
+        return serialized
+
+    @model_serializer(mode="wrap")
+    def serialize_included(
+        self, handler: SerializerFunctionWrapHandler, info: SerializationInfo
+    ):
+        serialized = handler(self)
+        if info.context and "version" in info.context:
+            serialized["version"] = info.context["version"]
+        include = info.context.get("include") if info.context else None
+        if include is not None:
+            for field in ("sessionId", "artifacts", "history", "metadata"):
+                if field not in include:
+                    serialized.pop(field, None)
+        return serialized
 
 
 class TaskStatusUpdateEvent(BaseModel):
@@ -124,6 +180,22 @@ class TaskIdParams(BaseModel):
 
 class TaskQueryParams(TaskIdParams):
     historyLength: int | None = None
+    # Optional fields of the task to return; id and status always are.
+    include: (
+        List[Literal["sessionId", "status", "artifacts", "history", "metadata"]] | None
+    ) = None
+    # Return file parts of artifacts without their (often large) bytes.
+    excludeArtifactBytes: bool | None = None
+    # Return only the history messages and artifacts added after this
+    # version of the task.
+    sinceVersion: int | None = None
+    # Wait up to this long for the task to change past sinceVersion (or past
+    # its current version) before answering.
+    waitMs: int | None = None
+
+
+class TaskResubscriptionParams(TaskIdParams):
+    lastEventId: int | None = None
 
 
 class TaskSendParams(BaseModel):
@@ -163,6 +235,53 @@ class JSONRPCError(BaseModel):
 class JSONRPCResponse(JSONRPCMessage):
     result: Any | None = None
     error: JSONRPCError | None = None
+    # Passed to model_dump_json by A2AServer when writing the response. Only
+    # that wire form is projected: ``result`` stays the stored task, so an
+    # in-process caller of a handler sees it whole and must not modify it.
+    _serialization_context: dict[str, Any] | None = PrivateAttr(default=None)
+
+    def with_history_length(self, history_length: int | None) -> Self:
+        """Trims the result task's history to ``history_length`` messages when
+        the response is serialized, leaving the task itself untouched."""
+        self._serialization_context = {
+            **(self._serialization_context or {}),
+            "historyLength": history_length,
+        }
+        return self
+
+    def with_projection(
+        self,
+        params: TaskQueryParams,
+        delta_start: tuple[int, int] | None = None,
+        version: int | None = None,
+    ) -> Self:
+        """Applies the ``historyLength``, ``include`` and ``excludeArtifactBytes``
+        of a ``tasks/get`` request to the result task when the response is
+        serialized.
+
+        ``delta_start`` is the number of history messages and artifacts to
+        skip for a ``sinceVersion`` request. All the messages added since
+        are returned then, unless ``historyLength`` says otherwise.
+        ``version``, if given, is written as the task's version.
+        """
+        if version is not None:
+            self._serialization_context = {
+                **(self._serialization_context or {}),
+                "version": version,
+            }
+        if delta_start is not None:
+            self._serialization_context = {
+                **(self._serialization_context or {}),
+                "historyFrom": delta_start[0],
+                "artifactsFrom": delta_start[1],
+            }
+        if delta_start is None or params.historyLength is not None:
+            self.with_history_length(params.historyLength)
+        if params.include is not None:
+            self._serialization_context["include"] = frozenset(params.include)
+        if params.excludeArtifactBytes:
+            self._serialization_context["excludeArtifactBytes"] = True
+        return self
 
 
 class SendTaskRequest(JSONRPCRequest):
@@ -221,7 +340,16 @@ class GetTaskPushNotificationResponse(JSONRPCResponse):
 
 class TaskResubscriptionRequest(JSONRPCRequest):
     method: Literal["tasks/resubscribe",] = "tasks/resubscribe"
-    params: TaskIdParams
+    params: TaskResubscriptionParams
+
+    @field_validator("params", mode="before")
+    @classmethod
+    def accept_task_id_params(cls, value: Any) -> Any:
+        if isinstance(value, TaskIdParams) and not isinstance(
+            value, TaskResubscriptionParams
+        ):
+            return value.model_dump()
+        return value
 
 
 A2ARequest = TypeAdapter(
@@ -302,6 +430,12 @@ class ContentTypeNotSupportedError(JSONRPCError):
     data: None = None
 
 
+class ServerBusyError(JSONRPCError):
+    code: int = -32006
+    message: str = "Server is busy, retry later"
+    data: Any | None = None
+
+
 class AgentProvider(BaseModel):
     organization: str
     url: str | None = None
@@ -0,0 +1,53 @@
+"""Process-wide metric primitives.
+
+Kept apart from ``common.server`` so that client-side modules such as
+``common.utils.push_notification_auth`` can record metrics without importing
+the server.
+"""
+
+from bisect import bisect_left
+from collections.abc import Iterable
+
+# Upper bounds, in seconds, in a 1-2.5-5 progression from 100us to a minute:
+# three buckets per decade keep quantile estimates within a factor of ~2.5
+# at any scale, like an HDR histogram, for a fixed and tiny memory cost.
+DEFAULT_LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0,
+    10.0, 30.0, 60.0,
+)
+
+
+class Histogram:
+    """A fixed-bucket histogram, cumulative like Prometheus' ``le`` buckets.
+
+    ``observe`` is a bisect and two additions, cheap enough for every request.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # One counter per bucket, plus the overflow bucket (+Inf).
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self._counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict[str, float | int | dict[str, int]]:
+        cumulative, total = {}, 0
+        for bound, count in zip(self.buckets, self._counts):
+            total += count
+            cumulative[repr(bound)] = total
+        cumulative["+Inf"] = self.count
+        return {"buckets": cumulative, "count": self.count, "sum": self.sum}
+
+
+# Delivery time of push notifications by outcome, shared by every sender in
+# the process and reported by A2AServer's /metrics endpoint.
+PUSH_NOTIFICATION_LATENCY = {"success": Histogram(), "failure": Histogram()}
@@ -4,6 +4,7 @@ from starlette.responses import JSONResponse
 from starlette.requests import Request
 from typing import Any
 
+import asyncio
 import jwt
 import time
 import json
@@ -12,6 +13,8 @@ import httpx
 import logging
 
 from jwt import PyJWK, PyJWKClient
+from common.utils.metrics import PUSH_NOTIFICATION_LATENCY
+from common.utils.tracing import span
 
 logger = logging.getLogger(__name__)
 AUTH_HEADER_PREFIX = 'Bearer '
@@ -86,17 +89,24 @@ class PushNotificationSenderAuth(PushNotificationAuth):
     async def send_push_notification(self, url: str, data: dict[str, Any]):
         jwt_token = self._generate_jwt(data)
         headers = {'Authorization': f"Bearer {jwt_token}"}
-        async with httpx.AsyncClient(timeout=10) as client: 
-            try:
-                response = await client.post(
-                    url,
-                    json=data,
-                    headers=headers
-                )
-                response.raise_for_status()
-                logger.info(f"Push-notification sent for URL: {url}")                            
-            except Exception as e:
-                logger.warning(f"Error during sending push-notification for URL {url}: {e}")
+        started = time.perf_counter()
+        outcome = "failure"
+        with span("push.deliver", url=url) as delivery:
+            async with httpx.AsyncClient(timeout=10) as client: 
+                try:
+                    response = await client.post(
+                        url,
+                        json=data,
+                        headers=headers
+                    )
+                    response.raise_for_status()
+                    outcome = "success"
+                    logger.info(f"Push-notification sent for URL: {url}")                            
+                except Exception as e:
+                    logger.warning(f"Error during sending push-notification for URL {url}: {e}")
+                finally:
+                    delivery.set_attribute("outcome", outcome)
+                    PUSH_NOTIFICATION_LATENCY[outcome].observe(time.perf_counter() - started)
 
 class PushNotificationReceiverAuth(PushNotificationAuth):
     def __init__(self):
@@ -113,7 +123,10 @@ class PushNotificationReceiverAuth(PushNotificationAuth):
             return False
         
         token = auth_header[len(AUTH_HEADER_PREFIX):]
-        signing_key = self.jwks_client.get_signing_key_from_jwt(token)
+        # Fetching the JWKS is blocking network I/O; keep it off the loop.
+        signing_key = await asyncio.to_thread(
+            self.jwks_client.get_signing_key_from_jwt, token
+        )
 
         decode_token = jwt.decode(
             token,
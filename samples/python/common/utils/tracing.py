@@ -0,0 +1,243 @@
+"""Lightweight in-process tracing.
+
+Code marks the stages it wants timed with ``span``::
+
+    with span("tool.get_exchange_rate", currency="EUR") as s:
+        rate = fetch_rate()
+        s.set_attribute("rate", rate)
+
+Spans nest through a context variable, so a span opened inside another one
+(even in a task or an AgentRunner thread started from it) records it as its
+parent, and all the spans of one request share a trace id. Finished spans go
+to the configured exporters: an in-memory ring buffer, which A2AServer
+serves at ``/debug/traces``, and/or a local JSONL file. Until
+``configure_tracing`` is called, ``span`` returns a no-op and costs next to
+nothing.
+"""
+
+from collections import deque
+from collections.abc import Callable
+from pydantic import BaseModel
+from typing import Any
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class TracingPolicy(BaseModel):
+    """Where finished spans are exported."""
+
+    ring_buffer_size: int | None = 10_000
+    jsonl_path: str | None = None
+
+
+class Span:
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "start_time",
+        "duration",
+        "attributes",
+        "error",
+        "_started",
+    )
+
+    def __init__(self, name: str, parent: "Span | None", attributes: dict[str, Any]):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent.span_id if parent else None
+        self.start_time = time.time()
+        self.duration: float | None = None
+        self.attributes = attributes
+        self.error: str | None = None
+        self._started = time.perf_counter()
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration_ms": self.duration * 1000 if self.duration is not None else None,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar(
+    "a2a_current_span", default=None
+)
+
+
+class RingBufferExporter:
+    """Keeps the most recent ``capacity`` spans in memory."""
+
+    def __init__(self, capacity: int):
+        self._spans: deque[Span] = deque(maxlen=capacity)
+
+    def export(self, span: Span):
+        # deque.append is atomic, so spans finished on agent threads are safe.
+        self._spans.append(span)
+
+    def spans(self, trace_id: str | None = None, limit: int | None = None) -> list[dict]:
+        spans = [
+            span for span in list(self._spans)
+            if trace_id is None or span.trace_id == trace_id
+        ]
+        if limit is not None:
+            spans = spans[-limit:]
+        return [span.to_dict() for span in spans]
+
+    def close(self):
+        pass
+
+
+class JsonlExporter:
+    """Appends one JSON object per finished span to a local file."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "a", buffering=1, encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), default=str) + "\n"
+        with self._lock:
+            self._file.write(line)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class _SpanContext:
+    __slots__ = ("_tracer", "_name", "_attributes", "_span", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: dict[str, Any]):
+        self._tracer = tracer
+        self._name = name
+        self._attributes = attributes
+
+    def __enter__(self) -> Span:
+        self._span = Span(self._name, _current_span.get(), self._attributes)
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb):
+        span = self._span
+        span.duration = time.perf_counter() - span._started
+        if exc is not None:
+            span.error = f"{exc_type.__name__}: {exc}"
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Exited in another context, e.g. an async generator closed by
+            # the event loop; the span is still recorded.
+            pass
+        self._tracer.export(span)
+        return None
+
+
+class Tracer:
+    def __init__(self):
+        self.ring_buffer: RingBufferExporter | None = None
+        self.exporters: list[RingBufferExporter | JsonlExporter] = []
+
+    def configure(self, policy: TracingPolicy | None):
+        self.close()
+        self.ring_buffer = None
+        self.exporters = []
+        if policy is None:
+            return
+        if policy.ring_buffer_size:
+            self.ring_buffer = RingBufferExporter(policy.ring_buffer_size)
+            self.exporters.append(self.ring_buffer)
+        if policy.jsonl_path:
+            self.exporters.append(JsonlExporter(policy.jsonl_path))
+
+    def span(self, name: str, attributes: dict[str, Any]) -> _SpanContext | _NoopSpan:
+        if not self.exporters:
+            return _NOOP_SPAN
+        return _SpanContext(self, name, attributes)
+
+    def export(self, span: Span):
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                logger.warning(f"Error exporting span {span.name}: {e}")
+
+    def close(self):
+        for exporter in self.exporters:
+            exporter.close()
+
+
+tracer = Tracer()
+
+
+def configure_tracing(policy: TracingPolicy | None) -> Tracer:
+    """Sets up the process-wide tracer; None turns tracing off."""
+    tracer.configure(policy)
+    return tracer
+
+
+def span(name: str, **attributes: Any) -> _SpanContext | _NoopSpan:
+    """Times the enclosed block as a span named ``name``."""
+    return tracer.span(name, attributes)
+
+
+def current_span() -> Span | _NoopSpan:
+    """The innermost open span, or a no-op one, to add attributes to."""
+    return _current_span.get() or _NOOP_SPAN
+
+
+def traced(name: str | None = None) -> Callable:
+    """Decorator recording each call of a function, sync or async, as a span."""
+
+    def decorator(fn: Callable) -> Callable:
+        span_name = name or fn.__qualname__
+
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,105 @@
+"""History projection benchmark: copying the task vs. trimming it on serialization.
+
+Answers ``tasks/get`` for a stored task with a 1,000-message history, for
+several ``historyLength`` values, the way ``InMemoryTaskManager`` did
+(``model_copy`` plus a sliced history) and the way it does now (the stored
+task itself, trimmed by the serializer through ``with_history_length``).
+Reports the time per call and, from tracemalloc, the bytes allocated per
+call beyond the JSON response itself (the ``model_dump_json`` output is the
+same for both and is subtracted).
+
+Run from ``samples/python``::
+
+    PYTHONPATH=. python ../../tests/benchmarks/bench_history_projection.py
+"""
+
+import argparse
+import statistics
+import time
+import tracemalloc
+
+from common.types import (
+    GetTaskResponse,
+    Message,
+    Task,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+
+
+def make_task(history_size):
+    return Task(
+        id="task",
+        sessionId="session",
+        status=TaskStatus(state=TaskState.WORKING),
+        history=[
+            Message(
+                role="user" if i % 2 == 0 else "agent",
+                parts=[TextPart(text=f"message {i} " + "lorem ipsum " * 8)],
+            )
+            for i in range(history_size)
+        ],
+    )
+
+
+def copying(task, history_length):
+    result = task.model_copy()
+    if history_length is not None and history_length > 0:
+        result.history = result.history[-history_length:]
+    else:
+        result.history = []
+    response = GetTaskResponse(id=1, result=result)
+    return response.model_dump_json(exclude_none=True)
+
+
+def projected(task, history_length):
+    response = GetTaskResponse(id=1, result=task).with_history_length(history_length)
+    return response.model_dump_json(
+        exclude_none=True, context=response._serialization_context
+    )
+
+
+def allocated_bytes(path, task, history_length):
+    """Peak bytes allocated by one call, minus the JSON string it returns."""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    body = path(task, history_length)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - baseline - len(body), len(body)
+
+
+def timed(path, task, history_length, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        path(task, history_length)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    task = make_task(args.history)
+    assert copying(task, 10) == projected(task, 10)
+
+    print(f"{'historyLength':<14} {'path':<10} {'time':>12} {'extra alloc':>14} {'response':>12}")
+    for history_length in (None, 10, 100, args.history):
+        for label, path in (("copy", copying), ("projected", projected)):
+            path(task, history_length)  # warm up
+            seconds = timed(path, task, history_length, args.iterations)
+            extra, body = allocated_bytes(path, task, history_length)
+            print(
+                f"{str(history_length):<14} {label:<10} {seconds * 1e6:>9.1f} us "
+                f"{extra:>12,} B {body:>10,} B"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""JSON-RPC pipeline benchmark: dict round-trips vs. the bytes fast path.
+
+Times each stage of handling a request, in process and without HTTP:
+
+* ``parse``: ``json.loads`` + ``A2ARequest.validate_python`` (the old path)
+  vs. ``A2ARequest.validate_json`` on the raw body;
+* ``dispatch``: the ``isinstance`` chain vs. the ``METHOD_HANDLERS`` table;
+* ``serialize``: ``model_dump`` + ``JSONResponse`` (a second ``json.dumps``)
+  vs. a ``Response`` holding ``model_dump_json`` bytes.
+
+A small ``tasks/get`` round trip and a large ``tasks/send`` carrying a
+multi-MB artifact are measured.
+
+Run from ``samples/python``::
+
+    PYTHONPATH=. python ../../tests/benchmarks/bench_jsonrpc_pipeline.py
+
+With multi-MB payloads glibc hands every buffer back to the OS, so each
+iteration also pays for page-faulting fresh memory, which can hide the
+difference. A long-running server keeps its arena warm; to measure that,
+raise the mmap threshold::
+
+    MALLOC_MMAP_THRESHOLD_=1000000000 PYTHONPATH=. python \
+        ../../tests/benchmarks/bench_jsonrpc_pipeline.py
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from starlette.responses import JSONResponse
+
+from common.server.server import METHOD_HANDLERS, _json_response
+from common.types import (
+    A2ARequest,
+    Artifact,
+    CancelTaskRequest,
+    GetTaskPushNotificationRequest,
+    GetTaskRequest,
+    GetTaskResponse,
+    Message,
+    SendTaskRequest,
+    SendTaskResponse,
+    SendTaskStreamingRequest,
+    SetTaskPushNotificationRequest,
+    Task,
+    TaskResubscriptionRequest,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+
+
+class Handlers:
+    """Stands in for a TaskManager: every handler returns a canned response."""
+
+    def __init__(self, response):
+        self.response = response
+        for name in METHOD_HANDLERS.values():
+            setattr(self, name, self.handle)
+
+    def handle(self, request):
+        return self.response
+
+
+def legacy_dispatch(handlers, request):
+    if isinstance(request, GetTaskRequest):
+        return handlers.on_get_task(request)
+    elif isinstance(request, SendTaskRequest):
+        return handlers.on_send_task(request)
+    elif isinstance(request, SendTaskStreamingRequest):
+        return handlers.on_send_task_subscribe(request)
+    elif isinstance(request, CancelTaskRequest):
+        return handlers.on_cancel_task(request)
+    elif isinstance(request, SetTaskPushNotificationRequest):
+        return handlers.on_set_task_push_notification(request)
+    elif isinstance(request, GetTaskPushNotificationRequest):
+        return handlers.on_get_task_push_notification(request)
+    elif isinstance(request, TaskResubscriptionRequest):
+        return handlers.on_resubscribe_to_task(request)
+    raise ValueError(f"Unexpected request type: {type(request)}")
+
+
+def legacy(handlers, body):
+    stages = []
+    start = time.perf_counter()
+    request = A2ARequest.validate_python(json.loads(body))
+    stages.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    result = legacy_dispatch(handlers, request)
+    stages.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    JSONResponse(result.model_dump(exclude_none=True))
+    stages.append(time.perf_counter() - start)
+    return stages
+
+
+def fast_path(handlers, body):
+    stages = []
+    start = time.perf_counter()
+    request = A2ARequest.validate_json(body)
+    stages.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    result = getattr(handlers, METHOD_HANDLERS[request.method])(request)
+    stages.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    _json_response(result)
+    stages.append(time.perf_counter() - start)
+    return stages
+
+
+def make_task(artifact_size):
+    artifacts = None
+    if artifact_size:
+        artifacts = [Artifact(parts=[TextPart(text="x" * artifact_size)])]
+    return Task(
+        id="task",
+        status=TaskStatus(state=TaskState.COMPLETED),
+        artifacts=artifacts,
+        history=[Message(role="user", parts=[TextPart(text="hello")])],
+    )
+
+
+def scenarios(large_size):
+    small_body = GetTaskRequest(id=1, params={"id": "task"}).model_dump_json().encode()
+    small_response = GetTaskResponse(id=1, result=make_task(0))
+
+    large_body = (
+        SendTaskRequest(
+            id=1,
+            params={
+                "id": "task",
+                "message": Message(role="user", parts=[TextPart(text="y" * large_size)]),
+            },
+        )
+        .model_dump_json()
+        .encode()
+    )
+    large_response = SendTaskResponse(id=1, result=make_task(large_size))
+    return {
+        "small": (small_body, small_response),
+        f"large ({large_size / 1e6:.0f} MB)": (large_body, large_response),
+    }
+
+
+def measure(pipeline, handlers, body, iterations):
+    runs = [pipeline(handlers, body) for _ in range(iterations)]
+    return [statistics.median(stage) for stage in zip(*runs)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--large-size", type=int, default=4_000_000)
+    args = parser.parse_args()
+
+    header = f"{'payload':<14} {'pipeline':<10} {'parse':>12} {'dispatch':>12} {'serialize':>12} {'total':>12}"
+    print(header)
+    for name, (body, response) in scenarios(args.large_size).items():
+        handlers = Handlers(response)
+        iterations = args.iterations if name == "small" else max(args.iterations // 20, 5)
+        for label, pipeline in (("legacy", legacy), ("fast", fast_path)):
+            stages = measure(pipeline, handlers, body, iterations)
+            cells = " ".join(f"{stage * 1e6:>9.1f} us" for stage in stages + [sum(stages)])
+            print(f"{name:<14} {label:<10} {cells}")
+
+
+if __name__ == "__main__":
+    main()
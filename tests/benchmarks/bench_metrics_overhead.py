@@ -0,0 +1,116 @@
+"""Metrics overhead benchmark: A2AServer with and without ``metrics=True``.
+
+Drives the ASGI app directly (no sockets, no HTTP client) with ``tasks/get``
+requests, the cheapest method and so the one where instrumentation weighs
+the most, and reports the median time per request for both servers. It also
+times ``Histogram.observe`` on its own and renders one ``/metrics`` scrape.
+
+Run from ``samples/python``::
+
+    PYTHONPATH=. python ../../tests/benchmarks/bench_metrics_overhead.py
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from common.server import A2AServer, InMemoryTaskManager
+from common.server.metrics import Histogram
+from common.types import Message, TaskSendParams, TextPart
+
+
+class NullTaskManager(InMemoryTaskManager):
+    async def on_send_task(self, request):
+        raise NotImplementedError
+
+    async def on_send_task_subscribe(self, request):
+        raise NotImplementedError
+
+
+def make_scope(method, path):
+    return {
+        "type": "http",
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("127.0.0.1", 5000),
+    }
+
+
+async def call(app, method, path, body=b""):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(make_scope(method, path), receive, send)
+    return b"".join(message.get("body", b"") for message in sent[1:])
+
+
+async def make_server(metrics):
+    task_manager = NullTaskManager()
+    await task_manager.upsert_task(
+        TaskSendParams(id="task", message=Message(role="user", parts=[TextPart(text="hi")]))
+    )
+    return A2AServer(task_manager=task_manager, metrics=metrics)
+
+
+async def time_requests(server, iterations):
+    body = b'{"jsonrpc":"2.0","id":1,"method":"tasks/get","params":{"id":"task"}}'
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await call(server.app, "POST", "/", body)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    servers = {"off": await make_server(False), "on": await make_server(True)}
+    for server in servers.values():
+        await time_requests(server, 500)  # warm up
+
+    # Interleave rounds so drift (CPU frequency, GC) hits both servers alike.
+    medians = {label: [] for label in servers}
+    for _ in range(args.rounds):
+        for label, server in servers.items():
+            medians[label].append(await time_requests(server, args.iterations))
+    off = statistics.median(medians["off"])
+    on = statistics.median(medians["on"])
+    print(f"{'metrics':<10} {'per request':>14}")
+    print(f"{'off':<10} {off * 1e6:>11.2f} us")
+    print(f"{'on':<10} {on * 1e6:>11.2f} us")
+    print(f"overhead: {(on - off) * 1e6:.2f} us ({(on - off) / off:+.1%})")
+
+    histogram = Histogram()
+    values = [i * 1e-5 for i in range(100_000)]
+    start = time.perf_counter()
+    for value in values:
+        histogram.observe(value)
+    print(f"Histogram.observe: {(time.perf_counter() - start) / len(values) * 1e9:.0f} ns")
+
+    start = time.perf_counter()
+    scrape = await call(servers["on"].app, "GET", "/metrics")
+    print(
+        f"/metrics scrape: {(time.perf_counter() - start) * 1e3:.2f} ms, "
+        f"{len(scrape)} bytes"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,115 @@
+"""SSE fan-out benchmark: per-subscriber serialization vs. serialize-once frames.
+
+One task streams status and artifact updates to N subscribers. For every
+subscriber count the CPU time spent per event is measured for:
+
+* ``per-subscriber``: each subscriber's response is validated and dumped with
+  ``model_dump_json``, as ``A2AServer`` did before events were pre-encoded;
+* ``serialize-once``: ``InMemoryTaskManager`` encodes each event once and
+  every subscriber only splices its request id into the shared frame.
+
+Run from ``samples/python``::
+
+    PYTHONPATH=. python ../../tests/benchmarks/bench_sse_fanout.py
+"""
+
+import argparse
+import asyncio
+import time
+
+from common.server.sse import StreamingEventResponse
+from common.server.task_manager import InMemoryTaskManager
+from common.types import (
+    Artifact,
+    SendTaskStreamingResponse,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+
+
+class BenchTaskManager(InMemoryTaskManager):
+    async def on_send_task(self, request):
+        pass
+
+    async def on_send_task_subscribe(self, request):
+        pass
+
+
+def make_events(num_events, payload_size):
+    text = "x" * payload_size
+    events = []
+    for i in range(num_events):
+        if i % 2:
+            events.append(
+                TaskArtifactUpdateEvent(
+                    id="task", artifact=Artifact(parts=[TextPart(text=text)], index=i)
+                )
+            )
+        else:
+            events.append(
+                TaskStatusUpdateEvent(
+                    id="task", status=TaskStatus(state=TaskState.WORKING)
+                )
+            )
+    return events
+
+
+async def drain(task_manager, request_id, queue, num_events, serialize_once):
+    stream = task_manager.dequeue_events_for_sse(request_id, "task", queue)
+    for _ in range(num_events):
+        response = await anext(stream)
+        if serialize_once:
+            response.sse_frame()
+        else:
+            # The pre-change path: a validated response per subscriber,
+            # dumped to JSON per subscriber.
+            SendTaskStreamingResponse(
+                id=request_id, result=response.result
+            ).model_dump_json(exclude_none=True)
+    await stream.aclose()
+
+
+async def run(subscribers, events, serialize_once):
+    task_manager = BenchTaskManager(sse_queue_size=len(events) + 1)
+    queues = [await task_manager.setup_sse_consumer("task") for _ in range(subscribers)]
+
+    start = time.process_time()
+    for event in events:
+        await task_manager.enqueue_events_for_sse("task", event)
+    await asyncio.gather(
+        *(
+            drain(task_manager, str(i), queue, len(events), serialize_once)
+            for i, queue in enumerate(queues)
+        )
+    )
+    return (time.process_time() - start) / len(events)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--payload-size", type=int, default=2048)
+    parser.add_argument(
+        "--subscribers", type=int, nargs="+", default=[1, 10, 100, 500]
+    )
+    args = parser.parse_args()
+
+    events = make_events(args.events, args.payload_size)
+    # StreamingEventResponse is what both modes dequeue; warm up its schema.
+    StreamingEventResponse.for_event("0", events[0])
+
+    print(f"{'subscribers':>11} {'per-subscriber':>16} {'serialize-once':>16} {'speedup':>8}")
+    for subscribers in args.subscribers:
+        before = asyncio.run(run(subscribers, events, serialize_once=False))
+        after = asyncio.run(run(subscribers, events, serialize_once=True))
+        print(
+            f"{subscribers:>11} {before * 1e6:>13.1f} us {after * 1e6:>13.1f} us"
+            f" {before / after:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
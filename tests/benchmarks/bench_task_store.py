@@ -0,0 +1,120 @@
+"""Contention benchmark: single global lock vs. the lock-free InMemoryTaskStore.
+
+Runs 1k tasks concurrently. Each task streams status updates while pollers
+hammer ``tasks/get``. None of the in-memory store's methods yield to the event
+loop, so it needs no lock; the single-lock store shows what that saves.
+
+Run from ``samples/python``::
+
+    PYTHONPATH=. python ../../tests/benchmarks/bench_task_store.py
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from common.server.task_store import InMemoryTaskStore
+from common.types import (
+    Message,
+    Task,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+
+
+class SingleLockStore:
+    """The original behaviour: one asyncio.Lock for every read and write."""
+
+    def __init__(self):
+        self.tasks: dict[str, Task] = {}
+        self.lock = asyncio.Lock()
+
+    async def upsert_task(self, params: TaskSendParams) -> Task:
+        async with self.lock:
+            task = Task(
+                id=params.id,
+                sessionId=params.sessionId,
+                status=TaskStatus(state=TaskState.SUBMITTED),
+                history=[params.message],
+            )
+            self.tasks[params.id] = task
+            return task
+
+    async def update_task(self, task_id, status, artifacts):
+        async with self.lock:
+            task = self.tasks[task_id]
+            task.status = status
+            if status.message is not None:
+                task.history.append(status.message)
+            return task
+
+    async def read(self, task_id):
+        async with self.lock:
+            return self.tasks[task_id].model_copy()
+
+
+class LockFreeStore(InMemoryTaskStore):
+    async def read(self, task_id):
+        return (await self.get_task(task_id)).model_copy()
+
+
+async def run(store, num_tasks, updates, polls):
+    message = Message(role="agent", parts=[TextPart(text="working")])
+    ids = [f"task-{i}" for i in range(num_tasks)]
+    for task_id in ids:
+        await store.upsert_task(
+            TaskSendParams(
+                id=task_id, message=Message(role="user", parts=[TextPart(text="hi")])
+            )
+        )
+
+    read_latencies: list[float] = []
+
+    async def writer(task_id):
+        for _ in range(updates):
+            await store.update_task(
+                task_id,
+                TaskStatus(state=TaskState.WORKING, message=message),
+                None,
+            )
+
+    async def poller(task_id):
+        for _ in range(polls):
+            start = time.perf_counter()
+            await store.read(task_id)
+            read_latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(writer(i) for i in ids), *(poller(i) for i in ids))
+    elapsed = time.perf_counter() - start
+
+    read_latencies.sort()
+    return {
+        "elapsed_s": elapsed,
+        "read_p50_us": statistics.median(read_latencies) * 1e6,
+        "read_p99_us": read_latencies[int(len(read_latencies) * 0.99)] * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--updates", type=int, default=10)
+    parser.add_argument("--polls", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'store':<12} {'elapsed s':>10} {'get p50 us':>12} {'get p99 us':>12}")
+    for name, factory in (("single-lock", SingleLockStore), ("lock-free", LockFreeStore)):
+        result = asyncio.run(run(factory(), args.tasks, args.updates, args.polls))
+        print(
+            f"{name:<12} {result['elapsed_s']:>10.3f} "
+            f"{result['read_p50_us']:>12.1f} {result['read_p99_us']:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
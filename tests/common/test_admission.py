@@ -0,0 +1,58 @@
+import asyncio
+import unittest
+from common.server.admission import AdmissionRejected, ConcurrencyLimiter
+from common.server.metrics import Histogram
+
+
+class TestHistogram(unittest.TestCase):
+    def test_buckets_are_cumulative(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot["buckets"], {"0.1": 2, "1.0": 3, "+Inf": 4})
+        self.assertEqual(snapshot["count"], 4)
+        self.assertAlmostEqual(snapshot["sum"], 2.65)
+
+
+class TestConcurrencyLimiter(unittest.IsolatedAsyncioTestCase):
+    async def test_queue_is_fifo_and_bounded(self):
+        limiter = ConcurrencyLimiter(max_concurrent=1, max_queued=2, retry_after=3)
+        await limiter.acquire()
+        order = []
+
+        async def wait(name):
+            await limiter.acquire()
+            order.append(name)
+
+        waiters = [asyncio.create_task(wait(name)) for name in ("a", "b")]
+        await asyncio.sleep(0)
+        with self.assertRaises(AdmissionRejected) as rejected:
+            await limiter.acquire()
+        self.assertEqual(rejected.exception.retry_after, 3)
+
+        limiter.release()
+        await asyncio.sleep(0)
+        limiter.release()
+        await asyncio.gather(*waiters)
+        self.assertEqual(order, ["a", "b"])
+
+        stats = limiter.stats()
+        self.assertEqual(
+            (stats["running"], stats["queued"], stats["admitted"], stats["rejected"]),
+            (1, 0, 3, 1),
+        )
+        self.assertEqual(stats["queue_wait_seconds"]["count"], 3)
+
+    async def test_cancelled_waiter_leaves_the_queue(self):
+        limiter = ConcurrencyLimiter(max_concurrent=1, max_queued=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+
+        self.assertEqual(limiter.stats()["queued"], 0)
+        limiter.release()
+        self.assertEqual(limiter.running, 0)
@@ -0,0 +1,115 @@
+import asyncio
+import contextvars
+import threading
+import time
+import unittest
+from common.server.agent_runner import AgentRunner
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+class TestAgentRunner(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.runner = AgentRunner(max_workers=1)
+
+    async def asyncTearDown(self):
+        self.runner.shutdown()
+
+    async def test_sync_call_does_not_block_the_loop(self):
+        started = threading.Event()
+
+        def slow_invoke(query):
+            started.set()
+            time.sleep(0.2)
+            return f"answer to {query}"
+
+        call = asyncio.create_task(self.runner.run(slow_invoke, "q"))
+        # The loop keeps serving other work while the agent runs.
+        ticks = 0
+        while not call.done():
+            await asyncio.sleep(0.01)
+            ticks += 1
+        self.assertTrue(started.is_set())
+        self.assertGreater(ticks, 5)
+        self.assertEqual(await call, "answer to q")
+
+    async def test_async_call_runs_on_the_loop(self):
+        async def ainvoke():
+            return threading.current_thread()
+
+        self.assertIs(await self.runner.run(ainvoke), threading.current_thread())
+
+    async def test_queue_depth(self):
+        release = threading.Event()
+        calls = [
+            asyncio.create_task(self.runner.run(release.wait)) for _ in range(3)
+        ]
+        await asyncio.sleep(0.05)
+        stats = self.runner.stats()
+        self.assertEqual((stats["running"], stats["queued"]), (1, 2))
+
+        release.set()
+        await asyncio.gather(*calls)
+        stats = self.runner.stats()
+        self.assertEqual((stats["running"], stats["queued"], stats["completed"]), (0, 0, 3))
+
+    async def test_cancelled_call_leaves_the_queue(self):
+        release = threading.Event()
+        running = asyncio.create_task(self.runner.run(release.wait))
+        queued = asyncio.create_task(self.runner.run(release.wait))
+        await asyncio.sleep(0.05)
+
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        stats = self.runner.stats()
+        self.assertEqual((stats["running"], stats["queued"]), (1, 0))
+
+        release.set()
+        await running
+        self.assertEqual(self.runner.stats()["completed"], 1)
+
+    async def test_counters_under_concurrency(self):
+        runner = AgentRunner(max_workers=8)
+        try:
+            await asyncio.gather(*(runner.run(time.sleep, 0) for _ in range(500)))
+            stats = runner.stats()
+            self.assertEqual(
+                (stats["running"], stats["queued"], stats["completed"]), (0, 0, 500)
+            )
+        finally:
+            runner.shutdown()
+
+    async def test_cancelled_running_call_is_counted_until_it_returns(self):
+        release = threading.Event()
+        running = asyncio.create_task(self.runner.run(release.wait))
+        await asyncio.sleep(0.05)
+
+        running.cancel()
+        await asyncio.gather(running, return_exceptions=True)
+        self.assertEqual(self.runner.stats()["running"], 1)
+
+        release.set()
+        self.runner.shutdown(wait=True)
+        stats = self.runner.stats()
+        self.assertEqual((stats["running"], stats["queued"], stats["completed"]), (0, 0, 1))
+
+    async def test_context_is_propagated(self):
+        request_id.set("abc")
+        self.assertEqual(await self.runner.run(request_id.get), "abc")
+
+    async def test_iterate_sync_and_async(self):
+        def sync_stream(n):
+            for i in range(n):
+                yield threading.current_thread().name.startswith("a2a-agent"), i
+
+        async def async_stream(n):
+            for i in range(n):
+                yield i
+
+        self.assertEqual(
+            [item async for item in self.runner.iterate(sync_stream, 3)],
+            [(True, 0), (True, 1), (True, 2)],
+        )
+        self.assertEqual(
+            [item async for item in self.runner.iterate(async_stream, 3)], [0, 1, 2]
+        )
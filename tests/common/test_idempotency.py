@@ -0,0 +1,108 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+from common.server.idempotency import IdempotencyPolicy, SendDeduplicator
+from common.types import (
+    InternalError,
+    Message,
+    SendTaskRequest,
+    SendTaskResponse,
+    Task,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+
+
+def send(request_id, task_id="task", text="hello"):
+    return SendTaskRequest(
+        id=request_id,
+        params=TaskSendParams(
+            id=task_id, message=Message(role="user", parts=[TextPart(text=text)])
+        ),
+    )
+
+
+class TestSendDeduplicator(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.deduplicator = SendDeduplicator(IdempotencyPolicy(ttl_seconds=10))
+        self.calls = []
+        self.release = asyncio.Event()
+        self.fail = False
+
+    async def handler(self, request):
+        self.calls.append(request.id)
+        await self.release.wait()
+        if self.fail:
+            return SendTaskResponse(id=request.id, error=InternalError())
+        task = Task(id=request.params.id, status=TaskStatus(state=TaskState.COMPLETED))
+        return SendTaskResponse(id=request.id, result=task)
+
+    async def test_retry_joins_the_running_send(self):
+        first = asyncio.create_task(self.deduplicator.run(send(1), self.handler))
+        await asyncio.sleep(0)
+        retry = asyncio.create_task(self.deduplicator.run(send(2), self.handler))
+        other = asyncio.create_task(self.deduplicator.run(send(3, text="bye"), self.handler))
+        await asyncio.sleep(0)
+        self.release.set()
+
+        responses = await asyncio.gather(first, retry, other)
+        self.assertEqual([response.id for response in responses], [1, 2, 3])
+        self.assertEqual(responses[0].result, responses[1].result)
+        self.assertIsNot(responses[0].result, responses[1].result)
+        self.assertEqual(self.calls, [1, 3])
+        self.assertEqual(self.deduplicator.stats()["joined"], 1)
+
+    async def test_caller_going_away_leaves_the_run_for_the_retry(self):
+        first = asyncio.create_task(self.deduplicator.run(send(1), self.handler))
+        await asyncio.sleep(0)
+        first.cancel()
+        retry = asyncio.create_task(self.deduplicator.run(send(2), self.handler))
+        await asyncio.sleep(0)
+        self.release.set()
+
+        self.assertEqual((await retry).id, 2)
+        self.assertEqual(self.calls, [1])
+
+    async def test_completed_send_is_cached_until_it_expires(self):
+        self.release.set()
+        await self.deduplicator.run(send(1), self.handler)
+        response = await self.deduplicator.run(send(2), self.handler)
+        self.assertEqual(response.id, 2)
+        self.assertEqual(self.calls, [1])
+        self.assertEqual(self.deduplicator.stats()["cache_hits"], 1)
+
+        with patch("common.server.idempotency.time.monotonic", return_value=1e12):
+            await self.deduplicator.run(send(3), self.handler)
+        self.assertEqual(self.calls, [1, 3])
+
+    async def test_cache_keeps_its_own_copy(self):
+        task = Task(id="task", status=TaskStatus(state=TaskState.COMPLETED))
+
+        async def handler(request):
+            return SendTaskResponse(id=request.id, result=task)
+
+        first = await self.deduplicator.run(send(1), handler)
+        first.result.status.state = TaskState.FAILED
+        task.status.state = TaskState.WORKING
+        response = await self.deduplicator.run(send(2), handler)
+        self.assertEqual(response.result.status.state, TaskState.COMPLETED)
+
+    async def test_errors_are_not_cached(self):
+        self.release.set()
+        self.fail = True
+        await self.deduplicator.run(send(1), self.handler)
+        self.fail = False
+        response = await self.deduplicator.run(send(2), self.handler)
+        self.assertIsNone(response.error)
+        self.assertEqual(self.calls, [1, 2])
+
+    async def test_cache_is_bounded(self):
+        self.deduplicator.policy.max_entries = 2
+        self.release.set()
+        for i in range(3):
+            await self.deduplicator.run(send(i, text=f"message {i}"), self.handler)
+        self.assertEqual(self.deduplicator.stats()["cached"], 2)
+        await self.deduplicator.run(send(9, text="message 0"), self.handler)
+        self.assertEqual(self.calls, [0, 1, 2, 9])
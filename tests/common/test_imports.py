@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+import unittest
+import common
+
+# The directory holding the ``common`` package, for the child interpreters.
+SAMPLES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(common.__file__)))
+
+
+class TestImportOrder(unittest.TestCase):
+    """Client-side modules must import in any order, without the server."""
+
+    def assert_imports(self, *modules):
+        code = "; ".join(f"import {module}" for module in modules)
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=SAMPLES_DIR,
+            env={**os.environ, "PYTHONPATH": SAMPLES_DIR},
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_push_notification_auth_first(self):
+        self.assert_imports("common.utils.push_notification_auth", "common.server")
+
+    def test_push_notification_auth_after_client(self):
+        self.assert_imports("common.client", "common.utils.push_notification_auth")
+
+    def test_server_first(self):
+        self.assert_imports("common.server", "common.utils.push_notification_auth")
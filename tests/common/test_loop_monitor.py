@@ -0,0 +1,40 @@
+import asyncio
+import time
+import unittest
+from common.server.loop_monitor import LoopMonitor, LoopMonitorPolicy, current_task_id
+
+
+def blocking_agent_call():
+    time.sleep(0.3)
+
+
+class TestLoopMonitor(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.monitor = LoopMonitor(
+            LoopMonitorPolicy(interval_seconds=0.01, stall_threshold_seconds=0.1)
+        )
+        self.monitor.ensure_started()
+        await asyncio.sleep(0.05)
+
+    async def asyncTearDown(self):
+        await self.monitor.stop()
+
+    async def test_idle_loop_has_no_stalls(self):
+        await asyncio.sleep(0.2)
+        self.assertEqual(self.monitor.stalls, 0)
+        self.assertGreater(self.monitor.lag.count, 5)
+
+    async def test_stall_is_logged_with_stack_and_task_id(self):
+        async def handle():
+            current_task_id.set("task-42")
+            blocking_agent_call()
+
+        with self.assertLogs("common.server.loop_monitor", "WARNING") as logs:
+            await asyncio.create_task(handle())
+            await asyncio.sleep(0.05)
+
+        self.assertEqual(self.monitor.stalls, 1)
+        [message] = logs.output
+        self.assertIn("task task-42", message)
+        self.assertIn("blocking_agent_call", message)
+        self.assertGreaterEqual(self.monitor.max_lag_seconds, 0.2)
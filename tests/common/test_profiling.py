@@ -0,0 +1,46 @@
+import json
+import threading
+import time
+import unittest
+from collections import Counter
+from common.server.profiling import (
+    SamplingProfiler,
+    collapsed_stacks,
+    speedscope_profile,
+)
+
+
+def busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class TestSamplingProfiler(unittest.TestCase):
+    def test_samples_the_target_thread(self):
+        profiler = SamplingProfiler(interval=0.001)
+        profiler.start(threading.get_ident())
+        busy(0.1)
+        stacks = profiler.stop()
+
+        self.assertGreater(sum(stacks.values()), 10)
+        leaf_functions = {stack[-1][0] for stack in stacks}
+        self.assertIn("busy", leaf_functions)
+
+    def test_output_formats(self):
+        root = ("main", "/app/main.py", 1)
+        leaf = ("work", "/app/work.py", 10)
+        stacks = Counter({(root, leaf): 3, (root,): 1})
+
+        self.assertEqual(
+            collapsed_stacks(stacks),
+            "main (main.py:1);work (work.py:10) 3\nmain (main.py:1) 1\n",
+        )
+        profile = speedscope_profile(stacks, 0.001, "tasks/send 1")
+        self.assertEqual(
+            [frame["name"] for frame in profile["shared"]["frames"]], ["main", "work"]
+        )
+        sampled = profile["profiles"][0]
+        self.assertEqual(sampled["samples"], [[0, 1], [0]])
+        self.assertAlmostEqual(sampled["endValue"], 0.004)
+        json.dumps(profile)
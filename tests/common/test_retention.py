@@ -0,0 +1,115 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+from common.types import (
+    GetTaskRequest,
+    JSONRPCResponse,
+    Message,
+    SendTaskRequest,
+    SendTaskResponse,
+    SendTaskStreamingRequest,
+    SendTaskStreamingResponse,
+    TaskQueryParams,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+from common.server.retention import RetentionPolicy
+from common.server.task_manager import InMemoryTaskManager
+from typing import AsyncIterable, Union
+
+
+class RetentionTaskManager(InMemoryTaskManager):
+    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+        pass
+
+    async def on_send_task_subscribe(
+        self, request: SendTaskStreamingRequest
+    ) -> Union[AsyncIterable[SendTaskStreamingResponse], JSONRPCResponse]:
+        pass
+
+
+class TestRetention(unittest.IsolatedAsyncioTestCase):
+    async def asyncTearDown(self):
+        if hasattr(self, "task_manager"):
+            await self.task_manager.close()
+
+    async def add_task(self, task_id, state=TaskState.COMPLETED, text="hello"):
+        await self.task_manager.upsert_task(
+            TaskSendParams(
+                id=task_id, message=Message(role="user", parts=[TextPart(text=text)])
+            )
+        )
+        await self.task_manager.update_store(task_id, TaskStatus(state=state), None)
+
+    async def test_max_tasks_evicts_least_recently_used(self):
+        self.task_manager = RetentionTaskManager(
+            retention=RetentionPolicy(max_tasks=2)
+        )
+        for task_id in ("a", "b", "c"):
+            await self.add_task(task_id)
+        # Reading "a" makes "b" the least recently used task.
+        await self.task_manager.on_get_task(
+            GetTaskRequest(params=TaskQueryParams(id="a"))
+        )
+
+        await self.task_manager.sweep_tasks()
+
+        self.assertEqual(sorted(self.task_manager.tasks), ["a", "c"])
+        stats = self.task_manager.retention.stats()
+        self.assertEqual(stats["resident_tasks"], 2)
+        self.assertEqual(stats["evictions"]["max_tasks"], 1)
+
+    async def test_running_and_subscribed_tasks_are_kept(self):
+        self.task_manager = RetentionTaskManager(
+            retention=RetentionPolicy(max_tasks=0)
+        )
+        await self.add_task("running", state=TaskState.WORKING)
+        await self.add_task("watched")
+        await self.task_manager.setup_sse_consumer("watched")
+
+        await self.task_manager.sweep_tasks()
+
+        self.assertEqual(sorted(self.task_manager.tasks), ["running", "watched"])
+
+    async def test_max_terminal_age(self):
+        self.task_manager = RetentionTaskManager(
+            retention=RetentionPolicy(max_terminal_age_seconds=60)
+        )
+        with patch("common.server.retention.time.monotonic", return_value=1000.0):
+            await self.add_task("old")
+            await self.add_task("input", state=TaskState.INPUT_REQUIRED)
+        with patch("common.server.retention.time.monotonic", return_value=1030.0):
+            await self.add_task("recent")
+
+        with patch("common.server.retention.time.monotonic", return_value=1070.0):
+            await self.task_manager.sweep_tasks()
+
+        self.assertEqual(sorted(self.task_manager.tasks), ["input", "recent"])
+        self.assertEqual(
+            self.task_manager.retention.stats()["evictions"]["max_terminal_age"], 1
+        )
+
+    async def test_max_bytes(self):
+        self.task_manager = RetentionTaskManager(
+            retention=RetentionPolicy(max_bytes=1)
+        )
+        await self.add_task("a", text="x" * 1000)
+        await self.task_manager.sweep_tasks()
+        self.assertEqual(len(self.task_manager.tasks), 0)
+        stats = self.task_manager.retention.stats()
+        self.assertEqual(stats["resident_bytes"], 0)
+        self.assertEqual(stats["evictions"]["max_bytes"], 1)
+
+    async def test_background_sweeper(self):
+        self.task_manager = RetentionTaskManager(
+            retention=RetentionPolicy(max_tasks=0, sweep_interval_seconds=0.01)
+        )
+        await self.add_task("a")
+        for _ in range(100):
+            if not self.task_manager.tasks:
+                break
+            await asyncio.sleep(0.01)
+        self.assertEqual(len(self.task_manager.tasks), 0)
+        self.assertNotIn("a", self.task_manager.task_sse_subscribers)
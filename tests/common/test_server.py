@@ -0,0 +1,701 @@
+import asyncio
+import functools
+import os
+import tempfile
+import time
+import httpx
+import json
+import unittest
+import zlib
+from unittest.mock import patch
+from starlette.testclient import TestClient
+from common.client import A2ACardResolver, A2AClient
+from common.client import card_resolver
+from common.server.admission import AdmissionRejected
+from common.server.task_manager import TaskCanceled
+from common.utils.tracing import TracingPolicy, configure_tracing
+from common.server import (
+    A2AServer,
+    AdmissionPolicy,
+    CompressionPolicy,
+    IdempotencyPolicy,
+    InMemoryTaskManager,
+    ProfilingPolicy,
+)
+from common.types import (
+    AgentCapabilities,
+    AgentCard,
+    AgentSkill,
+    Artifact,
+    FileContent,
+    FilePart,
+    GetTaskRequest,
+    GetTaskResponse,
+    JSONRPCResponse,
+    Message,
+    SendTaskRequest,
+    SendTaskResponse,
+    SendTaskStreamingRequest,
+    SendTaskStreamingResponse,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from typing import AsyncIterable, Union
+
+
+class EchoTaskManager(InMemoryTaskManager):
+    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+        task = await self.upsert_task(request.params)
+        task = await self.update_store(
+            task.id,
+            TaskStatus(state=TaskState.COMPLETED, message=request.params.message),
+            None,
+        )
+        return SendTaskResponse(id=request.id, result=task)
+
+    async def on_send_task_subscribe(
+        self, request: SendTaskStreamingRequest
+    ) -> Union[AsyncIterable[SendTaskStreamingResponse], JSONRPCResponse]:
+        await self.upsert_task(request.params)
+        queue = await self.setup_sse_consumer(request.params.id)
+        for state in (TaskState.WORKING, TaskState.COMPLETED):
+            await self.enqueue_events_for_sse(
+                request.params.id,
+                TaskStatusUpdateEvent(
+                    id=request.params.id,
+                    status=TaskStatus(state=state),
+                    final=state == TaskState.COMPLETED,
+                ),
+            )
+        return self.dequeue_events_for_sse(request.id, request.params.id, queue)
+
+
+def rpc(method, params, request_id=1):
+    return {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+
+
+def send_params(task_id="task"):
+    return {
+        "id": task_id,
+        "message": {"role": "user", "parts": [{"type": "text", "text": "hello"}]},
+    }
+
+
+class TestA2AServer(unittest.TestCase):
+    def setUp(self):
+        self.task_manager = EchoTaskManager()
+        self.server = A2AServer(
+            agent_card=AgentCard(
+                name="echo",
+                url="http://localhost",
+                version="1",
+                capabilities=AgentCapabilities(streaming=True),
+                skills=[],
+            ),
+            task_manager=self.task_manager,
+            server_timing=True,
+        )
+        self.client = TestClient(self.server.app)
+
+    def test_dispatches_by_method(self):
+        response = self.client.post("/", json=rpc("tasks/send", send_params()))
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["id"], 1)
+        self.assertEqual(body["result"]["status"]["state"], "completed")
+        self.assertNotIn("error", body)
+
+        response = self.client.post("/", json=rpc("tasks/get", {"id": "task"}, 2))
+        self.assertEqual(response.json()["result"]["id"], "task")
+
+        response = self.client.post("/", json=rpc("tasks/get", {"id": "missing"}, 3))
+        self.assertEqual(response.json()["error"]["code"], -32001)
+
+    def test_server_timing(self):
+        response = self.client.post("/", json=rpc("tasks/get", {"id": "missing"}))
+        stages = [
+            stage.split(";")[0]
+            for stage in response.headers["server-timing"].split(", ")
+        ]
+        self.assertEqual(stages, ["read", "parse", "handle", "serialize"])
+
+    def test_parse_and_validation_errors(self):
+        response = self.client.post("/", content=b"{not json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"]["code"], -32700)
+
+        response = self.client.post("/", json=rpc("tasks/unknown", {}))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"]["code"], -32600)
+
+    def test_streaming_frames(self):
+        with self.client.stream(
+            "POST", "/", json=rpc("tasks/sendSubscribe", send_params(), "s1")
+        ) as response:
+            frames = [
+                line for line in response.iter_lines() if line and not line.startswith(":")
+            ]
+
+        self.assertEqual(frames[0], "id: 1")
+        self.assertEqual(frames[2], "id: 2")
+        events = [json.loads(frame.removeprefix("data: ")) for frame in frames[1::2]]
+        self.assertEqual([event["id"] for event in events], ["s1", "s1"])
+        self.assertEqual(events[1]["result"]["status"]["state"], "completed")
+        self.assertTrue(events[1]["result"]["final"])
+
+    def test_batch(self):
+        self.client.post("/", json=rpc("tasks/send", send_params("a")))
+        batch = [
+            rpc("tasks/get", {"id": "a"}, "first"),
+            rpc("tasks/get", {"id": "missing"}, 2),
+            {"jsonrpc": "2.0", "method": "tasks/send", "params": send_params("b")},
+            rpc("tasks/sendSubscribe", send_params("c"), 3),
+            {"jsonrpc": "2.0", "id": 4, "method": "tasks/unknown"},
+            "not a request",
+            rpc("tasks/get", {"id": "a"}, {"not": "an id"}),
+            rpc("tasks/get", {"id": "a"}, [5]),
+        ]
+        response = self.client.post("/", json=batch)
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+
+        self.assertEqual(
+            [entry.get("id") for entry in body], ["first", 2, 3, 4, None, None, None]
+        )
+        self.assertEqual(body[0]["result"]["id"], "a")
+        self.assertEqual(body[1]["error"]["code"], -32001)
+        self.assertEqual([entry["error"]["code"] for entry in body[2:]], [-32600] * 5)
+        # The notification ran even though it got no response.
+        self.assertIn("b", self.task_manager.tasks)
+
+    def test_send_deadlines_are_dropped_after_the_request(self):
+        # EchoTaskManager answers without starting tracked agent work.
+        self.task_manager.default_deadline_seconds = 30
+        self.client.post("/", json=rpc("tasks/send", send_params("a")))
+        with self.client.stream(
+            "POST", "/", json=rpc("tasks/sendSubscribe", send_params("b"), 2)
+        ) as response:
+            response.read()
+        self.assertIn("a", self.task_manager.tasks)
+        self.assertEqual(self.task_manager._deadlines, {})
+
+    def test_batch_of_notifications_and_empty_batch(self):
+        notification = {"jsonrpc": "2.0", "method": "tasks/get", "params": {"id": "a"}}
+        response = self.client.post("/", json=[notification])
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response.content, b"")
+
+        response = self.client.post("/", json=[])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"]["code"], -32600)
+
+
+class TestCompression(unittest.TestCase):
+    def setUp(self):
+        self.task_manager = EchoTaskManager()
+        self.server = A2AServer(
+            task_manager=self.task_manager,
+            compression=CompressionPolicy(min_size=1000, compress_streams=True),
+        )
+        self.client = TestClient(self.server.app)
+
+    def send(self, text, accept_encoding="gzip"):
+        params = send_params()
+        params["message"]["parts"][0]["text"] = text
+        return self.client.post(
+            "/",
+            json=rpc("tasks/send", params),
+            headers={"Accept-Encoding": accept_encoding},
+        )
+
+    def test_large_responses_are_compressed(self):
+        response = self.send("x" * 10000)
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(response.headers["vary"], "Accept-Encoding")
+        self.assertLess(int(response.headers["content-length"]), 1000)
+        self.assertEqual(response.json()["result"]["status"]["message"]["parts"][0]["text"], "x" * 10000)
+
+        stats = self.server.compressor.stats()
+        self.assertEqual(stats["gzip"]["responses"], 1)
+        self.assertLess(stats["gzip"]["ratio"], 0.1)
+
+    def test_small_or_unaccepted_responses_are_not(self):
+        self.assertNotIn("content-encoding", self.send("x").headers)
+        self.assertNotIn("content-encoding", self.send("x" * 10000, "identity").headers)
+        self.assertNotIn("content-encoding", self.send("x" * 10000, "gzip;q=0").headers)
+        self.assertEqual(self.server.compressor.stats()["skipped"], 3)
+
+    def test_stream_is_flushed_per_message(self):
+        with self.client.stream(
+            "POST",
+            "/",
+            json=rpc("tasks/sendSubscribe", send_params(), "s1"),
+            headers={"Accept-Encoding": "gzip"},
+        ) as response:
+            self.assertEqual(response.headers["content-encoding"], "gzip")
+            chunks = list(response.iter_raw())
+
+        decompressor = zlib.decompressobj(31)
+        messages = [decompressor.decompress(chunk) for chunk in chunks]
+        # Every chunk decompresses on its own into whole SSE messages.
+        self.assertTrue(messages[0].startswith(b"id: 1"))
+        self.assertTrue(all(m.endswith(b"\r\n\r\n") for m in messages if m))
+        self.assertIn(b'"final":true', b"".join(messages))
+
+
+class TestAgentCard(unittest.TestCase):
+    def setUp(self):
+        self.server = A2AServer(
+            agent_card=AgentCard(
+                name="echo",
+                url="http://localhost",
+                version="1",
+                capabilities=AgentCapabilities(),
+                skills=[],
+            ),
+            agent_card_max_age=60,
+        )
+        self.client = TestClient(self.server.app)
+
+    def get_card(self, etag=None):
+        headers = {"If-None-Match": etag} if etag else {}
+        return self.client.get("/.well-known/agent.json", headers=headers)
+
+    def test_etag_and_not_modified(self):
+        response = self.get_card()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["name"], "echo")
+        self.assertEqual(response.headers["cache-control"], "public, max-age=60")
+        etag = response.headers["etag"]
+
+        for if_none_match in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+            response = self.get_card(if_none_match)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.content, b"")
+            self.assertEqual(response.headers["etag"], etag)
+
+        self.assertEqual(self.get_card('"other"').status_code, 200)
+
+    def test_invalidated_when_card_changes(self):
+        etag = self.get_card().headers["etag"]
+        self.assertEqual(self.server._encoded_agent_card()[1], etag)
+
+        self.server.agent_card.version = "2"
+        response = self.get_card(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["version"], "2")
+
+        etag = response.headers["etag"]
+        self.server.agent_card = self.server.agent_card.model_copy(
+            update={"skills": [AgentSkill(id="echo", name="Echo")]}
+        )
+        response = self.get_card(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["skills"][0]["id"], "echo")
+
+    def test_resolver_caches_and_revalidates(self):
+        status_codes = []
+        server = self.server
+
+        class RecordingClient(TestClient):
+            def __init__(self):
+                super().__init__(server.app)
+
+            def get(self, *args, **kwargs):
+                response = super().get(*args, **kwargs)
+                status_codes.append(response.status_code)
+                return response
+
+        card_resolver._card_cache.clear()
+        self.addCleanup(card_resolver._card_cache.clear)
+        resolver = A2ACardResolver("http://testserver")
+        with patch("common.client.card_resolver.httpx.Client", RecordingClient):
+            card = resolver.get_agent_card()
+            card.url = "changed"
+            self.assertEqual(resolver.get_agent_card().url, "http://localhost")
+            self.assertEqual(status_codes, [200])
+
+            with patch("common.client.card_resolver.time.monotonic", return_value=1e12):
+                self.assertEqual(resolver.get_agent_card().name, "echo")
+            self.assertEqual(status_codes, [200, 304])
+
+
+class TestA2AClientBatch(unittest.IsolatedAsyncioTestCase):
+    async def test_batch_preserves_request_order(self):
+        task_manager = EchoTaskManager()
+        server = A2AServer(task_manager=task_manager, batch_concurrency=2)
+        for task_id in ("a", "b", "c"):
+            await task_manager.on_send_task(
+                SendTaskRequest(params=send_params(task_id))
+            )
+
+        transport = httpx.ASGITransport(app=server.app)
+        with patch(
+            "common.client.client.httpx.AsyncClient",
+            functools.partial(httpx.AsyncClient, transport=transport),
+        ):
+            responses = await A2AClient(url="http://test/").batch(
+                [GetTaskRequest(params={"id": task_id}) for task_id in ("c", "x", "a")]
+            )
+
+        self.assertTrue(all(isinstance(r, GetTaskResponse) for r in responses))
+        self.assertEqual(responses[0].result.id, "c")
+        self.assertEqual(responses[1].error.code, -32001)
+        self.assertEqual(responses[2].result.id, "a")
+
+
+    async def test_get_task_projection(self):
+        task_manager = EchoTaskManager()
+        server = A2AServer(task_manager=task_manager)
+        await task_manager.on_send_task(SendTaskRequest(params=send_params("a")))
+        task_manager.tasks["a"].artifacts = [
+            Artifact(parts=[FilePart(file=FileContent(name="out.bin", bytes="A" * 10_000))])
+        ]
+
+        transport = httpx.ASGITransport(app=server.app)
+        with patch(
+            "common.client.client.httpx.AsyncClient",
+            functools.partial(httpx.AsyncClient, transport=transport),
+        ):
+            client = A2AClient(url="http://test/")
+            response = await client.get_task({"id": "a"}, include=["status"])
+            self.assertEqual(response.result.status.state, TaskState.COMPLETED)
+            self.assertIsNone(response.result.history)
+            self.assertIsNone(response.result.artifacts)
+            response = await client.get_task({"id": "a"}, exclude_artifact_bytes=True)
+            self.assertEqual(response.result.artifacts[0].parts[0].file.name, "out.bin")
+            self.assertIsNone(response.result.artifacts[0].parts[0].file.bytes)
+
+
+class SlowTaskManager(EchoTaskManager):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.release = asyncio.Event()
+
+    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+        await self.upsert_task(request.params)
+        try:
+            await self.run_agent_work(request.params.id, self.release.wait())
+        except TaskCanceled:
+            return SendTaskResponse(
+                id=request.id, result=await self.get_task(request.params.id)
+            )
+        return await super().on_send_task(request)
+
+
+class BackgroundStreamTaskManager(SlowTaskManager):
+    """Runs its agent in the background and streams the events it enqueues."""
+
+    async def on_send_task_subscribe(
+        self, request: SendTaskStreamingRequest
+    ) -> Union[AsyncIterable[SendTaskStreamingResponse], JSONRPCResponse]:
+        await self.upsert_task(request.params)
+        queue = await self.setup_sse_consumer(request.params.id)
+        self.start_agent_work(request.params.id, self.run_agent(request.params.id))
+        return self.dequeue_events_for_sse(request.id, request.params.id, queue)
+
+    async def run_agent(self, task_id: str):
+        await self.enqueue_events_for_sse(
+            task_id,
+            TaskStatusUpdateEvent(
+                id=task_id, status=TaskStatus(state=TaskState.WORKING), final=False
+            ),
+        )
+        await self.release.wait()
+
+
+class TestAdmissionControl(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.task_manager = SlowTaskManager()
+        self.server = A2AServer(
+            task_manager=self.task_manager,
+            admission=AdmissionPolicy(
+                max_concurrent_sends=1, max_queued_sends=1, retry_after_seconds=2
+            ),
+        )
+        self.client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=self.server.app), base_url="http://test"
+        )
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    async def test_rejects_with_429_when_queue_is_full(self):
+        running = asyncio.create_task(
+            self.client.post("/", json=rpc("tasks/send", send_params("a"), 1))
+        )
+        queued = asyncio.create_task(
+            self.client.post("/", json=rpc("tasks/send", send_params("b"), 2))
+        )
+        await asyncio.sleep(0.05)
+
+        response = await self.client.post("/", json=rpc("tasks/send", send_params("c"), 3))
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers["retry-after"], "2")
+        self.assertEqual(response.json()["id"], 3)
+        self.assertEqual(response.json()["error"]["code"], -32006)
+
+        # Reads are not limited.
+        response = await self.client.post("/", json=rpc("tasks/get", {"id": "a"}, 4))
+        self.assertEqual(response.status_code, 200)
+
+        self.task_manager.release.set()
+        for call in (running, queued):
+            self.assertEqual((await call).status_code, 200)
+        stats = self.server.admission.stats()["sends"]
+        self.assertEqual((stats["running"], stats["rejected"]), (0, 1))
+
+    async def test_retried_send_joins_the_running_one(self):
+        self.task_manager = SlowTaskManager(idempotency=IdempotencyPolicy())
+        self.server.task_manager = self.task_manager
+        send = asyncio.create_task(
+            self.client.post("/", json=rpc("tasks/send", send_params("a"), 1))
+        )
+        await asyncio.sleep(0.05)
+        # The queue has room for one; an identical retry does not need it.
+        self.server.admission.sends.max_queued = 0
+        retry = asyncio.create_task(
+            self.client.post("/", json=rpc("tasks/send", send_params("a"), 2))
+        )
+        await asyncio.sleep(0.05)
+        self.task_manager.release.set()
+
+        responses = [(await send).json(), (await retry).json()]
+        self.assertEqual([response["id"] for response in responses], [1, 2])
+        self.assertEqual(responses[0]["result"], responses[1]["result"])
+        stats = self.server.admission.stats()["sends"]
+        self.assertEqual((stats["admitted"], stats["rejected"]), (1, 0))
+        stats = self.task_manager.send_deduplicator.stats()
+        self.assertEqual((stats["executed"], stats["joined"]), (1, 1))
+
+    async def test_sends_are_not_deduplicated_by_default(self):
+        self.assertIsNone(self.task_manager.send_deduplicator)
+
+    async def test_cancel_frees_the_slot(self):
+        send = asyncio.create_task(
+            self.client.post("/", json=rpc("tasks/send", send_params("a"), 1))
+        )
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.server.admission.sends.running, 1)
+
+        response = await self.client.post("/", json=rpc("tasks/cancel", {"id": "a"}, 2))
+        self.assertEqual(response.json()["result"]["status"]["state"], "canceled")
+        response = await send
+        self.assertEqual(response.json()["result"]["status"]["state"], "canceled")
+        self.assertEqual(self.server.admission.sends.running, 0)
+        self.assertEqual(self.task_manager.running_work, {})
+
+        response = await self.client.post("/", json=rpc("tasks/cancel", {"id": "a"}, 3))
+        self.assertEqual(response.json()["error"]["code"], -32002)
+
+    async def test_stream_holds_its_slot_until_done(self):
+        self.server.admission.streams.max_concurrent = 1
+        self.server.admission.streams.max_queued = 0
+
+        stream = await self.server._dispatch(
+            None, SendTaskStreamingRequest(id=1, params=send_params("s"))
+        )
+        with self.assertRaises(AdmissionRejected):
+            await self.server._dispatch(
+                None, SendTaskStreamingRequest(id=2, params=send_params("t"))
+            )
+        self.assertEqual(len([response async for response in stream]), 2)
+        self.assertEqual(self.server.admission.streams.running, 0)
+
+    async def test_stream_slot_is_held_until_the_work_ends(self):
+        self.server.task_manager = task_manager = BackgroundStreamTaskManager()
+        stream = await self.server._dispatch(
+            None, SendTaskStreamingRequest(id=1, params=send_params("s"))
+        )
+        await anext(stream)
+        # The client goes away, but the agent is still running.
+        await stream.aclose()
+        self.assertEqual(self.server.admission.streams.running, 1)
+
+        work = task_manager.running_work["s"]
+        task_manager.release.set()
+        await work
+        await asyncio.sleep(0)
+        self.assertEqual(self.server.admission.streams.running, 0)
+
+    async def test_stream_slot_is_freed_when_the_client_leaves_before_the_first_event(self):
+        body = json.dumps(rpc("tasks/sendSubscribe", send_params("s"))).encode()
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+        async def receive():
+            if messages:
+                return messages.pop(0)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            # The connection is gone before the response starts, so the
+            # stream is never iterated.
+            raise OSError("Connection reset by peer")
+
+        scope = {
+            "type": "http",
+            "http_version": "1.1",
+            "method": "POST",
+            "path": "/",
+            "raw_path": b"/",
+            "root_path": "",
+            "scheme": "http",
+            "query_string": b"",
+            "headers": [(b"content-type", b"application/json")],
+            "server": ("test", 80),
+            "client": ("test", 1234),
+        }
+        with self.assertRaises(OSError):
+            await self.server.app(scope, receive, send)
+        self.assertEqual(self.server.admission.streams.running, 0)
+
+    async def test_rejection_inside_batch(self):
+        self.server.admission.sends.max_queued = 0
+        self.task_manager.release.set()
+        await self.server.admission.sends.acquire()
+
+        response = await self.client.post(
+            "/",
+            json=[rpc("tasks/send", send_params("a"), 1), rpc("tasks/get", {"id": "a"}, 2)],
+        )
+        self.assertEqual(response.status_code, 200)
+        busy, missing = response.json()
+        self.assertEqual(busy["error"]["code"], -32006)
+        self.assertEqual(busy["error"]["data"], {"retryAfter": 2})
+        self.assertEqual(missing["error"]["code"], -32001)
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.task_manager = EchoTaskManager()
+        self.server = A2AServer(
+            task_manager=self.task_manager,
+            admission=AdmissionPolicy(max_concurrent_sends=4),
+            metrics=True,
+        )
+        self.client = TestClient(self.server.app)
+
+    def scrape(self):
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        return response.text.splitlines()
+
+    def test_per_method_latency_and_task_states(self):
+        self.client.post("/", json=rpc("tasks/send", send_params("a")))
+        self.client.post("/", json=rpc("tasks/get", {"id": "a"}))
+        self.client.post("/", json=rpc("tasks/get", {"id": "a"}))
+        self.client.post("/", content=b"{not json")
+
+        lines = self.scrape()
+        self.assertIn('a2a_request_duration_seconds_count{method="tasks/get"} 2', lines)
+        self.assertIn('a2a_request_duration_seconds_count{method="tasks/send"} 1', lines)
+        self.assertIn('a2a_request_duration_seconds_count{method="invalid"} 1', lines)
+        self.assertIn(
+            'a2a_request_duration_seconds_bucket{method="tasks/get",le="+Inf"} 2', lines
+        )
+        self.assertIn("a2a_requests_in_flight 0", lines)
+        self.assertIn('a2a_tasks{state="completed"} 1', lines)
+        self.assertIn('a2a_tasks{state="working"} 0', lines)
+        self.assertIn('a2a_admission_running{kind="send"} 0', lines)
+        self.assertIn('a2a_admission_queue_wait_seconds_count{kind="send"} 1', lines)
+        self.assertIn("a2a_sse_subscribers 0", lines)
+
+    def test_every_sample_has_a_type(self):
+        lines = self.scrape()
+        typed = {line.split()[2] for line in lines if line.startswith("# TYPE")}
+        for line in lines:
+            if line.startswith("#"):
+                continue
+            name = line.split("{")[0].split()[0]
+            base = name.removesuffix("_bucket").removesuffix("_sum").removesuffix("_count")
+            self.assertTrue(name in typed or base in typed, line)
+
+    def test_disabled_by_default(self):
+        client = TestClient(A2AServer(task_manager=self.task_manager).app)
+        self.assertEqual(client.get("/metrics").status_code, 404)
+
+
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        self.server = A2AServer(
+            task_manager=EchoTaskManager(), tracing=TracingPolicy(ring_buffer_size=100)
+        )
+        self.client = TestClient(self.server.app)
+
+    def tearDown(self):
+        configure_tracing(None)
+
+    def test_request_stages_are_traced(self):
+        self.client.post("/", json=rpc("tasks/send", send_params()))
+        spans = self.client.get("/debug/traces").json()["spans"]
+        by_name = {span["name"]: span for span in spans}
+        self.assertLessEqual(
+            {"a2a.request", "a2a.parse", "a2a.handle", "task.upsert", "task.update", "a2a.serialize"},
+            set(by_name),
+        )
+        self.assertEqual(by_name["a2a.request"]["attributes"], {"method": "tasks/send"})
+        self.assertEqual(
+            by_name["task.upsert"]["parent_id"], by_name["a2a.handle"]["span_id"]
+        )
+        self.assertEqual(len({span["trace_id"] for span in spans}), 1)
+
+        trace_id = by_name["a2a.request"]["trace_id"]
+        self.client.post("/", json=rpc("tasks/get", {"id": "task"}))
+        response = self.client.get("/debug/traces", params={"trace_id": trace_id})
+        self.assertEqual(len(response.json()["spans"]), len(spans))
+        response = self.client.get("/debug/traces", params={"limit": 1})
+        self.assertEqual(response.json()["spans"][0]["name"], "a2a.request")
+
+
+class BusyTaskManager(EchoTaskManager):
+    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+        return await super().on_send_task(request)
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = A2AServer(
+            task_manager=BusyTaskManager(),
+            profiling=ProfilingPolicy(output_dir=self.tmp.name, token="secret"),
+        )
+        self.client = TestClient(self.server.app)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_profiles_requests_with_the_admin_header(self):
+        response = self.client.post(
+            "/", json=rpc("tasks/send", send_params(), "req-1"),
+            headers={"X-A2A-Profile": "secret"},
+        )
+        self.assertEqual(response.json()["result"]["status"]["state"], "completed")
+        name = response.headers["x-a2a-profile"]
+
+        [record] = self.server.profiler.profiles_for("req-1")
+        self.assertEqual(record["name"], name)
+        self.assertEqual(record["method"], "tasks/send")
+        self.assertGreaterEqual(record["wall_seconds"], 0.05)
+        self.assertGreater(record["loop_cpu_seconds"], 0.03)
+        with open(os.path.join(self.tmp.name, name + ".collapsed")) as f:
+            self.assertIn("on_send_task", f.read())
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, name + ".speedscope.json")))
+
+    def test_other_requests_are_not_profiled(self):
+        for headers in (
+            {},
+            {"X-A2A-Profile": "wrong"},
+            {"X-A2A-Profile": "sécret".encode("latin-1")},
+        ):
+            response = self.client.post(
+                "/", json=rpc("tasks/send", send_params()), headers=headers
+            )
+            self.assertEqual(response.json()["result"]["status"]["state"], "completed")
+            self.assertNotIn("x-a2a-profile", response.headers)
+        self.assertEqual(os.listdir(self.tmp.name), [])
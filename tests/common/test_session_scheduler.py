@@ -0,0 +1,92 @@
+import asyncio
+import unittest
+from common.server.session_scheduler import SessionScheduler
+
+
+class TestSessionScheduler(unittest.IsolatedAsyncioTestCase):
+    async def test_same_session_runs_in_order(self):
+        scheduler = SessionScheduler()
+        log = []
+
+        async def turn(name):
+            log.append(f"start {name}")
+            await asyncio.sleep(0.01)
+            log.append(f"end {name}")
+            return name
+
+        results = await asyncio.gather(
+            *(scheduler.run("s", turn, name) for name in ("a", "b", "c"))
+        )
+        self.assertEqual(results, ["a", "b", "c"])
+        self.assertEqual(
+            log, ["start a", "end a", "start b", "end b", "start c", "end c"]
+        )
+        self.assertEqual(scheduler.stats()["active_sessions"], 0)
+
+    async def test_sessions_run_in_parallel_up_to_the_cap(self):
+        scheduler = SessionScheduler(max_concurrent=2)
+        running, peak = 0, 0
+
+        async def turn():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        await asyncio.gather(*(scheduler.run(f"s{i}", turn) for i in range(5)))
+        self.assertEqual(peak, 2)
+
+    async def test_queue_lengths(self):
+        scheduler = SessionScheduler()
+        release = asyncio.Event()
+        calls = [
+            asyncio.create_task(scheduler.run("s", release.wait)) for _ in range(3)
+        ]
+        calls.append(asyncio.create_task(scheduler.run("t", release.wait)))
+        await asyncio.sleep(0)
+
+        self.assertEqual(scheduler.queue_length("s"), 2)
+        stats = scheduler.stats()
+        self.assertEqual(stats["session_queue_lengths"], {"s": 2})
+        self.assertEqual(stats["max_session_queue_length"], 2)
+        self.assertEqual(stats["active_sessions"], 2)
+
+        release.set()
+        await asyncio.gather(*calls)
+        self.assertEqual(scheduler.queue_length("s"), 0)
+
+    async def test_cancelled_waiter_gives_up_its_turn(self):
+        scheduler = SessionScheduler()
+        release = asyncio.Event()
+        first = asyncio.create_task(scheduler.run("s", release.wait))
+        second = asyncio.create_task(scheduler.run("s", release.wait))
+        third = asyncio.create_task(scheduler.run("s", asyncio.sleep, 0, "third"))
+        await asyncio.sleep(0)
+
+        second.cancel()
+        release.set()
+        await first
+        self.assertEqual(await third, "third")
+        self.assertTrue(second.cancelled())
+        self.assertEqual(scheduler.stats()["active_sessions"], 0)
+
+    async def test_iterate_holds_the_turn(self):
+        scheduler = SessionScheduler()
+        log = []
+
+        async def stream():
+            for i in range(3):
+                await asyncio.sleep(0)
+                log.append(i)
+                yield i
+
+        async def turn():
+            log.append("turn")
+
+        async def collect():
+            return [item async for item in scheduler.iterate("s", stream())]
+
+        items, _ = await asyncio.gather(collect(), scheduler.run("s", turn))
+        self.assertEqual(items, [0, 1, 2])
+        self.assertEqual(log, [0, 1, 2, "turn"])
@@ -0,0 +1,191 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from common.types import (
+    Artifact,
+    GetTaskRequest,
+    Message,
+    PushNotificationConfig,
+    SendTaskRequest,
+    SendTaskResponse,
+    SendTaskStreamingRequest,
+    SendTaskStreamingResponse,
+    JSONRPCResponse,
+    TaskQueryParams,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+from common.server.sqlite_task_store import SQLiteTaskStore, _load_task
+from common.server.task_manager import InMemoryTaskManager
+from typing import AsyncIterable, Union
+
+
+class SQLiteTaskManager(InMemoryTaskManager):
+    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+        pass
+
+    async def on_send_task_subscribe(
+        self, request: SendTaskStreamingRequest
+    ) -> Union[AsyncIterable[SendTaskStreamingResponse], JSONRPCResponse]:
+        pass
+
+
+class TestSQLiteTaskStore(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "tasks.db")
+        self.store = SQLiteTaskStore(self.path)
+
+    async def asyncTearDown(self):
+        await self.store.close()
+        self.tmpdir.cleanup()
+
+    def get_message(self, role="user", text="hello"):
+        return Message(role=role, parts=[TextPart(text=text)])
+
+    async def test_wal_mode(self):
+        mode = self.store._connection().execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    async def test_upsert_update_and_reload(self):
+        await self.store.upsert_task(
+            TaskSendParams(id="task", sessionId="session", message=self.get_message())
+        )
+        task = await self.store.update_task(
+            "task",
+            TaskStatus(
+                state=TaskState.COMPLETED,
+                message=self.get_message(role="agent", text="done"),
+            ),
+            [Artifact(parts=[TextPart(text="artifact")])],
+        )
+        self.assertEqual(task.status.state, TaskState.COMPLETED)
+        self.assertEqual(len(task.history), 2)
+        self.assertEqual(len(task.artifacts), 1)
+
+        # A fresh store on the same file sees everything that was committed.
+        reopened = SQLiteTaskStore(self.path)
+        try:
+            task = await reopened.get_task("task")
+            self.assertEqual(task.sessionId, "session")
+            self.assertEqual(task.status.state, TaskState.COMPLETED)
+            self.assertEqual(task.history[-1].parts[0].text, "done")
+        finally:
+            await reopened.close()
+
+    async def test_update_unknown_task(self):
+        with self.assertRaises(ValueError):
+            await self.store.update_task(
+                "missing", TaskStatus(state=TaskState.WORKING), None
+            )
+
+    async def test_concurrent_writes_are_batched(self):
+        await asyncio.gather(
+            *(
+                self.store.upsert_task(
+                    TaskSendParams(id=f"task-{i}", message=self.get_message())
+                )
+                for i in range(50)
+            ),
+            self.store.update_task(
+                "missing", TaskStatus(state=TaskState.WORKING), None
+            ),
+            return_exceptions=True,
+        )
+        # The failing update is rolled back on its own savepoint only.
+        self.assertEqual(sum((await self.store.count_by_state()).values()), 50)
+
+    async def test_updates_do_not_reload_the_task(self):
+        await self.store.upsert_task(TaskSendParams(id="task", message=self.get_message()))
+        with patch(
+            "common.server.sqlite_task_store._load_task", wraps=_load_task
+        ) as load_task:
+            for i in range(10):
+                task = await self.store.update_task(
+                    "task",
+                    TaskStatus(
+                        state=TaskState.WORKING,
+                        message=self.get_message(role="agent", text=f"step {i}"),
+                    ),
+                    [Artifact(parts=[TextPart(text=f"artifact {i}")])],
+                )
+        load_task.assert_not_called()
+        self.assertEqual(len(task.history), 11)
+        self.assertEqual(len(task.artifacts), 10)
+        self.assertEqual(await self.store.get_task("task"), task)
+
+    async def test_cache_sees_other_connections(self):
+        await self.store.upsert_task(TaskSendParams(id="task", message=self.get_message()))
+        # Another worker writes to the same database.
+        other = SQLiteTaskStore(self.path)
+        try:
+            await other.upsert_task(
+                TaskSendParams(id="task", message=self.get_message(text="elsewhere"))
+            )
+        finally:
+            await other.close()
+
+        task = await self.store.update_task(
+            "task", TaskStatus(state=TaskState.WORKING), None
+        )
+        self.assertEqual([m.parts[0].text for m in task.history], ["hello", "elsewhere"])
+
+    async def test_mapping_views_are_deprecated(self):
+        await self.store.upsert_task(TaskSendParams(id="task", message=self.get_message()))
+        with self.assertWarns(DeprecationWarning):
+            self.assertIn("task", self.store.tasks)
+
+    async def test_history_by_task_and_session(self):
+        for i in range(3):
+            await self.store.upsert_task(
+                TaskSendParams(
+                    id=f"task-{i}", sessionId="session", message=self.get_message(text=f"m{i}")
+                )
+            )
+        await self.store.upsert_task(
+            TaskSendParams(id="task-0", sessionId="session", message=self.get_message(text="m3"))
+        )
+        history = await self.store.load_history("task-0")
+        self.assertEqual([m.parts[0].text for m in history], ["m0", "m3"])
+        session_history = await self.store.load_session_history("session")
+        self.assertEqual(
+            [m.parts[0].text for m in session_history], ["m0", "m3", "m1", "m2"]
+        )
+
+    async def test_push_notification_info(self):
+        config = PushNotificationConfig(url="http://test.com")
+        with self.assertRaises(ValueError):
+            await self.store.set_push_notification_info("task", config)
+
+        await self.store.upsert_task(TaskSendParams(id="task", message=self.get_message()))
+        self.assertFalse(await self.store.has_push_notification_info("task"))
+        await self.store.set_push_notification_info("task", config)
+        self.assertTrue(await self.store.has_push_notification_info("task"))
+        self.assertEqual(await self.store.get_push_notification_info("task"), config)
+
+    async def test_count_by_state(self):
+        for task_id in ("a", "b", "c"):
+            await self.store.upsert_task(
+                TaskSendParams(id=task_id, message=self.get_message())
+            )
+        await self.store.update_task("a", TaskStatus(state=TaskState.COMPLETED), None)
+        self.assertEqual(
+            await self.store.count_by_state(),
+            {TaskState.SUBMITTED: 2, TaskState.COMPLETED: 1},
+        )
+
+    async def test_task_manager_with_sqlite_backend(self):
+        task_manager = SQLiteTaskManager(task_store=self.store)
+        await task_manager.upsert_task(
+            TaskSendParams(id="task", message=self.get_message())
+        )
+        await task_manager.update_store("task", TaskStatus(state=TaskState.WORKING), None)
+        response = await task_manager.on_get_task(
+            GetTaskRequest(id="1", params=TaskQueryParams(id="task", historyLength=1))
+        )
+        self.assertEqual(response.result.status.state, TaskState.WORKING)
+        self.assertEqual(len(response.result.history), 1)
@@ -0,0 +1,255 @@
+import asyncio
+import json
+import unittest
+from common.types import (
+    Artifact,
+    InternalError,
+    JSONRPCResponse,
+    Message,
+    SendTaskRequest,
+    SendTaskResponse,
+    SendTaskStreamingRequest,
+    SendTaskStreamingResponse,
+    TaskArtifactUpdateEvent,
+    TaskResubscriptionParams,
+    TaskResubscriptionRequest,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from common.server.sse import (
+    EncodedEvent,
+    EventReplayBuffer,
+    OverflowPolicy,
+    StreamingEventResponse,
+    SubscriberQueue,
+)
+from common.server.task_manager import InMemoryTaskManager
+from typing import AsyncIterable, Union
+
+
+def status_event(state=TaskState.WORKING, final=False):
+    return TaskStatusUpdateEvent(id="task", status=TaskStatus(state=state), final=final)
+
+
+def artifact_event():
+    return TaskArtifactUpdateEvent(
+        id="task", artifact=Artifact(parts=[TextPart(text="artifact")])
+    )
+
+
+class SSETaskManager(InMemoryTaskManager):
+    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+        pass
+
+    async def on_send_task_subscribe(
+        self, request: SendTaskStreamingRequest
+    ) -> Union[AsyncIterable[SendTaskStreamingResponse], JSONRPCResponse]:
+        pass
+
+
+class TestSubscriberQueue(unittest.IsolatedAsyncioTestCase):
+    async def test_drop_oldest(self):
+        queue = SubscriberQueue(maxsize=2, overflow_policy=OverflowPolicy.DROP_OLDEST)
+        events = [status_event(), artifact_event(), status_event(TaskState.COMPLETED, True)]
+        for event in events:
+            self.assertTrue(queue.offer(event))
+        self.assertEqual(await queue.get(), events[1])
+        self.assertEqual(await queue.get(), events[2])
+        self.assertEqual(queue.stats()["dropped"], 1)
+
+    async def test_coalesce_status_updates(self):
+        queue = SubscriberQueue(maxsize=3, overflow_policy=OverflowPolicy.COALESCE)
+        artifact = artifact_event()
+        final = status_event(TaskState.COMPLETED, True)
+        for event in (status_event(), artifact, status_event(), final):
+            self.assertTrue(queue.offer(event))
+        self.assertEqual(await queue.get(), artifact)
+        self.assertEqual(await queue.get(), final)
+        self.assertEqual(queue.stats()["coalesced"], 2)
+
+    async def test_coalesce_disconnects_when_nothing_to_drop(self):
+        queue = SubscriberQueue(maxsize=1, overflow_policy=OverflowPolicy.COALESCE)
+        self.assertTrue(queue.offer(artifact_event()))
+        self.assertFalse(queue.offer(artifact_event()))
+        self.assertIsInstance(await queue.get(), InternalError)
+        self.assertTrue(queue.stats()["disconnected"])
+
+    async def test_disconnect(self):
+        queue = SubscriberQueue(maxsize=1, overflow_policy=OverflowPolicy.DISCONNECT)
+        self.assertTrue(queue.offer(status_event()))
+        self.assertFalse(queue.offer(status_event()))
+        self.assertFalse(queue.offer(status_event()))
+        self.assertIsInstance(await queue.get(), InternalError)
+
+    async def test_lag_stats(self):
+        queue = SubscriberQueue(maxsize=4)
+        queue.offer(status_event())
+        self.assertEqual(queue.stats()["depth"], 1)
+        await queue.get()
+        stats = queue.stats()
+        self.assertEqual(stats["delivered"], 1)
+        self.assertEqual(stats["depth"], 0)
+        self.assertGreaterEqual(stats["max_lag_seconds"], 0)
+
+
+class TestFanOut(unittest.IsolatedAsyncioTestCase):
+    async def test_stalled_subscriber_does_not_affect_others(self):
+        task_manager = SSETaskManager(
+            sse_queue_size=2, sse_overflow_policy=OverflowPolicy.DISCONNECT
+        )
+        stalled = await task_manager.setup_sse_consumer("task")
+        healthy = await task_manager.setup_sse_consumer("task")
+
+        for i in range(5):
+            await task_manager.enqueue_events_for_sse("task", status_event())
+            await healthy.get()
+
+        self.assertEqual(task_manager.task_sse_subscribers["task"], [healthy])
+        self.assertTrue(stalled.disconnected)
+        stats = task_manager.subscriber_stats()
+        self.assertEqual(stats["task"][0]["delivered"], 5)
+
+        responses = [
+            response
+            async for response in task_manager.dequeue_events_for_sse("1", "task", stalled)
+        ]
+        self.assertEqual(len(responses), 1)
+        self.assertIsInstance(responses[0].error, InternalError)
+
+
+class TestEncodedEvent(unittest.TestCase):
+    def assert_frame_matches(self, request_id, event, event_id):
+        frame = StreamingEventResponse.for_event(request_id, event, event_id).sse_frame()
+        expected = SendTaskStreamingResponse(
+            id=request_id, **{"error" if isinstance(event, InternalError) else "result": event}
+        )
+        lines = frame.decode().split("\r\n")
+        self.assertEqual(lines[-2:], ["", ""])
+        if event_id is not None:
+            self.assertEqual(lines.pop(0), f"id: {event_id}")
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(
+            json.loads(lines[0].removeprefix("data: ")),
+            expected.model_dump(mode="json", exclude_none=True),
+        )
+
+    def test_frame_matches_response_serialization(self):
+        for request_id in ("1", 7, None, 'quote"d'):
+            self.assert_frame_matches(request_id, status_event(), 3)
+            self.assert_frame_matches(request_id, artifact_event(), None)
+            self.assert_frame_matches(request_id, InternalError(message="boom"), None)
+
+    def test_encoded_once_for_all_subscribers(self):
+        encoded = EncodedEvent(status_event(), 1)
+        first = encoded.sse_frame("a")
+        self.assertEqual(encoded.sse_frame("b"), first.replace(b'"id":"a"', b'"id":"b"'))
+
+
+class TestEventReplayBuffer(unittest.TestCase):
+    def test_since(self):
+        buffer = EventReplayBuffer(maxlen=3)
+        events = [status_event() for _ in range(5)]
+        for event in events:
+            buffer.append(event)
+        self.assertEqual(buffer.last_event_id, 5)
+
+        replay, gap = buffer.since(3)
+        self.assertEqual([event_id for event_id, _ in replay], [4, 5])
+        self.assertFalse(gap)
+
+        replay, gap = buffer.since(1)
+        self.assertEqual([event_id for event_id, _ in replay], [3, 4, 5])
+        self.assertTrue(gap)
+
+        self.assertEqual(buffer.since(5), ([], False))
+
+
+class TestResubscribe(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.task_manager = SSETaskManager()
+        await self.task_manager.upsert_task(
+            TaskSendParams(id="task", message=Message(role="user", parts=[TextPart(text="hi")]))
+        )
+
+    async def resubscribe(self, last_event_id=None):
+        response = await self.task_manager.on_resubscribe_to_task(
+            TaskResubscriptionRequest(
+                id="1",
+                params=TaskResubscriptionParams(id="task", lastEventId=last_event_id),
+            )
+        )
+        return response
+
+    async def test_resumes_with_missing_events_then_live(self):
+        for _ in range(3):
+            await self.task_manager.enqueue_events_for_sse("task", status_event())
+
+        stream = await self.resubscribe(last_event_id=1)
+        received = [await anext(stream), await anext(stream)]
+        self.assertEqual([r.event_id for r in received], [2, 3])
+
+        await self.task_manager.enqueue_events_for_sse(
+            "task", status_event(TaskState.COMPLETED, final=True)
+        )
+        received = [r async for r in stream]
+        self.assertEqual([r.event_id for r in received], [4])
+        self.assertTrue(received[0].result.final)
+        self.assertNotIn("task", self.task_manager.task_sse_subscribers)
+
+    async def test_gap_sends_status_snapshot(self):
+        self.task_manager.sse_replay_buffer_size = 2
+        for _ in range(4):
+            await self.task_manager.enqueue_events_for_sse("task", status_event())
+
+        stream = await self.resubscribe(last_event_id=0)
+        snapshot = await anext(stream)
+        self.assertIsNone(snapshot.event_id)
+        self.assertEqual(snapshot.result.status.state, TaskState.SUBMITTED)
+        self.assertEqual([(await anext(stream)).event_id for _ in range(2)], [3, 4])
+        await stream.aclose()
+
+    async def test_finished_task_ends_immediately(self):
+        await self.task_manager.update_store(
+            "task", TaskStatus(state=TaskState.COMPLETED), None
+        )
+        await self.task_manager.enqueue_events_for_sse(
+            "task", status_event(TaskState.COMPLETED, final=True)
+        )
+        received = [r async for r in await self.resubscribe(last_event_id=1)]
+        self.assertEqual(len(received), 1)
+        self.assertTrue(received[0].result.final)
+        self.assertEqual(received[0].result.status.state, TaskState.COMPLETED)
+
+    async def test_ended_stream_buffer_expires_after_last_subscriber(self):
+        self.task_manager.sse_replay_buffer_ttl_seconds = 0.01
+        stream = await self.resubscribe()
+        await self.task_manager.enqueue_events_for_sse(
+            "task", status_event(TaskState.COMPLETED, final=True)
+        )
+        await asyncio.sleep(0.05)
+        # Still subscribed: the events stay replayable.
+        self.assertIn("task", self.task_manager.task_event_buffers)
+
+        self.assertEqual(len([r async for r in stream]), 1)
+        await asyncio.sleep(0.05)
+        self.assertNotIn("task", self.task_manager.task_event_buffers)
+        self.assertNotIn("task", self.task_manager.task_sse_subscribers)
+
+    async def test_leaving_a_quiet_task_drops_its_subscriber_list(self):
+        # No buffer left to replay from, and the task sends nothing more.
+        stream = await self.resubscribe(last_event_id=5)
+        snapshot = await anext(stream)
+        self.assertIsNone(snapshot.event_id)
+        self.assertIn("task", self.task_manager.task_sse_subscribers)
+
+        await stream.aclose()
+        self.assertNotIn("task", self.task_manager.task_sse_subscribers)
+
+    async def test_running_stream_buffer_is_kept(self):
+        self.task_manager.sse_replay_buffer_ttl_seconds = 0.01
+        await self.task_manager.enqueue_events_for_sse("task", status_event())
+        await asyncio.sleep(0.05)
+        self.assertIn("task", self.task_manager.task_event_buffers)
@@ -1,3 +1,4 @@
+import asyncio
 import unittest
 from unittest.mock import patch
 from common.types import (
@@ -31,9 +32,18 @@ from common.types import (
     TaskResubscriptionRequest,
     SendTaskStreamingRequest,
     TextPart,
+    FilePart,
+    FileContent,
     TaskPushNotificationConfig,
 )
-from common.server.task_manager import InMemoryTaskManager
+from common.server.deadlines import deadline_from_metadata, time_budget
+from common.server.disconnect import DisconnectPolicy
+from common.server.task_manager import (
+    AgentWorkStopped,
+    InMemoryTaskManager,
+    TaskCanceled,
+    TaskDeadlineExceeded,
+)
 from typing import Union, AsyncIterable
 import httpx
 
@@ -92,6 +102,175 @@ class TestInMemoryTaskManager(unittest.IsolatedAsyncioTestCase):
         self.assertIsInstance(response, CancelTaskResponse)
         self.assertIsInstance(response.error, TaskNotCancelableError)
 
+    async def test_on_cancel_task_stops_running_work(self):
+        params = TaskSendParams(id="test_task", message=self.get_test_message("user", "hi"))
+        await self.task_manager.upsert_task(params)
+        queue = await self.task_manager.setup_sse_consumer("test_task")
+        stopped = asyncio.Event()
+
+        async def agent():
+            try:
+                await asyncio.sleep(60)
+            finally:
+                stopped.set()
+
+        self.task_manager.start_agent_work("test_task", agent())
+        send = asyncio.create_task(
+            self.task_manager.run_agent_work("other_task", asyncio.sleep(60))
+        )
+        await asyncio.sleep(0)
+
+        request = CancelTaskRequest(id="1", params=TaskIdParams(id="test_task"))
+        response = await self.task_manager.on_cancel_task(request)
+        self.assertIsNone(response.error)
+        self.assertEqual(response.result.status.state, TaskState.CANCELED)
+        self.assertTrue(stopped.is_set())
+        self.assertNotIn("test_task", self.task_manager.running_work)
+        _, encoded = await queue.get_event()
+        self.assertEqual(encoded.event.status.state, TaskState.CANCELED)
+        self.assertTrue(encoded.event.final)
+
+        # A request awaiting its work gets TaskCanceled instead.
+        self.task_manager.tasks["other_task"] = Task(
+            id="other_task", status=TaskStatus(state=TaskState.WORKING)
+        )
+        await self.task_manager.on_cancel_task(
+            CancelTaskRequest(id="2", params=TaskIdParams(id="other_task"))
+        )
+        with self.assertRaises(TaskCanceled):
+            await send
+
+    async def test_stopped_work_cannot_overwrite_canceled(self):
+        params = TaskSendParams(id="test_task", message=self.get_test_message("user", "hi"))
+        await self.task_manager.upsert_task(params)
+        late_write = asyncio.Event()
+
+        async def stubborn_agent():
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                pass
+            await late_write.wait()
+            await self.task_manager.update_store(
+                "test_task", TaskStatus(state=TaskState.COMPLETED), None
+            )
+
+        work = self.task_manager.start_agent_work("test_task", stubborn_agent())
+        await asyncio.sleep(0)
+
+        with patch("common.server.task_manager.CANCEL_GRACE_SECONDS", 0.01):
+            response = await self.task_manager.on_cancel_task(
+                CancelTaskRequest(id="1", params=TaskIdParams(id="test_task"))
+            )
+        self.assertEqual(response.result.status.state, TaskState.CANCELED)
+
+        late_write.set()
+        with self.assertRaises(TaskCanceled):
+            await work
+        task = await self.task_manager.get_task("test_task")
+        self.assertEqual(task.status.state, TaskState.CANCELED)
+
+    async def test_abandoned_stream_is_canceled_after_grace(self):
+        self.task_manager.disconnect_policy = DisconnectPolicy(grace_seconds=0.05)
+
+        async def stream_and_disconnect(task_id):
+            queue = await self.task_manager.setup_sse_consumer(task_id)
+            stream = self.task_manager.dequeue_events_for_sse("1", task_id, queue)
+            await self.task_manager.enqueue_events_for_sse(
+                task_id,
+                TaskStatusUpdateEvent(id=task_id, status=TaskStatus(state=TaskState.WORKING)),
+            )
+            await anext(stream)
+            await stream.aclose()
+
+        works = {}
+        for task_id in ("abandoned", "pushed", "resubscribed"):
+            await self.task_manager.upsert_task(
+                TaskSendParams(id=task_id, message=self.get_test_message("user", "hi"))
+            )
+            works[task_id] = self.task_manager.start_agent_work(task_id, asyncio.sleep(60))
+            await stream_and_disconnect(task_id)
+
+        # A send still waits for this one, so its streams leaving does not
+        # stop it.
+        await self.task_manager.upsert_task(
+            TaskSendParams(id="awaited", message=self.get_test_message("user", "hi"))
+        )
+        send = asyncio.create_task(
+            self.task_manager.run_agent_work("awaited", asyncio.sleep(60))
+        )
+        await asyncio.sleep(0)
+        await stream_and_disconnect("awaited")
+
+        await self.task_manager.set_push_notification_info(
+            "pushed", PushNotificationConfig(url="http://localhost/hook")
+        )
+        await self.task_manager.setup_sse_consumer("resubscribed")
+        await asyncio.sleep(0.15)
+
+        self.assertEqual(
+            self.task_manager.tasks["abandoned"].status.state, TaskState.CANCELED
+        )
+        self.assertTrue(works["abandoned"].cancelled())
+        self.assertEqual(self.task_manager.abandoned_canceled, 1)
+        for task_id in ("pushed", "resubscribed"):
+            self.assertFalse(works[task_id].done())
+            works[task_id].cancel()
+        self.assertFalse(send.done())
+        self.assertEqual(self.task_manager.tasks["awaited"].status.state, TaskState.SUBMITTED)
+        send.cancel()
+
+    async def test_deadline_fails_the_task(self):
+        params = TaskSendParams(
+            id="test_task",
+            message=self.get_test_message("user", "hi"),
+            metadata={"deadlineMs": 50},
+        )
+        await self.task_manager.upsert_task(params)
+        queue = await self.task_manager.setup_sse_consumer("test_task")
+
+        async def agent():
+            budgets.append(time_budget())
+            budgets.append(await self.task_manager.agent_runner.run(time_budget, 10.0))
+            await asyncio.sleep(60)
+
+        budgets = []
+        with self.assertRaises(TaskDeadlineExceeded) as raised:
+            await self.task_manager.run_agent_work("test_task", agent())
+        self.assertIsInstance(raised.exception, AgentWorkStopped)
+        self.assertNotIsInstance(raised.exception, TaskCanceled)
+        self.assertEqual(str(raised.exception), "Task test_task exceeded its deadline")
+
+        self.assertTrue(all(0 < budget <= 0.05 for budget in budgets))
+        task = self.task_manager.tasks["test_task"]
+        self.assertEqual(task.status.state, TaskState.FAILED)
+        _, encoded = await queue.get_event()
+        self.assertEqual(encoded.event.status.state, TaskState.FAILED)
+        self.assertTrue(encoded.event.final)
+        self.assertEqual(self.task_manager.deadline_timeouts, {"TestTaskManager": 1})
+        self.assertEqual(self.task_manager.running_work, {})
+
+        # The next send without a deadline runs unbounded.
+        await self.task_manager.upsert_task(
+            TaskSendParams(id="test_task", message=self.get_test_message("user", "again"))
+        )
+        self.assertIsNone(
+            await self.task_manager.run_agent_work("test_task", asyncio.sleep(0.06))
+        )
+
+    def test_deadline_from_metadata(self):
+        self.assertEqual(deadline_from_metadata({"deadlineMs": 1500}), 1.5)
+        for metadata in (
+            None,
+            {},
+            {"deadlineMs": -1},
+            {"deadlineMs": "soon"},
+            {"deadlineMs": True},
+        ):
+            self.assertIsNone(deadline_from_metadata(metadata))
+        self.assertIsNone(time_budget())
+        self.assertEqual(time_budget(5.0), 5.0)
+
     async def test_on_cancel_task_not_found(self):
         request = CancelTaskRequest(id="1", params=TaskIdParams(id="nonexistent_task"))
         response = await self.task_manager.on_cancel_task(request)
@@ -176,11 +355,16 @@ class TestInMemoryTaskManager(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(len(self.task_manager.tasks), 1)
         self.assertEqual(len(task.history), 2)
 
-    async def test_on_resubscribe_to_task(self):
+    async def test_tasks_cannot_be_replaced(self):
+        self.assertIs(self.task_manager.tasks, self.task_manager.task_store.tasks)
+        with self.assertRaises(AttributeError):
+            self.task_manager.tasks = {}
+
+    async def test_on_resubscribe_to_task_not_found(self):
         request = TaskResubscriptionRequest(id="1", params=TaskIdParams(id="test_task"))
         response = await self.task_manager.on_resubscribe_to_task(request)
         self.assertIsInstance(response, JSONRPCResponse)
-        self.assertIsInstance(response.error, UnsupportedOperationError)
+        self.assertIsInstance(response.error, TaskNotFoundError)
 
     async def test_update_store_success(self):
         task_id = "test_task"
@@ -209,32 +393,227 @@ class TestInMemoryTaskManager(unittest.IsolatedAsyncioTestCase):
                 "nonexistent_task", TaskStatus(state=TaskState.COMPLETED), []
             )
 
-    async def test_append_task_history_with_length(self):
+    def serialized_history(self, history_length):
         task = Task(
             id="test_task",
-            messages=[self.get_test_message()],
             status=TaskStatus(state=TaskState.SUBMITTED),
             history=[
                 self.get_test_message(role="agent", text=f"Message {i}")
                 for i in range(5)
             ],
         )
-        new_task = self.task_manager.append_task_history(task, 3)
-        self.assertEqual(len(new_task.history), 3)
-        self.assertEqual(new_task.history[0].parts[0].text, "Message 2")
+        response = GetTaskResponse(id=1, result=task).with_history_length(history_length)
+        data = response.model_dump(
+            exclude_none=True, context=response._serialization_context
+        )
+        # Only the wire form is trimmed.
+        self.assertEqual(len(response.result.history), 5)
+        return data["result"].get("history", [])
 
-    async def test_append_task_history_no_length(self):
+    async def test_history_length_keeps_the_latest_messages(self):
+        history = self.serialized_history(3)
+        self.assertEqual(len(history), 3)
+        self.assertEqual(history[0]["parts"][0]["text"], "Message 2")
+
+    async def test_history_length_none_drops_the_history(self):
+        self.assertEqual(self.serialized_history(None), [])
+
+    async def test_history_length_zero_or_negative_drops_the_history(self):
+        for history_length in (0, -2):
+            self.assertEqual(self.serialized_history(history_length), [])
+
+    async def test_on_get_task_projects_history_without_copying(self):
         task = Task(
             id="test_task",
-            messages=[self.get_test_message()],
             status=TaskStatus(state=TaskState.SUBMITTED),
             history=[
                 self.get_test_message(role="agent", text=f"Message {i}")
                 for i in range(5)
             ],
         )
-        new_task = self.task_manager.append_task_history(task, None)
-        self.assertEqual(len(new_task.history), 0)
+        self.task_manager.tasks["test_task"] = task
+
+        for history_length, expected in ((2, ["Message 3", "Message 4"]), (None, [])):
+            response = await self.task_manager.on_get_task(
+                GetTaskRequest(
+                    id="1",
+                    params=TaskQueryParams(id="test_task", historyLength=history_length),
+                )
+            )
+            self.assertIs(response.result, task)
+            serialized = response.model_dump(context=response._serialization_context)
+            self.assertEqual(
+                [m["parts"][0]["text"] for m in serialized["result"]["history"]],
+                expected,
+            )
+        self.assertEqual(len(task.history), 5)
+
+    async def test_on_get_task_projects_fields_and_artifact_bytes(self):
+        task = Task(
+            id="test_task",
+            sessionId="session",
+            status=TaskStatus(state=TaskState.COMPLETED),
+            artifacts=[
+                Artifact(
+                    parts=[
+                        FilePart(file=FileContent(name="big.bin", bytes="A" * 100_000)),
+                        TextPart(text="caption"),
+                    ]
+                )
+            ],
+            history=[self.get_test_message()],
+        )
+        self.task_manager.tasks["test_task"] = task
+
+        async def get(**params):
+            response = await self.task_manager.on_get_task(
+                GetTaskRequest(id="1", params=TaskQueryParams(id="test_task", **params))
+            )
+            return response.model_dump_json(
+                exclude_none=True, context=response._serialization_context
+            )
+
+        status_only = await get(include=["status"])
+        self.assertLess(len(status_only), 300)
+        result = GetTaskResponse.model_validate_json(status_only).result
+        self.assertEqual(result.status.state, TaskState.COMPLETED)
+        self.assertIsNone(result.artifacts)
+        self.assertIsNone(result.sessionId)
+
+        without_bytes = await get(excludeArtifactBytes=True, historyLength=1)
+        self.assertLess(len(without_bytes), 1000)
+        result = GetTaskResponse.model_validate_json(
+            without_bytes, context={"excludeArtifactBytes": True}
+        ).result
+        self.assertEqual(result.artifacts[0].parts[0].file.name, "big.bin")
+        self.assertIsNone(result.artifacts[0].parts[0].file.bytes)
+        self.assertEqual(result.artifacts[0].parts[1].text, "caption")
+        self.assertEqual(len(result.history), 1)
+
+        self.assertIn("A" * 100_000, await get())
+        self.assertEqual(task.artifacts[0].parts[0].file.bytes, "A" * 100_000)
+
+    async def test_versions_and_delta_fetch(self):
+        params = TaskSendParams(id="test_task", message=self.get_test_message("user", "hi"))
+        task = await self.task_manager.upsert_task(params)
+        self.assertEqual(task.version, 1)
+        await self.task_manager.update_store(
+            "test_task",
+            TaskStatus(state=TaskState.WORKING, message=self.get_test_message(text="a")),
+            [Artifact(parts=[TextPart(text="first")])],
+        )
+        await self.task_manager.update_store(
+            "test_task",
+            TaskStatus(
+                state=TaskState.INPUT_REQUIRED, message=self.get_test_message(text="b")
+            ),
+            [Artifact(parts=[TextPart(text="second")])],
+        )
+
+        async def get(**params):
+            response = await self.task_manager.on_get_task(
+                GetTaskRequest(id="1", params=TaskQueryParams(id="test_task", **params))
+            )
+            serialized = response.model_dump(
+                exclude_none=True, context=response._serialization_context
+            )
+            return serialized["result"]
+
+        result = await get(sinceVersion=2)
+        self.assertEqual(result["version"], 3)
+        self.assertEqual([m["parts"][0]["text"] for m in result["history"]], ["b"])
+        self.assertEqual([a["parts"][0]["text"] for a in result["artifacts"]], ["second"])
+
+        result = await get(sinceVersion=0, historyLength=1)
+        self.assertEqual([m["parts"][0]["text"] for m in result["history"]], ["b"])
+        self.assertEqual(len(result["artifacts"]), 2)
+
+        result = await get(sinceVersion=3)
+        self.assertEqual((result["history"], result["artifacts"]), ([], []))
+
+        # A version this process does not know returns the whole task.
+        result = await get(sinceVersion=99)
+        self.assertEqual(len(result["artifacts"]), 2)
+
+    async def test_get_does_not_modify_the_stored_task(self):
+        task = Task(id="test_task", status=TaskStatus(state=TaskState.WORKING))
+        self.task_manager.tasks["test_task"] = task
+        response = await self.task_manager.on_get_task(
+            GetTaskRequest(id="1", params=TaskQueryParams(id="test_task"))
+        )
+        serialized = response.model_dump(
+            exclude_none=True, context=response._serialization_context
+        )
+        self.assertEqual(serialized["result"]["version"], 1)
+        self.assertIsNone(task.version)
+
+    async def test_versions_are_trimmed_when_the_task_ends(self):
+        params = TaskSendParams(id="test_task", message=self.get_test_message("user", "hi"))
+        await self.task_manager.upsert_task(params)
+        for state in (TaskState.WORKING, TaskState.WORKING, TaskState.COMPLETED):
+            await self.task_manager.update_store("test_task", TaskStatus(state=state), None)
+
+        versions = self.task_manager.task_versions
+        self.assertEqual(versions.version("test_task"), 4)
+        self.assertEqual(len(versions._tasks["test_task"].marks), 1)
+        # Older versions now get the whole task; the latest still gets a delta.
+        self.assertIsNone(versions.delta_start("test_task", 2))
+        self.assertEqual(versions.delta_start("test_task", 4), (1, 0))
+
+        # A task that is sent to again keeps counting from there.
+        await self.task_manager.upsert_task(params)
+        self.assertEqual(versions.version("test_task"), 5)
+        self.assertEqual(versions.delta_start("test_task", 4), (1, 0))
+
+    async def test_versions_are_rejected_with_multiple_workers(self):
+        await self.task_manager.upsert_task(
+            TaskSendParams(id="test_task", message=self.get_test_message("user", "hi"))
+        )
+        self.task_manager.event_relay = object()
+        for params in ({"sinceVersion": 1}, {"waitMs": 100}):
+            response = await self.task_manager.on_get_task(
+                GetTaskRequest(id="1", params=TaskQueryParams(id="test_task", **params))
+            )
+            self.assertEqual(response.error.code, -32004)
+        response = await self.task_manager.on_get_task(
+            GetTaskRequest(id="1", params=TaskQueryParams(id="test_task"))
+        )
+        self.assertIsNone(response.error)
+
+    async def test_long_poll_waits_for_a_change(self):
+        params = TaskSendParams(id="test_task", message=self.get_test_message("user", "hi"))
+        await self.task_manager.upsert_task(params)
+
+        async def long_poll():
+            return await self.task_manager.on_get_task(
+                GetTaskRequest(
+                    id="1",
+                    params=TaskQueryParams(id="test_task", sinceVersion=1, waitMs=5000),
+                )
+            )
+
+        poll = asyncio.create_task(long_poll())
+        await asyncio.sleep(0.01)
+        self.assertFalse(poll.done())
+        self.assertEqual(self.task_manager.task_versions.waiting, 1)
+
+        await self.task_manager.update_store(
+            "test_task", TaskStatus(state=TaskState.COMPLETED), None
+        )
+        response = await asyncio.wait_for(poll, 1)
+        self.assertEqual(response.result.version, 2)
+        self.assertEqual(response.result.status.state, TaskState.COMPLETED)
+        self.assertEqual(self.task_manager.task_versions.waiting, 0)
+
+        # Already past sinceVersion: answered at once. Unchanged: times out.
+        response = await asyncio.wait_for(long_poll(), 1)
+        self.assertEqual(response.result.version, 2)
+        response = await self.task_manager.on_get_task(
+            GetTaskRequest(
+                id="1", params=TaskQueryParams(id="test_task", sinceVersion=2, waitMs=20)
+            )
+        )
+        self.assertEqual(response.result.version, 2)
 
     async def test_setup_sse_consumer_new_task(self):
         task_id = "new_task"
@@ -313,4 +692,4 @@ class TestInMemoryTaskManager(unittest.IsolatedAsyncioTestCase):
             request_id, task_id, sse_queue
         ):
             pass
-        self.assertEqual(len(self.task_manager.task_sse_subscribers[task_id]), 0)
+        self.assertNotIn(task_id, self.task_manager.task_sse_subscribers)
@@ -0,0 +1,67 @@
+import asyncio
+import unittest
+from common.types import (
+    Artifact,
+    Message,
+    PushNotificationConfig,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+from common.server.task_store import InMemoryTaskStore
+
+
+class TestInMemoryTaskStore(unittest.IsolatedAsyncioTestCase):
+    def get_send_params(self, task_id="task", text="hello"):
+        return TaskSendParams(
+            id=task_id, message=Message(role="user", parts=[TextPart(text=text)])
+        )
+
+    async def test_upsert_and_update(self):
+        store = InMemoryTaskStore()
+        task = await store.upsert_task(self.get_send_params())
+        self.assertEqual(task.status.state, TaskState.SUBMITTED)
+
+        status = TaskStatus(
+            state=TaskState.COMPLETED,
+            message=Message(role="agent", parts=[TextPart(text="done")]),
+        )
+        task = await store.update_task(
+            "task", status, [Artifact(parts=[TextPart(text="artifact")])]
+        )
+        self.assertIs(await store.get_task("task"), task)
+        self.assertEqual(len(task.history), 2)
+        self.assertEqual(len(task.artifacts), 1)
+
+    async def test_update_unknown_task(self):
+        store = InMemoryTaskStore()
+        with self.assertRaises(ValueError):
+            await store.update_task("missing", TaskStatus(state=TaskState.WORKING), None)
+
+    async def test_push_notification_info(self):
+        store = InMemoryTaskStore()
+        config = PushNotificationConfig(url="http://test.com")
+        with self.assertRaises(ValueError):
+            await store.set_push_notification_info("task", config)
+
+        await store.upsert_task(self.get_send_params())
+        await store.set_push_notification_info("task", config)
+        self.assertTrue(await store.has_push_notification_info("task"))
+        self.assertEqual(await store.get_push_notification_info("task"), config)
+
+    async def test_concurrent_updates_are_all_applied(self):
+        store = InMemoryTaskStore()
+        ids = [f"task-{i}" for i in range(16)]
+        for task_id in ids:
+            await store.upsert_task(self.get_send_params(task_id))
+        status = TaskStatus(
+            state=TaskState.WORKING,
+            message=Message(role="agent", parts=[TextPart(text="working")]),
+        )
+
+        await asyncio.gather(
+            *(store.update_task(task_id, status, None) for task_id in ids for _ in range(10))
+        )
+        for task_id in ids:
+            self.assertEqual(len((await store.get_task(task_id)).history), 11)
@@ -0,0 +1,79 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import unittest
+from common.server import AgentRunner
+from common.utils.tracing import (
+    TracingPolicy,
+    configure_tracing,
+    current_span,
+    span,
+    traced,
+)
+
+
+class TestSpans(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tracer = configure_tracing(TracingPolicy(ring_buffer_size=100))
+
+    def tearDown(self):
+        configure_tracing(None)
+
+    def spans(self):
+        return {span["name"]: span for span in self.tracer.ring_buffer.spans()}
+
+    async def test_nesting_and_attributes(self):
+        with span("outer", kind="test") as outer:
+            with span("inner"):
+                current_span().set_attribute("answer", 42)
+            outer.set_attribute("done", True)
+
+        spans = self.spans()
+        self.assertEqual(spans["outer"]["attributes"], {"kind": "test", "done": True})
+        self.assertEqual(spans["inner"]["attributes"], {"answer": 42})
+        self.assertEqual(spans["inner"]["parent_id"], spans["outer"]["span_id"])
+        self.assertEqual(spans["inner"]["trace_id"], spans["outer"]["trace_id"])
+        self.assertIsNone(spans["outer"]["parent_id"])
+        self.assertGreaterEqual(spans["outer"]["duration_ms"], spans["inner"]["duration_ms"])
+
+    async def test_parent_follows_into_tasks_and_threads(self):
+        @traced("tool.lookup")
+        def lookup():
+            return threading.current_thread().name
+
+        runner = AgentRunner(max_workers=1)
+        with span("request"):
+            await asyncio.create_task(runner.run(lookup))
+        runner.shutdown()
+
+        spans = self.spans()
+        self.assertEqual(spans["agent.run"]["parent_id"], spans["request"]["span_id"])
+        self.assertEqual(spans["tool.lookup"]["parent_id"], spans["agent.run"]["span_id"])
+
+    async def test_errors_are_recorded(self):
+        with self.assertRaises(ValueError):
+            with span("failing"):
+                raise ValueError("boom")
+        self.assertEqual(self.spans()["failing"]["error"], "ValueError: boom")
+
+    async def test_disabled_tracing_is_a_noop(self):
+        configure_tracing(None)
+        with span("ignored") as ignored:
+            ignored.set_attribute("key", "value")
+        self.assertIsNone(current_span().set_attribute("key", "value"))
+
+    async def test_jsonl_export(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "spans.jsonl")
+            configure_tracing(TracingPolicy(ring_buffer_size=None, jsonl_path=path))
+            with span("first"):
+                pass
+            with span("second"):
+                pass
+            configure_tracing(None)
+            with open(path) as f:
+                names = [json.loads(line)["name"] for line in f]
+        self.assertEqual(names, ["first", "second"])
+
@@ -0,0 +1,126 @@
+import asyncio
+import os
+import socket
+import tempfile
+import unittest
+import warnings
+from common.server.sqlite_task_store import SQLiteTaskStore
+from common.server.task_store import InMemoryTaskStore
+from common.server.workers import EventRelay, run_hub
+from common.types import (
+    InternalError,
+    JSONRPCResponse,
+    Message,
+    SendTaskRequest,
+    SendTaskResponse,
+    SendTaskStreamingRequest,
+    SendTaskStreamingResponse,
+    TaskResubscriptionParams,
+    TaskResubscriptionRequest,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from common.server.task_manager import InMemoryTaskManager
+from typing import AsyncIterable, Union
+
+
+class WorkerTaskManager(InMemoryTaskManager):
+    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+        pass
+
+    async def on_send_task_subscribe(
+        self, request: SendTaskStreamingRequest
+    ) -> Union[AsyncIterable[SendTaskStreamingResponse], JSONRPCResponse]:
+        pass
+
+
+def status_event(state=TaskState.WORKING, final=False):
+    return TaskStatusUpdateEvent(id="task", status=TaskStatus(state=state), final=final)
+
+
+class TestEventRelay(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        # Two "workers" sharing one store, connected through the hub.
+        store = InMemoryTaskStore()
+        self.workers = [WorkerTaskManager(task_store=store) for _ in range(2)]
+        await store.upsert_task(
+            TaskSendParams(id="task", message=Message(role="user", parts=[TextPart(text="hi")]))
+        )
+
+        hub_socks, self.relays = [], []
+        for task_manager in self.workers:
+            hub_sock, worker_sock = socket.socketpair()
+            hub_socks.append(hub_sock)
+            relay = EventRelay(task_manager)
+            await relay.connect(worker_sock)
+            task_manager.event_relay = relay
+            self.relays.append(relay)
+        self.hub = asyncio.create_task(run_hub(hub_socks))
+
+    async def asyncTearDown(self):
+        for relay in self.relays:
+            await relay.close()
+        await asyncio.wait_for(self.hub, 1)
+
+    async def test_resubscribe_on_other_worker(self):
+        producer, consumer = self.workers
+        await producer.enqueue_events_for_sse("task", status_event())
+        await asyncio.sleep(0.05)
+
+        stream = await consumer.on_resubscribe_to_task(
+            TaskResubscriptionRequest(
+                id="1", params=TaskResubscriptionParams(id="task", lastEventId=0)
+            )
+        )
+        # Nothing was buffered on the consumer, so it starts from a snapshot.
+        snapshot = await anext(stream)
+        self.assertIsNone(snapshot.event_id)
+        self.assertEqual(snapshot.result.status.state, TaskState.SUBMITTED)
+
+        await producer.enqueue_events_for_sse("task", status_event())
+        await producer.enqueue_events_for_sse("task", InternalError(message="boom"))
+        received = [response async for response in stream]
+        self.assertEqual([r.event_id for r in received], [2, 3])
+        self.assertEqual(received[0].result.status.state, TaskState.WORKING)
+        self.assertEqual(received[1].error.message, "boom")
+        # The ids match the producer's, so a reconnect to either worker resumes.
+        self.assertEqual(
+            [event_id for event_id, _ in consumer.task_event_buffers["task"].since(1)[0]],
+            [2, 3],
+        )
+
+    async def test_unwatched_tasks_are_not_buffered(self):
+        await self.workers[0].enqueue_events_for_sse("task", status_event())
+        await asyncio.sleep(0.05)
+        self.assertNotIn("task", self.workers[1].task_event_buffers)
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "requires os.fork")
+class TestSQLiteTaskStoreFork(unittest.TestCase):
+    def test_store_is_usable_in_forked_child(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SQLiteTaskStore(os.path.join(tmp, "tasks.db"))
+            params = TaskSendParams(
+                id="parent", message=Message(role="user", parts=[TextPart(text="hi")])
+            )
+            asyncio.run(store.upsert_task(params))
+
+            with warnings.catch_warnings():
+                # The parent's reader threads are idle; the child replaces them.
+                warnings.simplefilter("ignore", DeprecationWarning)
+                pid = os.fork()
+            if pid == 0:
+                try:
+                    params.id = "child"
+                    asyncio.run(store.upsert_task(params))
+                    asyncio.run(store.close())
+                finally:
+                    os._exit(0)
+            _, status = os.waitpid(pid, 0)
+            self.assertEqual(status, 0)
+
+            self.assertIsNotNone(asyncio.run(store.get_task("child")))
+            asyncio.run(store.close())